@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Account, Category, Transaction, Budget, Goal, Transfer
+from .models import User, Account, Category, Transaction, Budget, Goal, Transfer, JobRun
 
 
 @admin.register(User)
@@ -47,3 +47,8 @@ class TransferAdmin(admin.ModelAdmin):
     list_display = ['from_account', 'to_account', 'amount', 'transfer_date', 'user']
     list_filter = ['transfer_date']
 
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ['job', 'status', 'started_at', 'duration_seconds', 'generated_count', 'error_count']
+    list_filter = ['job', 'status']
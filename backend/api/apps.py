@@ -5,3 +5,13 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
+    def ready(self):
+        from api.signals import (
+            connect_active_user_cache, connect_budget_results, connect_lookup_cache, connect_tombstones,
+            connect_trend_period_cache,
+        )
+        connect_tombstones(self)
+        connect_active_user_cache()
+        connect_lookup_cache()
+        connect_trend_period_cache()
+        connect_budget_results()
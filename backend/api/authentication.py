@@ -0,0 +1,96 @@
+"""
+Stateless JWT authentication (JWT_STATELESS_AUTH)
+
+simplejwt's JWTAuthentication loads the User row on every request. In
+stateless mode request.user is a TokenUser built from the signed access
+token claims instead, so:
+    - ownership is checked by id (filter(user_id=request.user.id),
+      obj.user_id == request.user.id), never by comparing User instances
+    - views that need the User row itself (profile, password change) load
+      it with request_user()
+
+A token stays valid until it expires, so deactivated or deleted users are
+caught by an in-process cache of active user ids: each worker checks a
+given user against the database at most once every
+JWT_ACTIVE_USER_CACHE_SECONDS.
+"""
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import models as jwt_models
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from api.models import User
+
+
+# Bound on cached ids per process; expired entries are dropped when it is reached
+ACTIVE_USER_CACHE_SIZE = 10000
+
+# user id -> time.monotonic() until which it is known to be active
+_active_until: Dict[int, float] = {}
+_lock = threading.Lock()
+
+
+def is_active_user(user_id: int) -> bool:
+    """True if the user exists and is active, checking the database only on a cache miss"""
+    now = time.monotonic()
+    if _active_until.get(user_id, 0) > now:
+        return True
+
+    active = User.objects.filter(pk=user_id, is_active=True).exists()
+    with _lock:
+        if not active:
+            _active_until.pop(user_id, None)
+        else:
+            if len(_active_until) >= ACTIVE_USER_CACHE_SIZE:
+                for expired in [key for key, until in _active_until.items() if until <= now]:
+                    del _active_until[expired]
+                if len(_active_until) >= ACTIVE_USER_CACHE_SIZE:
+                    _active_until.clear()
+            _active_until[user_id] = now + settings.JWT_ACTIVE_USER_CACHE_SECONDS
+    return active
+
+
+def forget_user(user_id: int) -> None:
+    """Re-check this user on its next request (called when it is deactivated or deleted)"""
+    with _lock:
+        _active_until.pop(user_id, None)
+
+
+def request_user(request) -> User:
+    """
+    The User row behind request.user. In stateless mode it is loaded once
+    and replaces the TokenUser for the rest of the request.
+    """
+    user = request.user
+    if not isinstance(user, User):
+        user = User.objects.get(pk=user.id)
+        request.user = user
+    return user
+
+
+class TokenUser(jwt_models.TokenUser):
+    """
+    SIMPLE_JWT['TOKEN_USER_CLASS']. simplejwt stores the user id claim as a
+    string: convert it so request.user.id == obj.user_id holds.
+    """
+
+    @cached_property
+    def id(self) -> int:
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWTStatelessUserAuthentication plus the active user check"""
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if not is_active_user(user.id):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
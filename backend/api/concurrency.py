@@ -0,0 +1,63 @@
+"""
+Run blocking ORM work concurrently from async views
+
+Django's async ORM (aget, aaggregate, ...) executes every query on the single
+thread-sensitive executor, so gathering several of them still runs them one
+after another. Independent aggregates are instead dispatched to a small
+dedicated thread pool where each thread owns its own DB connection.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the pool lazily so forked workers (preload_app) start their own threads"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.ASYNC_ORM_THREADS,
+                    thread_name_prefix='orm',
+                )
+    return _executor
+
+
+def _call_with_connection_cleanup(func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    """
+    Mirror the request lifecycle for pool threads: drop broken or expired
+    connections before and after the call (CONN_MAX_AGE still applies)
+    """
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable in the ORM pool, keeping the caller's context variables"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, _call_with_connection_cleanup, func, args, kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+async def gather_in_threads(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent zero-argument callables concurrently and return their
+    results under the same keys
+    """
+    results = await asyncio.gather(*(run_in_thread(call) for call in calls.values()))
+    return dict(zip(calls.keys(), results))
@@ -0,0 +1,170 @@
+"""
+Read replica routing (DATABASE_REPLICA_URL)
+
+Writes always go to the primary. Reads go to the replica only inside code
+marked with @reads_from_replica or use_replica() (TrendsService,
+DashboardService, projections, backups), and only when:
+    - a 'replica' database is configured
+    - the user has not written in the last DATABASE_REPLICA_PIN_SECONDS
+      (read-your-writes: ReadYourWritesMiddleware pins them to the primary)
+    - no write or transaction on the primary happened in the same block
+
+The selected alias lives in a context variable, so it follows the queries
+that async views dispatch to api.concurrency threads.
+"""
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import QuerySet
+
+
+REPLICA_ALIAS = 'replica'
+
+# Alias chosen by the innermost use_replica() block (None outside of one)
+_read_alias: ContextVar[Optional[str]] = ContextVar('api_read_alias', default=None)
+# Set when the current replica block wrote to the primary
+_wrote_primary: ContextVar[bool] = ContextVar('api_wrote_primary', default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id: int) -> str:
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id: int) -> None:
+    """Send this user's replica reads to the primary until the replica has caught up"""
+    cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user_id: int) -> None:
+    await cache.aset(_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def _read_alias_for(pinned: bool) -> str:
+    return DEFAULT_DB_ALIAS if pinned else REPLICA_ALIAS
+
+
+def _is_pinned(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    try:
+        return cache.get(_pin_key(user_id)) is not None
+    except Exception:
+        # Cache unreachable: staleness can't be ruled out, stay on the primary
+        return True
+
+
+async def _ais_pinned(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    try:
+        return await cache.aget(_pin_key(user_id)) is not None
+    except Exception:
+        return True
+
+
+@contextmanager
+def _reading_from(alias: str) -> Iterator[None]:
+    alias_token = _read_alias.set(alias)
+    wrote_token = _wrote_primary.set(False)
+    try:
+        yield
+    finally:
+        _wrote_primary.reset(wrote_token)
+        _read_alias.reset(alias_token)
+
+
+@contextmanager
+def use_replica(user_id: Optional[int] = None) -> Iterator[None]:
+    """Route reads in this block to the replica unless user_id wrote recently"""
+    if _read_alias.get() is not None or not replica_configured():
+        # Nested block (already decided) or no replica: nothing to do
+        yield
+        return
+    with _reading_from(_read_alias_for(_is_pinned(user_id))):
+        yield
+
+
+def _user_id_from_call(signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[int]:
+    """user_id argument of a service method, or request.user of a view"""
+    arguments = signature.bind_partial(*args, **kwargs).arguments
+    if arguments.get('user_id') is not None:
+        return arguments['user_id']
+    request = arguments.get('request')
+    user = getattr(request, 'user', None)
+    return user.id if user is not None and user.is_authenticated else None
+
+
+def _bind(result: Any) -> Any:
+    """Evaluate returned querysets on the alias chosen here, not wherever they are iterated"""
+    if _read_alias.get() is not None and isinstance(result, QuerySet) and result._db is None:
+        return result.using(result.db)
+    return result
+
+
+def reads_from_replica(target):
+    """
+    Decorator for functions (taking user_id or request) and for service
+    classes, where it wraps every public static and class method
+    """
+    if inspect.isclass(target):
+        for name, member in list(vars(target).items()):
+            if name.startswith('_') or not isinstance(member, (staticmethod, classmethod)):
+                continue
+            setattr(target, name, type(member)(reads_from_replica(member.__func__)))
+        return target
+
+    func: Callable[..., Any] = target
+    signature = inspect.signature(func)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _read_alias.get() is not None or not replica_configured():
+                return _bind(await func(*args, **kwargs))
+            pinned = await _ais_pinned(_user_id_from_call(signature, args, kwargs))
+            with _reading_from(_read_alias_for(pinned)):
+                return _bind(await func(*args, **kwargs))
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _read_alias.get() is not None or not replica_configured():
+            return _bind(func(*args, **kwargs))
+        pinned = _is_pinned(_user_id_from_call(signature, args, kwargs))
+        with _reading_from(_read_alias_for(pinned)):
+            return _bind(func(*args, **kwargs))
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    DATABASE_ROUTERS entry. Returning None leaves the decision to Django,
+    which means the default (primary) database.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if _read_alias.get() != REPLICA_ALIAS or _wrote_primary.get():
+            return None
+        # Reads inside a transaction on the primary must see its uncommitted rows
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        if _read_alias.get() is not None:
+            _wrote_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Both aliases hold the same data
+        return True
@@ -0,0 +1,151 @@
+"""
+Sparse fieldsets: GET ...?fields=id,name or ?omit=notes,created_at
+
+SparseFieldsMixin (ModelSerializers) drops the fields a request didn't ask
+for before serializing, so the SerializerMethodFields and relation lookups
+behind them never run. RowSerializer applies the same selection to its
+values() columns. SparseQuerysetMixin (viewsets) narrows the list/retrieve
+queryset with only() and select_related() to what the remaining fields read.
+
+SerializerMethodFields (source '*') read attributes DRF can't see: list the
+model fields they need in Meta.method_field_sources. A method field kept
+without an entry leaves the queryset as it is, since deferred columns would
+be loaded with one query per row.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from rest_framework import permissions, serializers
+
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _names(request, param: str) -> Optional[Set[str]]:
+    value = request.query_params.get(param)
+    names = {name.strip() for name in value.split(',') if name.strip()} if value else set()
+    return names or None
+
+
+def select_fields(names: Iterable[str], request) -> List[str]:
+    """The names ?fields=/?omit= keep, in their original order (all of them outside GET requests)"""
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return list(names)
+    fields = _names(request, FIELDS_PARAM)
+    omit = _names(request, OMIT_PARAM) or set()
+    return [name for name in names if (fields is None or name in fields) and name not in omit]
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin: only the fields selected by the request in the
+    serializer context are serialized. Applies to the top-level serializer
+    (or the child of a top-level many=True list), never to nested ones.
+    """
+    _sparse_applied = False
+
+    def to_representation(self, instance):
+        if not self._sparse_applied:
+            self._sparse_applied = True
+            for name in set(self.fields) - set(self.sparse_field_names()):
+                del self.fields[name]
+        return super().to_representation(instance)
+
+    def sparse_field_names(self) -> List[str]:
+        """Field names kept for the request in the context"""
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return list(self.fields)
+        return select_fields(self.fields, self.context.get('request'))
+
+
+def _model_lookup(model: type, path: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    ('account__name', ['account']) for 'account__name': the only() lookup
+    and the forward relations it joins. None when path isn't a chain of
+    concrete fields only() can load (reverse relations, properties...).
+    """
+    *relation_names, last = path.split('__')
+    lookup: List[str] = []
+    relations: List[str] = []
+    for name in relation_names:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            return None
+        lookup.append(field.name)
+        relations.append('__'.join(lookup))
+        model = field.related_model
+    try:
+        field = model._meta.get_field(last)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete or field.many_to_many:
+        return None
+    lookup.append(field.name)
+    return '__'.join(lookup), relations
+
+
+def narrow_queryset(queryset: QuerySet, serializer: serializers.ModelSerializer,
+                    required: Iterable[str] = ()) -> QuerySet:
+    """
+    queryset loading only the columns (and joining only the relations) the
+    serializer's sparse fields read, plus the `required` lookups. Returned
+    unchanged when nothing was dropped or a kept field's needs are unknown.
+    """
+    kept = serializer.sparse_field_names()
+    if len(kept) == len(serializer.fields):
+        return queryset
+
+    method_sources: Dict[str, Tuple[str, ...]] = getattr(serializer.Meta, 'method_field_sources', {})
+    paths = list(required)
+    for name in kept:
+        field = serializer.fields[name]
+        if field.write_only:
+            continue
+        if name in method_sources:
+            paths.extend(method_sources[name])
+        elif field.source == '*':
+            return queryset
+        else:
+            paths.append('__'.join(field.source_attrs))
+
+    model: type[Model] = queryset.model
+    lookups = [model._meta.pk.name]
+    relations: List[str] = []
+    for path in paths:
+        resolved = _model_lookup(model, path)
+        if resolved is None:
+            return queryset
+        lookups.append(resolved[0])
+        relations.extend(resolved[1])
+
+    # select_related() without arguments would follow every foreign key
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*dict.fromkeys(relations))
+    return queryset.only(*dict.fromkeys(lookups))
+
+
+class SparseQuerysetMixin:
+    """
+    Viewset mixin: list and retrieve querysets load only what the requested
+    fields need (see narrow_queryset). Goes before OwnedQuerysetMixin, whose
+    owner_field is always loaded, through its relations for nested owners
+    (debt__user_id), for IsOwnerPermission's object check.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        if getattr(self, 'action', None) not in self.sparse_actions:
+            return queryset
+        owner_field = getattr(self, 'owner_field', None)
+        required = [owner_field] if owner_field else []
+        return narrow_queryset(queryset, self.get_serializer(), required)
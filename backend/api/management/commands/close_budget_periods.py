@@ -0,0 +1,116 @@
+"""
+Management command to close monthly budget periods (BudgetPeriodResult)
+Run this command DAILY via cron (run_daily_jobs does): python manage.py close_budget_periods
+
+Closes the previous month with each budget's amount at month end and the
+category's spending, and refreshes the open month for every user. Closing a
+month again rewrites its snapshot, so the command can be re-run or used to
+backfill.
+
+Usage:
+    python manage.py close_budget_periods --dry-run
+    python manage.py close_budget_periods --months 12
+    python manage.py close_budget_periods --month 2026-03
+"""
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Budget, JobRun
+from api.services import BudgetPerformanceService
+
+
+class Command(BaseCommand):
+    help = 'Close the previous month of every budget and refresh the open month'
+    # Cron runs skip system checks: they import the whole URLconf (every view and serializer)
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the months and budgets that would be written, without changing anything',
+        )
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=1,
+            help='Close the last N finished months (default: 1, the previous month)',
+        )
+        parser.add_argument(
+            '--month',
+            help='Close only this finished month (YYYY-MM)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Users written per transaction (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['months'] < 1:
+            raise CommandError('--months must be at least 1')
+
+        current = date.today().replace(day=1)
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--month must be YYYY-MM')
+            if month >= current:
+                raise CommandError('Only finished months can be closed')
+            months = [month]
+        else:
+            months = []
+            month = current
+            for _ in range(options['months']):
+                month = (month - timedelta(days=1)).replace(day=1)
+                months.append(month)
+            months.reverse()
+
+        # Dry runs are not recorded: they don't write anything
+        if options['dry_run']:
+            self._report(months, current)
+            return
+
+        job_run = JobRun.objects.create(job='close_budget_periods')
+        try:
+            written = self._close(months, current, options['batch_size'])
+        except Exception as e:
+            job_run.fail(str(e))
+            raise
+        job_run.finish(generated=written)
+
+    def _user_batches(self, batch_size: int) -> List[List[int]]:
+        """IDs of the users with budgets, batch_size at a time"""
+        user_ids = list(Budget.objects.order_by('user_id').values_list('user_id', flat=True).distinct())
+        return [user_ids[i:i + batch_size] for i in range(0, len(user_ids), batch_size)]
+
+    def _close(self, months: List[date], current: date, batch_size: int) -> int:
+        """Close each month, then refresh the open one; return the rows written"""
+        batches = self._user_batches(batch_size)
+        written = 0
+        for month, close in [(month, True) for month in months] + [(current, False)]:
+            started = time.perf_counter()
+            rows = sum(BudgetPerformanceService.refresh_month(month, batch, close=close) for batch in batches)
+            written += rows
+            label = 'Closed' if close else 'Refreshed open month'
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {label} {month:%Y-%m}: {rows} budgets ({time.perf_counter() - started:.2f}s)'
+            ))
+
+        self.stdout.write(self.style.SUCCESS(f'\nCompleted successfully! {written} budget results written'))
+        return written
+
+    def _report(self, months: List[date], current: date) -> None:
+        for month in months + [current]:
+            self.stdout.write(self.style.WARNING(
+                f"[DRY RUN] Would {'close' if month < current else 'refresh'} {month:%Y-%m}"
+            ))
+        self.stdout.write(f"Users with budgets: {Budget.objects.values('user_id').distinct().count()}")
+        self.stdout.write(self.style.WARNING('\nThis was a dry run. No budget results were written.'))
@@ -3,11 +3,13 @@ Management command to generate monthly returns for insurance policies
 Run this command DAILY via cron: python manage.py generate_insurance_returns
 """
 from django.core.management.base import BaseCommand
-from api.models import Investment
+from api.models import Investment, JobRun
 
 
 class Command(BaseCommand):
     help = 'Generate monthly returns for insurance policies that are due today'
+    # Cron runs skip system checks: they import the whole URLconf (every view and serializer)
+    requires_system_checks = []
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,6 +19,21 @@ class Command(BaseCommand):
         )
     
     def handle(self, *args, **options):
+        # Dry runs are not recorded: they don't generate anything
+        if options['dry_run']:
+            self._generate(options)
+            return
+        
+        job_run = JobRun.objects.create(job='generate_insurance_returns')
+        try:
+            generated, skipped, errors = self._generate(options)
+        except Exception as e:
+            job_run.fail(str(e))
+            raise
+        job_run.finish(generated=generated, skipped=skipped, errors=errors)
+    
+    def _generate(self, options) -> tuple[int, int, int]:
+        """Generate due policy returns and return (generated, skipped, errors)"""
         dry_run = options['dry_run']
         
         # Get all active insurance policies with expected returns
@@ -82,4 +99,5 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(self.style.SUCCESS('\nCompleted successfully!'))
-
+        
+        return generated_count, skipped_count, error_count
@@ -3,12 +3,14 @@ Management command to generate recurring transactions (income and expense)
 Run this command daily via cron/scheduler: python manage.py generate_recurring_transactions
 """
 from django.core.management.base import BaseCommand
-from api.models import RecurringTransaction
+from api.models import RecurringTransaction, JobRun
 from datetime import date
 
 
 class Command(BaseCommand):
     help = 'Generate transactions for recurring transactions (income/expense) that are due today'
+    # Cron runs skip system checks: they import the whole URLconf (every view and serializer)
+    requires_system_checks = []
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -25,6 +27,21 @@ class Command(BaseCommand):
         )
     
     def handle(self, *args, **options):
+        # Dry runs are not recorded: they don't generate anything
+        if options['dry_run']:
+            self._generate(options)
+            return
+        
+        job_run = JobRun.objects.create(job='generate_recurring_transactions')
+        try:
+            generated, skipped, errors = self._generate(options)
+        except Exception as e:
+            job_run.fail(str(e))
+            raise
+        job_run.finish(generated=generated, skipped=skipped, errors=errors, message=f"type={options['type']}")
+    
+    def _generate(self, options) -> tuple[int, int, int]:
+        """Generate due transactions and return (generated, skipped, errors)"""
         dry_run = options['dry_run']
         transaction_type = options['type']
         
@@ -99,6 +116,5 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('\nThis was a dry run. No transactions were actually created.'))
         else:
             self.stdout.write(self.style.SUCCESS(f'\nCompleted successfully!'))
-
-
-
+        
+        return generated_count, skipped_count, error_count
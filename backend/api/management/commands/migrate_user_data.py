@@ -1,13 +1,35 @@
 """
 Django management command to migrate all data from one user to another
+
+Every foreign key from an api model to User is discovered through the model
+registry, so new models are covered without touching this command. Audit
+columns (AUDIT_FIELDS) record who did something and are left alone, as are
+other apps' tables (admin log entries). Rows move in bounded
+batches, each in its own short transaction: locks are never held on a whole
+table and an interrupted run can simply be started again.
+
+Usage:
+    python manage.py migrate_user_data --from-user 12 --to-user 3 --dry-run
+    python manage.py migrate_user_data --from-user 12 --to-user 3 --batch-size 5000
 """
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from api.models import (
-    User, Account, Category, Transaction, 
-    Budget, BudgetHistory, Goal, Transfer, 
-    Debt, DebtPayment, RecurringIncome
-)
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from api import signals
+from api.models import User, Category
+from api.services import BudgetPerformanceService, LookupService, SummaryService, TrendsService
+
+
+Relation = Tuple[type, models.ForeignKey]
+
+# Foreign keys naming who made a change rather than whose data the row is
+AUDIT_FIELDS = {'api.BudgetHistory.changed_by'}
 
 
 class Command(BaseCommand):
@@ -31,102 +53,212 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip confirmation prompt'
         )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the rows and duplicate categories that would be migrated, without changing anything'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows updated per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--keep-duplicate-categories',
+            action='store_true',
+            help="Move categories as they are instead of merging them into the destination user's "
+                 "categories with the same name and type"
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         from_user_id = options['from_user']
         to_user_id = options['to_user']
-        skip_confirm = options['no_confirm']
-
-        # Validate users exist
-        try:
-            from_user = User.objects.get(id=from_user_id)
-            to_user = User.objects.get(id=to_user_id)
-        except User.DoesNotExist as e:
-            raise CommandError(f'User not found: {e}')
+        self.batch_size = options['batch_size']
 
         if from_user_id == to_user_id:
             raise CommandError('Source and destination users cannot be the same')
+        if self.batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        users = User.objects.in_bulk([from_user_id, to_user_id])
+        for user_id in (from_user_id, to_user_id):
+            if user_id not in users:
+                raise CommandError(f'User not found: {user_id}')
 
-        # Count records to migrate
-        accounts_count = Account.objects.filter(user_id=from_user_id).count()
-        categories_count = Category.objects.filter(user_id=from_user_id).count()
-        transactions_count = Transaction.objects.filter(user_id=from_user_id).count()
-        budgets_count = Budget.objects.filter(user_id=from_user_id).count()
-        goals_count = Goal.objects.filter(user_id=from_user_id).count()
-        transfers_count = Transfer.objects.filter(user_id=from_user_id).count()
-        debts_count = Debt.objects.filter(user_id=from_user_id).count()
-        recurring_incomes_count = RecurringIncome.objects.filter(user_id=from_user_id).count()
+        relations, skipped = self._user_relations()
+        duplicates = {} if options['keep_duplicate_categories'] else self._duplicate_categories(from_user_id, to_user_id)
 
         self.stdout.write(self.style.WARNING(f'\n=== Data Migration Summary ==='))
-        self.stdout.write(f'FROM: User {from_user_id} ({from_user.email})')
-        self.stdout.write(f'TO:   User {to_user_id} ({to_user.email})\n')
-        
-        self.stdout.write('Records to migrate:')
-        self.stdout.write(f'  - Accounts: {accounts_count}')
-        self.stdout.write(f'  - Categories: {categories_count}')
-        self.stdout.write(f'  - Transactions: {transactions_count}')
-        self.stdout.write(f'  - Budgets: {budgets_count}')
-        self.stdout.write(f'  - Goals: {goals_count}')
-        self.stdout.write(f'  - Transfers: {transfers_count}')
-        self.stdout.write(f'  - Debts: {debts_count}')
-        self.stdout.write(f'  - Recurring Incomes: {recurring_incomes_count}')
-        
-        total = (accounts_count + categories_count + transactions_count + 
-                budgets_count + goals_count + transfers_count + 
-                debts_count + recurring_incomes_count)
-        self.stdout.write(f'\nTotal records: {total}\n')
-
-        if total == 0:
-            self.stdout.write(self.style.WARNING('No records to migrate.'))
+        self.stdout.write(f'FROM: User {from_user_id} ({users[from_user_id].email})')
+        self.stdout.write(f'TO:   User {to_user_id} ({users[to_user_id].email})\n')
+
+        self.stdout.write('Foreign keys to User:')
+        for model, field in relations:
+            self.stdout.write(f'  - {self._label(model, field)}')
+        for model, field in skipped:
+            reason = 'one-to-one' if field.one_to_one else 'audit'
+            self.stdout.write(self.style.WARNING(f'  - {self._label(model, field)} ({reason}, not migrated)'))
+        self.stdout.write(f'Duplicate categories to merge: {len(duplicates)}')
+
+        if options['dry_run']:
+            self._report_counts(relations, duplicates, from_user_id)
             return
 
         # Confirm migration
-        if not skip_confirm:
-            confirm = input('Do you want to proceed with the migration? (yes/no): ')
+        if not options['no_confirm']:
+            confirm = input('\nDo you want to proceed with the migration? (yes/no): ')
             if confirm.lower() != 'yes':
                 self.stdout.write(self.style.ERROR('Migration cancelled.'))
                 return
 
-        # Perform migration
         self.stdout.write('\nMigrating data...')
+        timings = self._migrate(relations, duplicates, from_user_id, to_user_id)
+
+        # Bulk updates don't send the signals that keep cached lookups fresh,
+        # nor go through the write paths that maintain the financial summaries
+        LookupService.invalidate(from_user_id, to_user_id)
+        TrendsService.invalidate_periods(from_user_id, to_user_id)
+        SummaryService.check([from_user_id, to_user_id], repair=True)
+        BudgetPerformanceService.refresh_month(date.today(), [from_user_id, to_user_id])
 
-        # 1. Migrate Accounts
-        updated = Account.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} accounts'))
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(f"{'Table':<46} {'Rows':>8} {'Seconds':>9}")
+        for label, rows, elapsed in timings:
+            self.stdout.write(f'{label:<46} {rows:>8} {elapsed:>9.2f}')
 
-        # 2. Migrate Categories
-        updated = Category.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} categories'))
+        total = sum(rows for _, rows, _ in timings)
+        total_seconds = sum(elapsed for _, _, elapsed in timings)
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Migration completed successfully! {total} rows in {total_seconds:.2f}s'))
+        self.stdout.write(f'All data has been migrated from User {from_user_id} to User {to_user_id}')
 
-        # 3. Migrate Transactions
-        updated = Transaction.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} transactions'))
+    def _migrate(
+        self, relations: List[Relation], duplicates: Dict[int, int], from_user_id: int, to_user_id: int,
+    ) -> List[Tuple[str, int, float]]:
+        """
+        Move every row and return (table, rows, seconds) per table
+        Moves are muted: the caches and derived tables are brought up to date
+        once afterwards. Deleting the duplicate categories is not, so incremental
+        backups get their tombstones; nothing points at them by then, so it
+        cascades nowhere.
+        """
+        timings: List[Tuple[str, int, float]] = []
 
-        # 4. Migrate Budgets
-        updated = Budget.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} budgets'))
+        if duplicates:
+            # Point everything at the destination user's category, then drop the duplicates
+            with signals.suppressed():
+                for model, field in self._category_relations():
+                    moved, elapsed = self._move(model, field, duplicates)
+                    timings.append((self._label(model, field) + ' (merged)', moved, elapsed))
+            started = time.perf_counter()
+            deleted, _ = Category.objects.filter(pk__in=list(duplicates)).delete()
+            timings.append(('categories (duplicates deleted)', deleted, time.perf_counter() - started))
 
-        # 5. Migrate BudgetHistory (changed_by field)
-        updated = BudgetHistory.objects.filter(changed_by_id=from_user_id).update(changed_by_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} budget history records'))
+        with signals.suppressed():
+            for model, field in relations:
+                moved, elapsed = self._move(model, field, {from_user_id: to_user_id})
+                timings.append((self._label(model, field), moved, elapsed))
 
-        # 6. Migrate Goals
-        updated = Goal.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} goals'))
+        return timings
 
-        # 7. Migrate Transfers
-        updated = Transfer.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} transfers'))
+    @staticmethod
+    def _label(model: type, field: models.Field) -> str:
+        return f'{model._meta.db_table}.{field.column}'
 
-        # 8. Migrate Debts
-        updated = Debt.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} debts'))
+    @staticmethod
+    def _relations_to(target: type) -> Tuple[List[Relation], List[Relation]]:
+        """
+        (many-to-one fields of api models pointing at target, fields left alone:
+        one-to-one ones that can't be merged and audit ones)
+        """
+        relations, skipped = [], []
+        for relation in target._meta.related_objects:
+            if relation.many_to_many:
+                continue
+            model = relation.related_model
+            if model._meta.app_label != 'api' or not model._meta.managed or model._meta.proxy:
+                continue
+            field = relation.field
+            if relation.one_to_one or f'{model._meta.label}.{field.name}' in AUDIT_FIELDS:
+                skipped.append((model, field))
+            else:
+                relations.append((model, field))
+        return relations, skipped
 
-        # 9. Migrate Recurring Incomes
-        updated = RecurringIncome.objects.filter(user_id=from_user_id).update(user_id=to_user_id)
-        self.stdout.write(self.style.SUCCESS(f'✓ Migrated {updated} recurring incomes'))
+    @classmethod
+    def _user_relations(cls) -> Tuple[List[Relation], List[Relation]]:
+        return cls._relations_to(User)
 
-        self.stdout.write(self.style.SUCCESS(f'\n✓ Migration completed successfully!'))
-        self.stdout.write(f'All data has been migrated from User {from_user_id} to User {to_user_id}')
+    @classmethod
+    def _category_relations(cls) -> List[Relation]:
+        return cls._relations_to(Category)[0]
+
+    @staticmethod
+    def _duplicate_categories(from_user_id: int, to_user_id: int) -> Dict[int, int]:
+        """Source category id -> destination category id with the same name (case-insensitive) and type"""
+        destination = {
+            (name.strip().lower(), category_type): category_id
+            for category_id, name, category_type in Category.objects.filter(user_id=to_user_id)
+            .order_by('id').values_list('id', 'name', 'type')
+        }
+        return {
+            category_id: destination[(name.strip().lower(), category_type)]
+            for category_id, name, category_type in Category.objects.filter(user_id=from_user_id)
+            .values_list('id', 'name', 'type')
+            if (name.strip().lower(), category_type) in destination
+        }
+
+    def _move(self, model: type, field: models.ForeignKey, mapping: Dict[int, int]) -> Tuple[int, float]:
+        """Rewrite field from the mapping keys to their values, batch_size rows per transaction"""
+        label = self._label(model, field)
+        manager = model._base_manager
+        attname = field.attname
+        if len(mapping) == 1:
+            new_value = Value(next(iter(mapping.values())))
+        else:
+            new_value = Case(*[When(**{attname: old, 'then': Value(new)}) for old, new in mapping.items()])
+
+        changes = {attname: new_value}
+        # QuerySet.update() skips auto_now: keep incremental backups aware of the change
+        if any(getattr(f, 'auto_now', False) and f.name == 'updated_at' for f in model._meta.concrete_fields):
+            changes['updated_at'] = timezone.now()
+
+        moved = 0
+        started = time.perf_counter()
+        while True:
+            with transaction.atomic():
+                # Moved rows no longer match, so the next batch is again the first N
+                ids = list(
+                    manager.filter(**{f'{attname}__in': list(mapping)})
+                    .order_by().values_list('pk', flat=True)[:self.batch_size]
+                )
+                if not ids:
+                    break
+                moved += manager.filter(pk__in=ids).update(**changes)
+            if len(ids) == self.batch_size:
+                rate = moved / max(time.perf_counter() - started, 1e-6)
+                self.stdout.write(f'  ... {label}: {moved} rows ({rate:.0f} rows/s)')
+
+        elapsed = time.perf_counter() - started
+        if moved:
+            self.stdout.write(self.style.SUCCESS(f'✓ Migrated {moved} rows in {label} ({elapsed:.2f}s)'))
+        return moved, elapsed
 
+    def _report_counts(self, relations: List[Relation], duplicates: Dict[int, int], from_user_id: int) -> None:
+        self.stdout.write('\nRecords to migrate:')
+        total = 0
+        if duplicates:
+            for model, field in self._category_relations():
+                count = model._base_manager.filter(**{f'{field.attname}__in': list(duplicates)}).count()
+                total += count
+                self.stdout.write(f'  - {self._label(model, field)} (remapped to merged categories): {count}')
+        for model, field in relations:
+            queryset = model._base_manager.filter(**{field.attname: from_user_id})
+            if model is Category:
+                # Merged duplicates are deleted instead of moved
+                queryset = queryset.exclude(pk__in=list(duplicates))
+            count = queryset.count()
+            total += count
+            self.stdout.write(f'  - {self._label(model, field)}: {count}')
+        self.stdout.write(f'\nTotal records: {total}')
+        self.stdout.write(self.style.WARNING('DRY RUN - no changes were made'))
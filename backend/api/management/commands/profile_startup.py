@@ -0,0 +1,120 @@
+"""
+Management command to profile process cold start
+Runs a management command in fresh interpreters, measures wall time and
+reports the slowest imports from `python -X importtime`
+
+Usage:
+    python manage.py profile_startup
+    python manage.py profile_startup --runs 10 --top 30 -- generate_recurring_transactions --dry-run
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start time of a management command and list import-time hot spots'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=5,
+            help='Fresh processes used to measure wall time (default: 5)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Number of modules listed in each report (default: 20)',
+        )
+        parser.add_argument(
+            'target',
+            nargs=argparse.REMAINDER,
+            help='Command to profile with its arguments (default: run_daily_jobs --dry-run)',
+        )
+
+    def handle(self, *args, **options):
+        target = [arg for arg in options['target'] if arg != '--'] or ['run_daily_jobs', '--dry-run']
+        manage_py = str(Path(settings.BASE_DIR) / 'manage.py')
+        command = [sys.executable, manage_py, *target]
+
+        self.stdout.write(self.style.SUCCESS(f"Profiling: manage.py {' '.join(target)}"))
+
+        # Wall time of complete runs (interpreter start, django.setup(), command, exit)
+        durations = []
+        for _ in range(options['runs']):
+            started = time.perf_counter()
+            result = subprocess.run(command, capture_output=True, text=True)
+            durations.append(time.perf_counter() - started)
+            if result.returncode != 0:
+                raise CommandError(f'Command failed with exit code {result.returncode}:\n{result.stderr}')
+
+        # One more run with the import profiler enabled
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', manage_py, *target],
+            capture_output=True,
+            text=True,
+        )
+        imports = self._parse_importtime(result.stderr)
+        if not imports:
+            raise CommandError('No -X importtime output found')
+
+        total_import_us = sum(self_us for _, self_us, _ in imports)
+        top = options['top']
+
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Wall time:'))
+        self.stdout.write(f'  Runs: {len(durations)}')
+        self.stdout.write(f'  Min: {min(durations) * 1000:.0f} ms')
+        self.stdout.write(f'  Median: {statistics.median(durations) * 1000:.0f} ms')
+        self.stdout.write(f'  Imports: {total_import_us / 1000:.0f} ms ({len(imports)} modules)')
+
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Import time by top-level package (self time):'))
+        for package, package_us in self._by_package(imports)[:top]:
+            share = package_us / total_import_us * 100
+            self.stdout.write(f'  {package_us / 1000:8.1f} ms  {share:5.1f}%  {package}')
+
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Slowest modules (cumulative, including their imports):'))
+        for name, _, cumulative_us in sorted(imports, key=lambda item: item[2], reverse=True)[:top]:
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Slowest modules (self time):'))
+        for name, self_us, _ in sorted(imports, key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {name}')
+
+        app_modules = [name for name, _, _ in imports if name == 'api' or name.startswith('api.')]
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS(f'App modules imported: {len(app_modules)}'))
+        for name in app_modules:
+            self.stdout.write(f'  {name}')
+
+    @staticmethod
+    def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+        """Parse 'import time: self [us] | cumulative | imported package' lines"""
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            imports.append((name.strip(), int(self_us), int(cumulative_us)))
+        return imports
+
+    @staticmethod
+    def _by_package(imports: List[Tuple[str, int, int]]) -> List[Tuple[str, int]]:
+        totals: Dict[str, int] = defaultdict(int)
+        for name, self_us, _ in imports:
+            totals[name.split('.')[0]] += self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
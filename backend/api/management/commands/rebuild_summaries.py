@@ -0,0 +1,87 @@
+"""
+Management command to verify and repair the per-user financial summaries
+(UserFinancialSummary) against the source tables
+
+Users are processed in batches: per batch one GROUP BY query per figure group
+and one bulk write, each batch in its own short transaction.
+
+Usage:
+    python manage.py rebuild_summaries --dry-run
+    python manage.py rebuild_summaries --user 12
+    python manage.py rebuild_summaries --batch-size 1000
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import User
+from api.services import SummaryService
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-user financial summaries and repair the ones that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report missing and drifted summaries, without changing anything',
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            default=[],
+            help='Only this user ID (repeatable)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Users checked per transaction (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        repair = not options['dry_run']
+
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(pk__in=options['user'])
+
+        totals = {'checked': 0, 'missing': 0, 'drifted': 0}
+        started = time.perf_counter()
+        last_id = 0
+        while True:
+            # Keyset pagination: constant memory whatever the number of users
+            user_ids = list(users.filter(pk__gt=last_id).values_list('pk', flat=True)[:batch_size])
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+
+            counts = SummaryService.check(user_ids, repair=repair)
+            for key, value in counts.items():
+                totals[key] += value
+            self.stdout.write(
+                f"  ... {totals['checked']} users checked "
+                f"({totals['missing']} missing, {totals['drifted']} drifted)"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Summary:'))
+        self.stdout.write(f"  Checked: {totals['checked']}")
+        self.stdout.write(f"  Missing: {totals['missing']}")
+        self.stdout.write(f"  Drifted: {totals['drifted']}")
+        self.stdout.write(f'  Seconds: {elapsed:.2f}')
+
+        if not repair:
+            self.stdout.write(self.style.WARNING('\nDRY RUN - no changes were made'))
+        elif totals['missing'] or totals['drifted']:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n✓ Repaired {totals['missing'] + totals['drifted']} summaries"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✓ All summaries are up to date'))
@@ -0,0 +1,59 @@
+"""
+Management command to run every daily generation job in a single process
+Run this command DAILY via cron: python manage.py run_daily_jobs
+Replaces separate `manage.py` invocations, so Django starts only once
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+
+# (command, description) in execution order
+DAILY_JOBS = [
+    ('generate_recurring_transactions', '💸 Generating recurring transactions...'),
+    ('generate_insurance_returns', '💰 Generating insurance policy returns...'),
+    # Last: catches up the transactions generated above
+    ('close_budget_periods', '📊 Closing budget periods...'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Run all daily jobs (recurring transactions, insurance returns, budget periods) in one process'
+    # Cron runs skip system checks: they import the whole URLconf (every view and serializer)
+    requires_system_checks = []
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be generated without actually creating transactions',
+        )
+        parser.add_argument(
+            '--skip',
+            action='append',
+            choices=[job for job, _ in DAILY_JOBS],
+            default=[],
+            help='Job to skip (repeatable)',
+        )
+    
+    def handle(self, *args, **options):
+        failed = []
+        
+        for job, description in DAILY_JOBS:
+            if job in options['skip']:
+                self.stdout.write(self.style.WARNING(f'Skipping {job}'))
+                continue
+            
+            self.stdout.write(self.style.SUCCESS(description))
+            try:
+                # Each job records its own JobRun; keep going so one failure doesn't block the other
+                call_command(job, dry_run=options['dry_run'], stdout=self.stdout, stderr=self.stderr)
+            except Exception as e:
+                failed.append(job)
+                self.stdout.write(self.style.ERROR(f'✗ {job} failed: {str(e)}'))
+            
+            self.stdout.write('\n' + '-' * 50 + '\n')
+        
+        if failed:
+            raise CommandError(f"Failed jobs: {', '.join(failed)}")
+        
+        self.stdout.write(self.style.SUCCESS('✅ All daily jobs completed successfully!'))
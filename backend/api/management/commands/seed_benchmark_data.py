@@ -0,0 +1,430 @@
+"""
+Management command to generate synthetic data for local load testing
+Usage: python manage.py seed_benchmark_data --users 50 --years 3
+"""
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import (
+    User, Account, Category, Transaction,
+    Budget, Goal, Transfer, Debt, DebtPayment,
+    RecurringTransaction, Investment, InvestmentTransaction,
+)
+from api.services import SummaryService
+
+
+INCOME_CATEGORIES = [
+    ('Sueldo', 'AttachMoney'),
+    ('Bonificaciones', 'Redeem'),
+    ('Freelance', 'Work'),
+    ('Inversiones', 'BusinessCenter'),
+    ('Ventas', 'LocalOffer'),
+    ('Otros Ingresos', 'AttachMoney'),
+]
+
+# (name, icon, min amount, max amount, average occurrences per month)
+EXPENSE_CATEGORIES = [
+    ('Renta', 'Home', 350, 900, 1),
+    ('Servicios', 'Lightbulb', 40, 160, 3),
+    ('Transporte', 'DirectionsBus', 2, 25, 12),
+    ('Vehículo', 'DirectionsCar', 20, 120, 3),
+    ('Supermercado', 'ShoppingCart', 15, 180, 8),
+    ('Restaurantes', 'Restaurant', 8, 70, 9),
+    ('Salud', 'LocalHospital', 20, 200, 1),
+    ('Farmacia', 'LocalPharmacy', 5, 60, 2),
+    ('Entretenimiento', 'Movie', 10, 80, 3),
+    ('Suscripciones', 'SmartScreen', 5, 20, 3),
+    ('Ropa', 'Checkroom', 20, 150, 1),
+    ('Educación', 'School', 30, 300, 1),
+    ('Tecnología', 'Laptop', 20, 600, 1),
+    ('Seguros', 'Security', 30, 120, 1),
+    ('Impuestos', 'Receipt', 20, 400, 1),
+    ('Otros Gastos', 'Settings', 5, 100, 2),
+]
+
+DESCRIPTIONS = {
+    'Supermercado': ['Supermaxi', 'Tía', 'Mi Comisariato', 'Mercado'],
+    'Restaurantes': ['Almuerzo', 'Cena', 'Cafetería', 'Delivery'],
+    'Transporte': ['Bus', 'Taxi', 'Uber', 'Metro'],
+    'Entretenimiento': ['Cine', 'Concierto', 'Videojuego', 'Salida'],
+}
+
+
+def _month_starts(first: date, last: date) -> List[date]:
+    """Return the first day of every month between two dates (inclusive)"""
+    months = []
+    current = first.replace(day=1)
+    while current <= last:
+        months.append(current)
+        if current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            current = current.replace(month=current.month + 1)
+    return months
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users with realistic financial history for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10,
+            help='Number of users to generate (default: 10)',
+        )
+        parser.add_argument(
+            '--years',
+            type=int,
+            default=2,
+            help='Years of transaction history per user (default: 2)',
+        )
+        parser.add_argument(
+            '--density',
+            type=float,
+            default=1.0,
+            help='Multiplier for the number of expenses per month (default: 1.0)',
+        )
+        parser.add_argument(
+            '--prefix',
+            type=str,
+            default='bench',
+            help='Username/email prefix for generated users (default: bench)',
+        )
+        parser.add_argument(
+            '--password',
+            type=str,
+            default='benchmark123',
+            help='Password for every generated user (default: benchmark123)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for reproducible datasets (default: 42)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per bulk_create batch (default: 2000)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated users with the same prefix first',
+        )
+
+    def handle(self, *args, **options):
+        users_count = options['users']
+        years = options['years']
+        prefix = options['prefix']
+        self.batch_size = options['batch_size']
+        self.density = options['density']
+        self.rng = random.Random(options['seed'])
+
+        if users_count < 1 or years < 1:
+            raise CommandError('--users and --years must be positive')
+
+        existing = User.objects.filter(username__startswith=prefix, email__endswith='@bench.local')
+        if options['clear']:
+            deleted, _ = existing.delete()
+            self.stdout.write(self.style.WARNING(f'Deleted {deleted} rows from previous runs'))
+        elif existing.exists():
+            raise CommandError(
+                f'Users with prefix "{prefix}" already exist. Use --clear or a different --prefix.'
+            )
+
+        self.today = date.today()
+        self.history_start = (self.today.replace(day=1) - timedelta(days=365 * years)).replace(day=1)
+        self.months = _month_starts(self.history_start, self.today)
+
+        started = time.perf_counter()
+        totals: Dict[str, int] = {}
+
+        with transaction.atomic():
+            password_hash = make_password(options['password'])
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{prefix}{i}',
+                    email=f'{prefix}{i}@bench.local',
+                    first_name='Bench',
+                    last_name=f'User {i}',
+                    password=password_hash,
+                )
+                for i in range(1, users_count + 1)
+            ], batch_size=self.batch_size)
+            totals['users'] = len(users)
+
+            for index, user in enumerate(users, 1):
+                for model_name, count in self._seed_user(user).items():
+                    totals[model_name] = totals.get(model_name, 0) + count
+                if index % 10 == 0 or index == len(users):
+                    self.stdout.write(f'  Seeded {index}/{len(users)} users...')
+
+            # bulk_create skips the write paths that keep the summaries up to date
+            user_ids = [user.id for user in users]
+            for offset in range(0, len(user_ids), self.batch_size):
+                SummaryService.check(user_ids[offset:offset + self.batch_size], repair=True)
+
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('Summary:'))
+        for model_name, count in totals.items():
+            self.stdout.write(f'  {model_name}: {count}')
+        self.stdout.write(f'  History: {self.history_start} → {self.today}')
+        self.stdout.write(self.style.SUCCESS(f'\nCompleted in {elapsed:.2f}s'))
+        self.stdout.write(f'Login with {prefix}1@bench.local / {options["password"]}')
+
+    def _money(self, low: float, high: float) -> Decimal:
+        return Decimal(str(round(self.rng.uniform(low, high), 2)))
+
+    def _random_day(self, month_start: date) -> date:
+        """Random day within the month, never in the future"""
+        day = month_start + timedelta(days=self.rng.randint(0, 27))
+        return min(day, self.today)
+
+    def _seed_user(self, user: User) -> Dict[str, int]:
+        """Generate the full financial history for a single user"""
+        rng = self.rng
+        counts: Dict[str, int] = {}
+
+        accounts = Account.objects.bulk_create([
+            Account(user=user, name='Cuenta Corriente', type='bank', color='#667eea'),
+            Account(user=user, name='Ahorros', type='bank', color='#10b981'),
+            Account(user=user, name='Efectivo', type='cash', color='#f59e0b'),
+            Account(user=user, name='Tarjeta de Crédito', type='card', color='#ef4444'),
+        ])
+        checking, savings, cash, card = accounts
+        balances = {account.id: Decimal('0') for account in accounts}
+        balances[savings.id] = self._money(2000, 15000)
+        counts['accounts'] = len(accounts)
+
+        categories = Category.objects.bulk_create(
+            [Category(user=user, name=name, type='Income', icon=icon) for name, icon in INCOME_CATEGORIES]
+            + [Category(user=user, name=name, type='Expense', icon=icon) for name, icon, *_ in EXPENSE_CATEGORIES]
+        )
+        by_name = {category.name: category for category in categories}
+        counts['categories'] = len(categories)
+
+        salary = self._money(1500, 6000)
+        rent = self._money(350, 900)
+        transactions: List[Transaction] = []
+
+        for month_start in self.months:
+            # Salary, paid on the 1st
+            pay_day = month_start
+            if pay_day <= self.today:
+                transactions.append(Transaction(
+                    user=user, account=checking, category=by_name['Sueldo'], type='Income',
+                    amount=salary, description='Sueldo (Ingreso recurrente)', transaction_date=pay_day,
+                ))
+                balances[checking.id] += salary
+
+            # Occasional extra income
+            if rng.random() < 0.25:
+                amount = self._money(100, 1200)
+                transactions.append(Transaction(
+                    user=user, account=checking, category=by_name[rng.choice(['Freelance', 'Ventas', 'Bonificaciones'])],
+                    type='Income', amount=amount, description='Ingreso extra',
+                    transaction_date=self._random_day(month_start),
+                ))
+                balances[checking.id] += amount
+
+            for name, _icon, low, high, per_month in EXPENSE_CATEGORIES:
+                occurrences = max(0, round(rng.gauss(per_month * self.density, per_month * 0.3)))
+                if name == 'Renta':
+                    occurrences = 1
+                for _ in range(occurrences):
+                    spent_on = self._random_day(month_start)
+                    account = rng.choice([checking, checking, cash, card])
+                    amount = rent if name == 'Renta' else self._money(low, high)
+                    description = rng.choice(DESCRIPTIONS.get(name, [name]))
+                    transactions.append(Transaction(
+                        user=user, account=account, category=by_name[name], type='Expense',
+                        amount=amount, description=description, transaction_date=spent_on,
+                    ))
+                    balances[account.id] -= amount
+
+        Transaction.objects.bulk_create(transactions, batch_size=self.batch_size)
+        counts['transactions'] = len(transactions)
+
+        # Transfers from checking to savings every few months
+        transfers = []
+        for month_start in self.months[::3]:
+            amount = self._money(100, 800)
+            transfers.append(Transfer(
+                user=user, from_account=checking, to_account=savings,
+                amount=amount, transfer_date=self._random_day(month_start),
+            ))
+            balances[checking.id] -= amount
+            balances[savings.id] += amount
+        Transfer.objects.bulk_create(transfers, batch_size=self.batch_size)
+        counts['transfers'] = len(transfers)
+
+        month_start = self.today.replace(day=1)
+        budget_categories = rng.sample(
+            ['Supermercado', 'Restaurantes', 'Transporte', 'Entretenimiento', 'Servicios', 'Ropa', 'Vehículo'],
+            k=5,
+        )
+        budgets = Budget.objects.bulk_create([
+            Budget(
+                user=user, category=by_name[name], amount=self._money(100, 600),
+                period_start=month_start, period_end=None, is_recurring=True, status='Active',
+            )
+            for name in budget_categories
+        ])
+        counts['budgets'] = len(budgets)
+
+        goals = Goal.objects.bulk_create([
+            Goal(
+                user=user, account=savings, name=name,
+                target_amount=self._money(3000, 20000), current_amount=self._money(0, 3000),
+                deadline=self.today + timedelta(days=rng.randint(90, 900)), status='In Progress',
+            )
+            for name in ('Fondo de emergencia', 'Vacaciones')
+        ])
+        counts['goals'] = len(goals)
+
+        debts = []
+        for creditor in rng.sample(['Banco Pichincha', 'Produbanco', 'Mi hermana', 'Cooperativa'], k=2):
+            principal = self._money(1000, 15000)
+            rate = Decimal(str(rng.choice([0, 8, 12, 15.5])))
+            term = rng.choice([12, 24, 36, 48])
+            total = principal + principal * rate / 100 * Decimal(term) / 12
+            debts.append(Debt(
+                user=user, creditor_name=creditor, principal_amount=principal,
+                interest_rate=rate, interest_type='simple', term_months=term,
+                monthly_payment=(total / term).quantize(Decimal('0.01')),
+                start_date=self.months[max(0, len(self.months) - term)], status='Active',
+            ))
+        Debt.objects.bulk_create(debts)
+        counts['debts'] = len(debts)
+
+        payment_transactions = []
+        payments = []
+        for debt in debts:
+            for month in _month_starts(debt.start_date, self.today)[:-1]:
+                paid_on = month.replace(day=min(debt.start_date.day, 28))
+                tx = Transaction(
+                    user=user, account=checking, category=None, type='Expense',
+                    amount=debt.monthly_payment, description=f'Pago de deuda: {debt.creditor_name}',
+                    transaction_date=paid_on,
+                )
+                payment_transactions.append(tx)
+                payments.append(DebtPayment(
+                    debt=debt, account=checking, transaction=tx,
+                    amount=debt.monthly_payment, payment_date=paid_on,
+                ))
+                debt.amount_paid += debt.monthly_payment
+                balances[checking.id] -= debt.monthly_payment
+        Transaction.objects.bulk_create(payment_transactions, batch_size=self.batch_size)
+        DebtPayment.objects.bulk_create(payments, batch_size=self.batch_size)
+        Debt.objects.bulk_update(debts, ['amount_paid'])
+        counts['transactions'] += len(payment_transactions)
+        counts['debt_payments'] = len(payments)
+
+        recurring = RecurringTransaction.objects.bulk_create([
+            RecurringTransaction(
+                user=user, name='Sueldo', transaction_type='Income', amount=salary,
+                frequency='monthly', day_of_period=1, account=checking, category=by_name['Sueldo'],
+                start_date=self.history_start, last_generated_date=month_start,
+            ),
+            RecurringTransaction(
+                user=user, name='Renta', transaction_type='Expense', amount=rent,
+                frequency='monthly', day_of_period=5, account=checking, category=by_name['Renta'],
+                start_date=self.history_start,
+            ),
+            RecurringTransaction(
+                user=user, name='Netflix', transaction_type='Expense', amount=Decimal('10.99'),
+                frequency='monthly', day_of_period=15, account=card, category=by_name['Suscripciones'],
+                start_date=self.history_start,
+            ),
+            RecurringTransaction(
+                user=user, name='Gimnasio', transaction_type='Expense', amount=Decimal('9.00'),
+                frequency='weekly', day_of_period=1, account=cash, category=by_name['Salud'],
+                start_date=self.history_start,
+            ),
+            RecurringTransaction(
+                user=user, name='Freelance', transaction_type='Income', amount=self._money(200, 700),
+                frequency='biweekly', day_of_period=10, account=checking, category=by_name['Freelance'],
+                start_date=self.history_start,
+            ),
+        ])
+        counts['recurring_transactions'] = len(recurring)
+
+        policy_start = self.months[len(self.months) // 2]
+        policy_amount = self._money(2000, 10000)
+        investments = Investment.objects.bulk_create([
+            Investment(
+                user=user, investment_type='goal', name='Auto nuevo', account=savings,
+                initial_amount=Decimal('0'), current_amount=Decimal('0'),
+                target_amount=self._money(8000, 25000), start_date=self.history_start,
+                deadline=self.today + timedelta(days=720), status='active',
+            ),
+            Investment(
+                user=user, investment_type='insurance', name='Póliza de acumulación', account=savings,
+                initial_amount=policy_amount, current_amount=policy_amount,
+                policy_number=f'POL-{user.id:06d}', institution_name='Banco Guayaquil',
+                expected_return_rate=Decimal(str(rng.choice([5.5, 6.25, 7.0]))),
+                maturity_term_months=36, start_date=policy_start,
+                maturity_date=policy_start + timedelta(days=36 * 30), status='active',
+            ),
+        ])
+        goal_investment, policy = investments
+        counts['investments'] = len(investments)
+
+        movement_transactions = []
+        movements = []
+        for month in _month_starts(self.history_start, self.today)[::2]:
+            amount = self._money(50, 400)
+            tx = Transaction(
+                user=user, account=savings, category=None, type='Expense',
+                amount=amount, description=f'Aporte a {goal_investment.name}', transaction_date=month,
+            )
+            movement_transactions.append(tx)
+            movements.append(InvestmentTransaction(
+                investment=goal_investment, transaction_type='contribution', amount=amount,
+                transaction_date=month, account=savings, account_transaction=tx,
+            ))
+            goal_investment.current_amount += amount
+            balances[savings.id] -= amount
+
+        monthly_rate = policy.expected_return_rate / 100 / 12
+        for month in _month_starts(policy_start, self.today)[1:]:
+            amount = (policy.current_amount * monthly_rate).quantize(Decimal('0.01'))
+            returned_on = month.replace(day=min(policy_start.day, 28))
+            tx = Transaction(
+                user=user, account=savings, category=None, type='Income',
+                amount=amount, description=f'{policy.name} (Rendimiento mensual)', transaction_date=returned_on,
+            )
+            movement_transactions.append(tx)
+            movements.append(InvestmentTransaction(
+                investment=policy, transaction_type='return', amount=amount,
+                transaction_date=returned_on, account=savings, account_transaction=tx,
+                notes='Rendimiento mensual automático',
+            ))
+            policy.current_amount += amount
+            policy.last_return_date = returned_on
+            balances[savings.id] += amount
+
+        Transaction.objects.bulk_create(movement_transactions, batch_size=self.batch_size)
+        InvestmentTransaction.objects.bulk_create(movements, batch_size=self.batch_size)
+        Investment.objects.bulk_update(investments, ['current_amount', 'last_return_date'])
+        counts['transactions'] += len(movement_transactions)
+        counts['investment_transactions'] = len(movements)
+
+        # Keep account balances consistent with the generated history
+        for account in accounts:
+            account.balance = balances[account.id]
+        Account.objects.bulk_update(accounts, ['balance'])
+
+        return counts
@@ -0,0 +1,298 @@
+"""
+In-process metrics registry with Prometheus text exposition
+No external dependencies: every worker process keeps its own counters, and
+every sample carries a `pid` label so the series of different gunicorn
+workers never mix (aggregate with `sum without (pid) (...)`)
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds (5ms .. 10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COMPRESSION_DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    # Read at scrape time: with preload_app the module is imported by the gunicorn master
+    pairs = [f'pid="{os.getpid()}"']
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for labelled metrics"""
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+        ]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+
+class Gauge(Counter):
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = data
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(data)) for key, data in self._values.items()]
+        lines = []
+        for key, data in items:
+            for i, bound in enumerate(self.buckets):
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {_format_value(data[i])}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(data[-2])}')
+            lines.append(f'{self.name}_count{labels} {_format_value(data[-1])}')
+        return lines
+
+
+class Registry:
+    """Collection of metrics plus callbacks evaluated at scrape time"""
+
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def reset(self) -> None:
+        """Drop every recorded value (a forked worker starts from zero)"""
+        for metric in self._metrics:
+            with metric._lock:
+                metric._values.clear()
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Register a function returning freshly built metrics on every scrape"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        metrics: List[Metric] = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+PROCESS_START_TIME = time.time()
+
+http_requests_total = registry.counter(
+    'http_requests_total', 'Total HTTP requests by route, method and status', ['route', 'method', 'status'],
+)
+http_request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ['route', 'method'],
+)
+db_queries_per_request = registry.histogram(
+    'db_queries_per_request', 'Number of DB queries executed per request', ['route'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+db_query_duration_seconds = registry.histogram(
+    'db_query_duration_seconds', 'Duration of individual DB queries', ['alias'],
+    buckets=QUERY_DURATION_BUCKETS,
+)
+http_response_bytes_total = registry.counter(
+    'http_response_bytes_total', 'Compressed response bodies by route, encoding and stage (original/sent)',
+    ['route', 'encoding', 'stage'],
+)
+http_response_compression_saved_bytes_total = registry.counter(
+    'http_response_compression_saved_bytes_total', 'Bytes saved by response compression', ['route', 'encoding'],
+)
+http_response_compression_seconds = registry.histogram(
+    'http_response_compression_seconds', 'CPU time spent compressing a response body', ['route', 'encoding'],
+    buckets=COMPRESSION_DURATION_BUCKETS,
+)
+cache_requests_total = registry.counter(
+    'cache_requests_total', 'Cache lookups by cache name and result (hit/miss)', ['cache', 'result'],
+)
+
+
+def record_cache_access(cache_name: str, hit: bool) -> None:
+    """Count a cache lookup so hit ratios show up in /api/metrics/"""
+    cache_requests_total.inc(cache=cache_name, result='hit' if hit else 'miss')
+
+
+def _collect_cache_ratios() -> Iterable[Metric]:
+    ratio = Gauge('cache_hit_ratio', 'Cache hit ratio since process start', ['cache'])
+    totals: Dict[str, Dict[str, float]] = {}
+    for (cache_name, result), value in list(cache_requests_total._values.items()):
+        totals.setdefault(cache_name, {})[result] = value
+    for cache_name, counts in totals.items():
+        lookups = counts.get('hit', 0) + counts.get('miss', 0)
+        if lookups:
+            ratio.set(counts.get('hit', 0) / lookups, cache=cache_name)
+    return [ratio]
+
+
+def _collect_process() -> Iterable[Metric]:
+    start = Gauge('process_start_time_seconds', 'Start time of the worker process since unix epoch')
+    start.set(PROCESS_START_TIME)
+    return [start]
+
+
+def _collect_db_connections() -> Iterable[Metric]:
+    """Connection pool stats when a pool is configured, otherwise persistent connection settings"""
+    from django.db import connections
+
+    pool_stats = Gauge('db_pool_stat', 'psycopg connection pool statistics', ['alias', 'stat'])
+    max_age = Gauge('db_conn_max_age_seconds', 'Persistent connection lifetime (CONN_MAX_AGE)', ['alias'])
+    is_open = Gauge('db_connection_open', 'Whether this thread holds an open connection', ['alias'])
+
+    for alias in connections:
+        connection = connections[alias]
+        is_open.set(1 if connection.connection is not None else 0, alias=alias)
+        pool = getattr(connection, 'pool', None) if connection.vendor == 'postgresql' else None
+        if pool is not None:
+            for stat, value in pool.get_stats().items():
+                pool_stats.set(value, alias=alias, stat=stat)
+        else:
+            # None means unlimited persistent connections
+            conn_max_age = connection.settings_dict.get('CONN_MAX_AGE', 0)
+            max_age.set(conn_max_age if conn_max_age is not None else -1, alias=alias)
+
+    return [pool_stats, max_age, is_open]
+
+
+def _collect_batch_jobs() -> Iterable[Metric]:
+    """Last run stats for scheduled commands, read from the job_runs table"""
+    from api.models import JobRun
+
+    duration = Gauge('batch_job_last_run_duration_seconds', 'Duration of the last run', ['job'])
+    generated = Gauge('batch_job_last_run_generated', 'Items generated by the last run', ['job'])
+    errors = Gauge('batch_job_last_run_errors', 'Errors in the last run', ['job'])
+    last_run = Gauge('batch_job_last_run_timestamp_seconds', 'Start time of the last run', ['job'])
+    last_success = Gauge('batch_job_last_success_timestamp_seconds', 'Finish time of the last successful run', ['job'])
+
+    for job in JobRun.TRACKED_JOBS:
+        run = JobRun.objects.filter(job=job).order_by('-started_at').first()
+        if run is None:
+            continue
+        duration.set(run.duration_seconds or 0, job=job)
+        generated.set(run.generated_count, job=job)
+        errors.set(run.error_count, job=job)
+        last_run.set(run.started_at.timestamp(), job=job)
+
+        success = JobRun.objects.filter(job=job, status='success').order_by('-started_at').first()
+        if success is not None and success.finished_at:
+            last_success.set(success.finished_at.timestamp(), job=job)
+
+    return [duration, generated, errors, last_run, last_success]
+
+
+def _after_fork_in_child() -> None:
+    """
+    Preloaded gunicorn workers are forked from the master after this module was
+    imported: give each one its own start time so Prometheus sees a fresh
+    process instead of counters that went backwards
+    """
+    global PROCESS_START_TIME
+    PROCESS_START_TIME = time.time()
+    registry.reset()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+registry.add_collector(_collect_process)
+registry.add_collector(_collect_cache_ratios)
+registry.add_collector(_collect_db_connections)
+registry.add_collector(_collect_batch_jobs)
@@ -0,0 +1,461 @@
+"""
+Custom middleware for the API
+"""
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject, empty
+
+from api import db_router, metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger('api.profiling')
+
+QueryObserver = Callable[[float, Dict[str, Any]], None]
+
+# Observers for the current request. A context variable (instead of
+# connection.execute_wrapper) also follows queries that async views run in
+# worker threads, since asgiref and api.concurrency copy the context there.
+_query_observers: ContextVar[Tuple[QueryObserver, ...]] = ContextVar('api_query_observers', default=())
+
+
+def _notify_query_observers(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+    observers = _query_observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for observer in observers:
+            observer(elapsed, context)
+
+
+def _install_query_hook(sender, connection, **kwargs) -> None:
+    """Attach the dispatcher to every connection, whichever thread opens it"""
+    if _notify_query_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_notify_query_observers)
+
+
+connection_created.connect(_install_query_hook, dispatch_uid='api.middleware.query_hook')
+
+
+@contextmanager
+def observe_queries(observer: QueryObserver) -> Iterator[None]:
+    """Call observer(duration_seconds, context) for every query run in this context"""
+    # Connections opened before this module was imported
+    for connection in connections.all(initialized_only=True):
+        _install_query_hook(None, connection)
+    token = _query_observers.set(_query_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _query_observers.reset(token)
+
+
+def _loaded_user_id(request: HttpRequest) -> Optional[int]:
+    """
+    User id if authentication already ran; never triggers the lazy session
+    lookup (an extra query, and not allowed on the event loop under ASGI)
+    """
+    user = getattr(request, 'user', None)
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return user.id if user.is_authenticated else None
+
+
+def _route_name(request: HttpRequest) -> str:
+    """Metrics label for the request: route names keep cardinality bounded (no raw paths or ids)"""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match and match.view_name else 'unmatched'
+
+
+class RequestProfile:
+    """
+    Timing breakdown collected for a single request
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.view_started: Optional[float] = None
+        self.view_finished: Optional[float] = None
+        self.render_finished: Optional[float] = None
+        self.db_time = 0.0
+        self.db_queries = 0
+        self._lock = threading.Lock()
+
+    def record_query(self, elapsed: float, context: Dict[str, Any]) -> None:
+        """Query observer; async views may report from several threads at once"""
+        with self._lock:
+            self.db_time += elapsed
+            self.db_queries += 1
+
+    def breakdown(self) -> Dict[str, float]:
+        """Return durations in milliseconds"""
+        finished = time.perf_counter()
+        total = finished - self.started
+        view = 0.0
+        render = 0.0
+        if self.view_started is not None:
+            view_end = self.view_finished or self.render_finished or finished
+            view = view_end - self.view_started
+        if self.view_finished is not None and self.render_finished is not None:
+            render = self.render_finished - self.view_finished
+
+        return {
+            'total': total * 1000,
+            'db': self.db_time * 1000,
+            # Python time inside the view: business logic and serializers
+            'app': max(view - self.db_time, 0.0) * 1000,
+            'render': render * 1000,
+        }
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in per-request instrumentation (REQUEST_PROFILING=True)
+
+    Records wall time, DB query count and time, view/serializer time and JSON
+    rendering time. Emits a Server-Timing header and a structured log line, and
+    dumps a cProfile/pyinstrument profile for a sample of requests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0.0))
+        self.profile_dir = Path(getattr(settings, 'REQUEST_PROFILING_DIR', 'profiles'))
+        self.profiler_name = getattr(settings, 'REQUEST_PROFILER', 'cprofile')
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        profile = RequestProfile()
+        request._profile = profile
+        profiler = self._start_profiler() if self._should_sample() else None
+
+        with observe_queries(profile.record_query):
+            response = self.get_response(request)
+
+        return self._finish(request, response, profile, profiler)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # Under ASGI the sampled profiler only sees the event loop thread
+        profile = RequestProfile()
+        request._profile = profile
+        profiler = self._start_profiler() if self._should_sample() else None
+
+        with observe_queries(profile.record_query):
+            response = await self.get_response(request)
+
+        return self._finish(request, response, profile, profiler)
+
+    def _finish(self, request: HttpRequest, response: HttpResponse, profile: RequestProfile, profiler) -> HttpResponse:
+        if profiler is not None:
+            self._save_profile(profiler, request)
+
+        timings = profile.breakdown()
+        size = len(response.content) if not response.streaming else None
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timings["db"]:.1f};desc="{profile.db_queries} queries"',
+            f'app;dur={timings["app"]:.1f}',
+            f'render;dur={timings["render"]:.1f}',
+            f'total;dur={timings["total"]:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        logger.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'route': match.view_name if match else None,
+            'status': response.status_code,
+            'user_id': _loaded_user_id(request),
+            'total_ms': round(timings['total'], 2),
+            'db_ms': round(timings['db'], 2),
+            'db_queries': profile.db_queries,
+            'app_ms': round(timings['app'], 2),
+            'render_ms': round(timings['render'], 2),
+            'response_bytes': size,
+            'profiled': profiler is not None,
+        }))
+
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        profile = getattr(request, '_profile', None)
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request: HttpRequest, response):
+        """DRF responses are rendered after this hook, so time the rendering separately"""
+        profile = getattr(request, '_profile', None)
+        if profile is not None:
+            profile.view_finished = time.perf_counter()
+
+            def mark_rendered(rendered):
+                profile.render_finished = time.perf_counter()
+                return rendered
+
+            response.add_post_render_callback(mark_rendered)
+        return response
+
+    def _should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start_profiler(self):
+        if self.profiler_name == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning('pyinstrument is not installed, falling back to cProfile')
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _save_profile(self, profiler, request: HttpRequest) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_') or 'root'
+        base_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{request.method}_{slug}"
+
+        if hasattr(profiler, 'output_html'):
+            profiler.stop()
+            path = self.profile_dir / f'{base_name}.html'
+            path.write_text(profiler.output_html())
+        else:
+            profiler.disable()
+            path = self.profile_dir / f'{base_name}.prof'
+            profiler.dump_stats(str(path))
+
+        logger.info(json.dumps({'event': 'profile_saved', 'path': str(path)}))
+
+
+class MetricsMiddleware:
+    """
+    Records request latency, status and DB query histograms per route name
+    for the Prometheus endpoint (METRICS_ENABLED=True, default)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        query_durations: list = []
+        started = time.perf_counter()
+        with observe_queries(self._query_observer(query_durations)):
+            response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, len(query_durations))
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        query_durations: list = []
+        started = time.perf_counter()
+        with observe_queries(self._query_observer(query_durations)):
+            response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, len(query_durations))
+        return response
+
+    @staticmethod
+    def _query_observer(query_durations: list) -> QueryObserver:
+        def observe(elapsed: float, context: Dict[str, Any]) -> None:
+            # list.append is atomic, so concurrent ORM threads can share the list
+            query_durations.append(elapsed)
+            metrics.db_query_duration_seconds.observe(elapsed, alias=context['connection'].alias)
+        return observe
+
+    @staticmethod
+    def _record(request: HttpRequest, response: HttpResponse, elapsed: float, query_count: int) -> None:
+        route = _route_name(request)
+        metrics.http_requests_total.inc(route=route, method=request.method, status=str(response.status_code))
+        metrics.http_request_duration_seconds.observe(elapsed, route=route, method=request.method)
+        metrics.db_queries_per_request.observe(query_count, route=route)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a user's replica reads to the primary for DATABASE_REPLICA_PIN_SECONDS
+    after any successful write request, so they never see stale data from a
+    lagging replica. Only active when DATABASE_REPLICA_URL is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not db_router.replica_configured():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        user_id = self._writer_id(request, response)
+        if user_id is not None:
+            db_router.pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(request)
+        user_id = self._writer_id(request, response)
+        if user_id is not None:
+            await db_router.apin_to_primary(user_id)
+        return response
+
+    @staticmethod
+    def _writer_id(request: HttpRequest, response: HttpResponse) -> Optional[int]:
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or response.status_code >= 400:
+            return None
+        # DRF copies the token user onto the Django request once the view authenticated it
+        return _loaded_user_id(request)
+
+
+def compress_brotli(content: bytes, quality: int, max_random_bytes: int) -> bytes:
+    """
+    Brotli counterpart of django.utils.text.compress_string(max_random_bytes=...):
+    a metadata meta-block of 1..max_random_bytes (at most 256) bytes, which
+    decoders skip (RFC 7932, section 9.2), randomizes the body length against
+    BREACH. The empty flush leaves the stream byte-aligned after its header,
+    so the block can be inserted there without re-aligning the bits after it.
+    """
+    compressor = brotli.Compressor(quality=quality)
+    header = compressor.flush()
+    skip = secrets.randbelow(max_random_bytes) + 1
+    # ISLAST=0, MNIBBLES=0 (coded as 3), reserved bit, MSKIPBYTES=1, MSKIPLEN-1, zeros up to the byte boundary
+    metadata = ((0b11 << 1) | (1 << 4) | ((skip - 1) << 6)).to_bytes(2, 'little') + bytes(skip)
+    return header + metadata + compressor.process(content) + compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Django's GZipMiddleware (random length padding against BREACH, weak ETags)
+    plus brotli, used when the package is installed and the client accepts it,
+    padded the same way. Streaming responses, bodies under
+    RESPONSE_COMPRESSION_MIN_BYTES and already compressed content types are
+    sent as they are. Bytes saved and the CPU time spent compressing
+    are recorded per route in /api/metrics/.
+    """
+
+    # Already compressed formats (images, archives) gain nothing
+    compressible_types = re.compile(r'^(text/|application/(json|javascript|xml)|image/svg\+xml)')
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not getattr(settings, 'RESPONSE_COMPRESSION', True):
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+        self.min_bytes = settings.RESPONSE_COMPRESSION_MIN_BYTES
+        self.brotli_quality = settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        # Streaming exports are sent as they are generated
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not self.compressible_types.match(response.get('Content-Type', ''))
+            or len(response.content) < self.min_bytes
+        ):
+            return response
+
+        original_size = len(response.content)
+        encoding = self._negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        started = time.thread_time()
+        if encoding == 'br':
+            self._compress_brotli(response)
+        else:
+            response = super().process_response(request, response)
+        elapsed = time.thread_time() - started
+
+        encoding = response.get('Content-Encoding')
+        if encoding is None:
+            return response
+        route = _route_name(request)
+        sent_size = len(response.content)
+        metrics.http_response_compression_seconds.observe(elapsed, route=route, encoding=encoding)
+        metrics.http_response_bytes_total.inc(original_size, route=route, encoding=encoding, stage='original')
+        metrics.http_response_bytes_total.inc(sent_size, route=route, encoding=encoding, stage='sent')
+        metrics.http_response_compression_saved_bytes_total.inc(
+            original_size - sent_size, route=route, encoding=encoding,
+        )
+        return response
+
+    def _compress_brotli(self, response: HttpResponse) -> None:
+        """Same steps as GZipMiddleware's non-streaming branch"""
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = compress_brotli(response.content, self.brotli_quality, self.max_random_bytes)
+        if len(compressed) >= len(response.content):
+            return
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+
+    @staticmethod
+    def _negotiate(accept_encoding: str) -> Optional[str]:
+        """'br' when brotli is installed and accepted (q > 0), otherwise leave it to GZipMiddleware"""
+        if brotli is None:
+            return None
+        for item in accept_encoding.split(','):
+            name, _, params = item.partition(';')
+            if name.strip().lower() != 'br':
+                continue
+            quality = params.strip().removeprefix('q=')
+            try:
+                return 'br' if not quality or float(quality) > 0 else None
+            except ValueError:
+                return None
+        return None
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_incremental_backups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserFinancialSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='financial_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('accounts_count', models.IntegerField(default=0)),
+                ('month', models.DateField()),
+                ('month_income', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('month_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('goals_in_progress', models.IntegerField(default=0)),
+                ('goals_completed', models.IntegerField(default=0)),
+                ('committed_funds', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_financial_summaries',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_user_financial_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BudgetPeriodResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('budgeted', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('spent', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('is_closed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('budget', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_results', to='api.budget')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budget_period_results', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'budget_period_results',
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['user', 'month'], name='budget_peri_user_id_8adae0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('budget', 'month'), name='budget_period_result_month_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_summaries(apps, schema_editor):
+    """
+    0004 only created the table: build the row of every user that has none,
+    so the dashboard never has to build it on a read
+
+    The GROUP BY queries are a frozen copy of SummaryService.compute as of this
+    migration, on purpose: a migration runs against the historical models and
+    must keep producing the schema of its time, whatever compute becomes.
+    Later changes to the figures are caught up by `manage.py rebuild_summaries`.
+    """
+    database = schema_editor.connection.alias
+    User = apps.get_model('api', 'User')
+    Account = apps.get_model('api', 'Account')
+    Transaction = apps.get_model('api', 'Transaction')
+    Goal = apps.get_model('api', 'Goal')
+    Investment = apps.get_model('api', 'Investment')
+    UserFinancialSummary = apps.get_model('api', 'UserFinancialSummary')
+
+    first = date.today().replace(day=1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    user_ids = list(
+        User.objects.using(database).filter(financial_summary__isnull=True).order_by('pk').values_list('pk', flat=True)
+    )
+
+    for offset in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[offset:offset + BATCH_SIZE]
+        figures = {user_id: {'month': first} for user_id in batch}
+        querysets = [
+            Account.objects.using(database).filter(user_id__in=batch).values('user_id').annotate(
+                total_balance=Sum('balance'),
+                accounts_count=Count('id'),
+            ),
+            Transaction.objects.using(database).filter(
+                user_id__in=batch,
+                transaction_date__gte=first,
+                transaction_date__lt=next_first,
+            ).values('user_id').annotate(
+                month_income=Sum('amount', filter=Q(type='Income')),
+                month_expenses=Sum('amount', filter=Q(type='Expense')),
+            ),
+            Goal.objects.using(database).filter(user_id__in=batch).values('user_id').annotate(
+                goals_in_progress=Count('id', filter=Q(status='In Progress')),
+                goals_completed=Count('id', filter=Q(status='Completed')),
+            ),
+            Investment.objects.using(database).filter(
+                user_id__in=batch,
+                status='active',
+                account__isnull=False,
+            ).values('user_id').annotate(
+                committed_funds=Sum('current_amount'),
+            ),
+        ]
+        for queryset in querysets:
+            for row in queryset.order_by():
+                user_id = row.pop('user_id')
+                figures[user_id].update({field: value for field, value in row.items() if value is not None})
+
+        UserFinancialSummary.objects.using(database).bulk_create(
+            [UserFinancialSummary(user_id=user_id, **values) for user_id, values in figures.items()],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_budget_period_results'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,10 @@ Models package
 from .user import User
 from .account import Account
 from .transaction import Category, Transaction
-from .financial import Budget, BudgetHistory, Goal, Transfer, Debt, DebtPayment, RecurringTransaction
+from .financial import Budget, BudgetHistory, BudgetPeriodResult, Goal, Transfer, Debt, DebtPayment, RecurringTransaction
 from .investment import Investment, InvestmentTransaction
+from .system import JobRun, DeletedRecord
+from .summary import UserFinancialSummary
 
 __all__ = [
     'User',
@@ -14,6 +16,7 @@ __all__ = [
     'Transaction',
     'Budget',
     'BudgetHistory',
+    'BudgetPeriodResult',
     'Goal',
     'Transfer',
     'Debt',
@@ -21,6 +24,9 @@ __all__ = [
     'RecurringTransaction',
     'Investment',
     'InvestmentTransaction',
+    'JobRun',
+    'DeletedRecord',
+    'UserFinancialSummary',
 ]
 
 
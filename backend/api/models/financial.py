@@ -1,7 +1,7 @@
 """
-Financial models: Budget, Goal, Transfer, Debt, RecurringIncome
+Financial models: Budget, BudgetPeriodResult, Goal, Transfer, Debt, RecurringIncome
 """
-from django.db import models
+from django.db import models, transaction as db_transaction
 from datetime import date, timedelta
 from decimal import Decimal
 from .user import User
@@ -58,6 +58,35 @@ class BudgetHistory(models.Model):
         return f"Budget change: ${self.previous_amount or 0} → ${self.new_amount}"
 
 
+class BudgetPeriodResult(models.Model):
+    """
+    Budgeted and spent amounts of a budget in one calendar month
+    Closed months are snapshots written by `manage.py close_budget_periods`;
+    the open month is kept current as transactions and budgets change
+    (api.services.BudgetPerformanceService)
+    """
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='period_results')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='budget_period_results')
+    month = models.DateField()  # First day of the month
+    budgeted = models.DecimalField(max_digits=12, decimal_places=2)
+    spent = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    is_closed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'budget_period_results'
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(fields=['budget', 'month'], name='budget_period_result_month_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'month']),
+        ]
+    
+    def __str__(self) -> str:
+        return f"Budget {self.budget_id} {self.month:%Y-%m}: {self.spent}/{self.budgeted}"
+
+
 class Goal(models.Model):
     """
     Goal model for financial goals tracking
@@ -94,6 +123,7 @@ class Transfer(models.Model):
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     transfer_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Incremental backup watermark
     
     class Meta:
         db_table = 'transfers'
@@ -176,6 +206,7 @@ class DebtPayment(models.Model):
     notes = models.CharField(max_length=255, null=True, blank=True)
     transaction = models.OneToOneField('Transaction', on_delete=models.SET_NULL, null=True, blank=True, related_name='debt_payment')  # Link to transaction
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Incremental backup watermark
     
     class Meta:
         db_table = 'debt_payments'
@@ -281,8 +312,12 @@ class RecurringTransaction(models.Model):
         
         return True
     
+    @db_transaction.atomic
     def generate_transaction(self) -> Transaction:
         """Generate a transaction for this recurring transaction (income or expense)"""
+        # Imported here: the services package imports the models
+        from api.services import SummaryService
+        
         # Determine transaction description based on type
         type_label = 'Ingreso' if self.transaction_type == 'Income' else 'Egreso'
         
@@ -301,7 +336,8 @@ class RecurringTransaction(models.Model):
             self.account.balance = Decimal(str(self.account.balance)) + self.amount
         else:  # Expense
             self.account.balance = Decimal(str(self.account.balance)) - self.amount
-        self.account.save()
+        self.account.save(update_fields=['balance'])
+        SummaryService.apply_transaction(new=transaction)
         
         # Update last generated date
         self.last_generated_date = date.today()
@@ -148,8 +148,9 @@ class Investment(models.Model):
                 if not account:
                     raise ValueError(f"No account available for policy {self.name}")
             
-            # Import Transaction model to avoid circular import
+            # Import Transaction model and the service to avoid circular import
             from api.models.transaction import Transaction
+            from api.services import SummaryService
             
             # Create Transaction (Income) in the account
             transaction = Transaction.objects.create(
@@ -164,7 +165,8 @@ class Investment(models.Model):
             
             # Update account balance
             account.balance += Decimal(str(monthly_return))
-            account.save()
+            account.save(update_fields=['balance'])
+            SummaryService.apply_transaction(new=transaction)
             
             # Create InvestmentTransaction record
             inv_transaction = InvestmentTransaction.objects.create(
@@ -184,6 +186,7 @@ class Investment(models.Model):
             self.last_return_date = date.today()
             
             self.save()
+            SummaryService.refresh(self.user_id, 'investments')
             
             return inv_transaction
 
@@ -217,6 +220,7 @@ class InvestmentTransaction(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Incremental backup watermark
     
     class Meta:
         db_table = 'investment_transactions'
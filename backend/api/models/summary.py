@@ -0,0 +1,31 @@
+"""
+Summary models: UserFinancialSummary
+"""
+from django.db import models
+from .user import User
+
+
+class UserFinancialSummary(models.Model):
+    """
+    Headline figures of one user, kept up to date by the write paths
+    (api.services.SummaryService) so the dashboard reads them in one PK lookup.
+    Derived data: `manage.py rebuild_summaries` recomputes it from the source tables.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='financial_summary')
+    total_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    accounts_count = models.IntegerField(default=0)
+    # First day of the calendar month that month_income/month_expenses belong to
+    month = models.DateField()
+    month_income = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    month_expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    goals_in_progress = models.IntegerField(default=0)
+    goals_completed = models.IntegerField(default=0)
+    # Current amount of the active investments linked to an account
+    committed_funds = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_financial_summaries'
+
+    def __str__(self) -> str:
+        return f"Summary of user {self.user_id} ({self.month:%Y-%m})"
@@ -0,0 +1,82 @@
+"""
+System models: JobRun, DeletedRecord
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class JobRun(models.Model):
+    """
+    Execution record for scheduled management commands
+    Used by /api/metrics/ and the deep health check
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('partial', 'Partial'),  # Finished with some item-level errors
+        ('failed', 'Failed'),
+    ]
+
+    # Jobs reported by /api/metrics/
+    TRACKED_JOBS = [
+        'generate_recurring_transactions',
+        'generate_insurance_returns',
+        'close_budget_periods',
+    ]
+
+    job = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    generated_count = models.IntegerField(default=0)
+    skipped_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    message = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'job_runs'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['job', 'status', 'started_at']),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.job} ({self.status}) - {self.started_at:%Y-%m-%d %H:%M}"
+
+    def finish(self, generated: int = 0, skipped: int = 0, errors: int = 0, message: str | None = None) -> None:
+        """Mark the run as finished and store its counters"""
+        self.finished_at = timezone.now()
+        self.duration_seconds = (self.finished_at - self.started_at).total_seconds()
+        self.generated_count = generated
+        self.skipped_count = skipped
+        self.error_count = errors
+        self.message = message
+        self.status = 'success' if errors == 0 else 'partial'
+        self.save()
+
+    def fail(self, message: str) -> None:
+        """Mark the run as failed (unhandled exception)"""
+        self.finished_at = timezone.now()
+        self.duration_seconds = (self.finished_at - self.started_at).total_seconds()
+        self.message = message
+        self.status = 'failed'
+        self.save()
+
+
+class DeletedRecord(models.Model):
+    """
+    Tombstone written when a row of a backed up table is deleted directly
+    (rows removed by its cascades are not recorded: replaying it cascades again)
+    Incremental backups export these so a restored chain replays deletes
+    """
+    table_name = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'deleted_records'
+        ordering = ['-deleted_at']
+
+    def __str__(self) -> str:
+        return f"{self.table_name}#{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
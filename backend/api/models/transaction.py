@@ -45,6 +45,7 @@ class Transaction(models.Model):
     description = models.CharField(max_length=255, null=True, blank=True)
     transaction_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Incremental backup watermark
     
     class Meta:
         db_table = 'transactions'
@@ -53,4 +54,16 @@ class Transaction(models.Model):
     def __str__(self) -> str:
         return f"{self.type} - {self.amount} ({self.transaction_date})"
 
+    # Fields that decide which budget an expense counts towards, as loaded:
+    # lets receivers see what an update moved without querying the old row
+    BUDGET_FIELDS = ('user_id', 'type', 'category_id', 'transaction_date')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if all(field in loaded for field in cls.BUDGET_FIELDS):
+            instance._loaded_budget_values = tuple(loaded[field] for field in cls.BUDGET_FIELDS)
+        return instance
+
 
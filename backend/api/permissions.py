@@ -1,31 +1,90 @@
 """
 Custom permissions for the API
+
+Ownership is enforced in SQL: viewsets use OwnedQuerysetMixin and name the
+lookup from their model to the owner's id (owner_field), so list, retrieve,
+update and delete only ever see the requesting user's rows. The object-level
+checks below re-check the owner from data already loaded with the object and
+never run a query of their own: a viewset whose queryset doesn't load the
+relations in its owner_field is a configuration error.
 """
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Model, QuerySet
 from rest_framework import permissions
 
 
+# owner_id() result when the owner isn't loaded on the object
+NOT_LOADED = object()
+
+
+def owner_id(obj: Model, owner_field: str) -> Any:
+    """
+    Follow owner_field ('user_id', 'debt__user_id', ...) through relations
+    already cached on obj (select_related). Returns NOT_LOADED instead of
+    fetching a relation that isn't.
+    """
+    *relations, attname = owner_field.split('__')
+    for name in relations:
+        field = obj._meta.get_field(name)
+        if not field.is_cached(obj):
+            return NOT_LOADED
+        obj = getattr(obj, name)
+        if obj is None:
+            return None
+    return getattr(obj, attname)
+
+
+class OwnedQuerysetMixin:
+    """
+    Viewset mixin: get_queryset() is the class `queryset` filtered to the
+    requesting user. owner_field is the lookup from the model to the owner's
+    id, e.g. 'user_id' or 'debt__user_id' for rows owned through a parent.
+    Subclasses add their own filters on top of super().get_queryset().
+    """
+    owner_field = 'user_id'
+
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().filter(**{self.owner_field: self.request.user.id})
+
+
 class IsOwnerPermission(permissions.BasePermission):
     """
     Permission that checks if the user is the owner of the object.
-    
+
     This permission ensures that users can only access resources they own,
     preventing IDOR (Insecure Direct Object Reference) vulnerabilities.
+    The view must scope its queryset with OwnedQuerysetMixin.
     """
-    
+
+    def has_permission(self, request, view):
+        # Fail closed: without a scoped queryset other users' rows would be reachable
+        if getattr(view, 'owner_field', None) is None:
+            raise ImproperlyConfigured(
+                f'{type(view).__name__} uses IsOwnerPermission but not OwnedQuerysetMixin'
+            )
+        return True
+
     def has_object_permission(self, request, view, obj):
         """
         Check if the requesting user is the owner of the object.
-        
+
         Returns:
             True if the object belongs to the requesting user, False otherwise
+
+        Raises:
+            ImproperlyConfigured: the owner wasn't loaded with the object
         """
-        # Check if object has user attribute
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
-        
-        # For objects without direct user relationship, allow
-        # (these should be filtered at queryset level)
-        return True
+        owner = owner_id(obj, view.owner_field)
+
+        # Fail closed rather than trusting the queryset filter alone (or querying per object)
+        if owner is NOT_LOADED:
+            raise ImproperlyConfigured(
+                f'{type(view).__name__} did not load {view.owner_field} with the object '
+                f'(select_related the relations it goes through)'
+            )
+        return owner == request.user.id
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -33,17 +92,17 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     Custom permission to only allow owners of an object to edit it.
     Read permissions are allowed to authenticated users.
     """
-    
+
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed for authenticated users
         if request.method in permissions.SAFE_METHODS:
             # Still check ownership for read operations
-            if hasattr(obj, 'user'):
-                return obj.user == request.user
+            if hasattr(obj, 'user_id'):
+                return obj.user_id == request.user.id
             return True
-        
+
         # Write permissions are only allowed to the owner
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
-        
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.id
+
         return True
@@ -0,0 +1,77 @@
+"""
+orjson renderer and parser
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser (see
+REST_FRAMEWORK in settings) that produce and accept the same JSON:
+    - dates and datetimes are encoded by orjson itself, with UTC written
+      as 'Z' like DRF's encoder does
+    - Decimal values outside serializer fields (DecimalField already
+      renders strings) become numbers, as with DRF's encoder
+    - anything else orjson doesn't know (lazy translations, timedelta,
+      querysets...) goes through DRF's encoder
+
+Requests DRF's options can't be expressed in (indent other than 2 isn't
+supported by orjson, UNICODE_JSON=False, non UTF-8 request bodies) and
+installs without orjson use the stdlib json implementation.
+"""
+import codecs
+import logging
+from decimal import Decimal
+from typing import Any
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logging.getLogger('api').warning('orjson is not installed, falling back to the stdlib json renderer')
+
+
+_drf_default = encoders.JSONEncoder().default
+
+# JavaScript line terminators DRF escapes so JSON stays a strict JS subset
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def _default(obj: Any) -> Any:
+    if type(obj) is Decimal:
+        return float(obj)
+    return _drf_default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer with the same output, encoded by orjson"""
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent not in (None, 2) or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = self.options | orjson.OPT_INDENT_2 if indent == 2 else self.options
+        ret = orjson.dumps(data, default=_default, option=options)
+        for separator, escaped in _LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser decoding with orjson, which rejects NaN/Infinity like STRICT_JSON"""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,56 +1,82 @@
 """
 Serializers package
+Submodules are imported on first access (PEP 562): importing one
+serializer does not load every other serializer module
 """
-from .user import UserSerializer, RegisterSerializer, UserProfileSerializer, ChangePasswordSerializer, CustomTokenObtainPairSerializer
-from .account import AccountSerializer
-from .transaction import CategorySerializer, TransactionSerializer
-from .financial import BudgetSerializer, BudgetHistorySerializer, GoalSerializer, TransferSerializer, DebtSerializer, DebtPaymentSerializer, RecurringTransactionSerializer
-from .investment import InvestmentSerializer, InvestmentTransactionSerializer
-from .dashboard import DashboardStatsSerializer
-from .trends import (
-    CategoryTrendSerializer, 
-    CategoryOverviewSerializer, 
-    MonthlyDataSerializer, 
-    TrendsOverviewSerializer,
-    GlobalTrendsSerializer,
-    GlobalMonthlyDataSerializer,
-    CategoryDistributionSerializer,
-    CategoryDistributionItemSerializer,
-    SpendingComparisonSerializer,
-    PeriodDataSerializer,
-    ChangeDataSerializer
-)
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
-    'UserSerializer',
-    'RegisterSerializer',
-    'UserProfileSerializer',
-    'ChangePasswordSerializer',
-    'CustomTokenObtainPairSerializer',
-    'AccountSerializer',
-    'CategorySerializer',
-    'TransactionSerializer',
-    'BudgetSerializer',
-    'BudgetHistorySerializer',
-    'GoalSerializer',
-    'TransferSerializer',
-    'DebtSerializer',
-    'DebtPaymentSerializer',
-    'RecurringTransactionSerializer',
-    'InvestmentSerializer',
-    'InvestmentTransactionSerializer',
-    'DashboardStatsSerializer',
-    'CategoryTrendSerializer',
-    'CategoryOverviewSerializer',
-    'MonthlyDataSerializer',
-    'TrendsOverviewSerializer',
-    'GlobalTrendsSerializer',
-    'GlobalMonthlyDataSerializer',
-    'CategoryDistributionSerializer',
-    'CategoryDistributionItemSerializer',
-    'SpendingComparisonSerializer',
-    'PeriodDataSerializer',
-    'ChangeDataSerializer',
-]
+if TYPE_CHECKING:
+    from .user import UserSerializer, RegisterSerializer, UserProfileSerializer, ChangePasswordSerializer, CustomTokenObtainPairSerializer
+    from .account import AccountSerializer
+    from .transaction import CategorySerializer, TransactionSerializer, TransactionReadSerializer
+    from .financial import BudgetSerializer, BudgetHistorySerializer, GoalSerializer, TransferSerializer, DebtSerializer, DebtPaymentSerializer, DebtPaymentReadSerializer, RecurringTransactionSerializer
+    from .investment import InvestmentSerializer, InvestmentTransactionSerializer, InvestmentTransactionReadSerializer
+    from .rows import RowSerializer, serialize_rows
+    from .dashboard import DashboardStatsSerializer
+    from .trends import (
+        CategoryTrendSerializer, 
+        CategoryOverviewSerializer, 
+        MonthlyDataSerializer, 
+        TrendsOverviewSerializer,
+        GlobalTrendsSerializer,
+        GlobalMonthlyDataSerializer,
+        CategoryDistributionSerializer,
+        CategoryDistributionItemSerializer,
+        CategoryDrillDownSerializer,
+        DescriptionBreakdownItemSerializer,
+        SpendingComparisonSerializer,
+        PeriodDataSerializer,
+        ChangeDataSerializer
+    )
 
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'UserSerializer': '.user',
+    'RegisterSerializer': '.user',
+    'UserProfileSerializer': '.user',
+    'ChangePasswordSerializer': '.user',
+    'CustomTokenObtainPairSerializer': '.user',
+    'AccountSerializer': '.account',
+    'CategorySerializer': '.transaction',
+    'TransactionSerializer': '.transaction',
+    'TransactionReadSerializer': '.transaction',
+    'BudgetSerializer': '.financial',
+    'BudgetHistorySerializer': '.financial',
+    'GoalSerializer': '.financial',
+    'TransferSerializer': '.financial',
+    'DebtSerializer': '.financial',
+    'DebtPaymentSerializer': '.financial',
+    'DebtPaymentReadSerializer': '.financial',
+    'RecurringTransactionSerializer': '.financial',
+    'InvestmentSerializer': '.investment',
+    'InvestmentTransactionSerializer': '.investment',
+    'InvestmentTransactionReadSerializer': '.investment',
+    'RowSerializer': '.rows',
+    'serialize_rows': '.rows',
+    'DashboardStatsSerializer': '.dashboard',
+    'CategoryTrendSerializer': '.trends',
+    'CategoryOverviewSerializer': '.trends',
+    'MonthlyDataSerializer': '.trends',
+    'TrendsOverviewSerializer': '.trends',
+    'GlobalTrendsSerializer': '.trends',
+    'GlobalMonthlyDataSerializer': '.trends',
+    'CategoryDistributionSerializer': '.trends',
+    'CategoryDistributionItemSerializer': '.trends',
+    'CategoryDrillDownSerializer': '.trends',
+    'DescriptionBreakdownItemSerializer': '.trends',
+    'SpendingComparisonSerializer': '.trends',
+    'PeriodDataSerializer': '.trends',
+    'ChangeDataSerializer': '.trends',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
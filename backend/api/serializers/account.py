@@ -4,10 +4,11 @@ Account serializers
 from decimal import Decimal
 from rest_framework import serializers
 from django.db.models import Sum
+from api.fieldsets import SparseFieldsMixin
 from api.models import Account
 
 
-class AccountSerializer(serializers.ModelSerializer[Account]):
+class AccountSerializer(SparseFieldsMixin, serializers.ModelSerializer[Account]):
     committed_to_goals = serializers.SerializerMethodField()
     available_balance = serializers.SerializerMethodField()
     
@@ -15,6 +16,11 @@ class AccountSerializer(serializers.ModelSerializer[Account]):
         model = Account
         fields = ['id', 'user', 'name', 'type', 'balance', 'currency', 'color', 'committed_to_goals', 'available_balance', 'created_at']
         read_only_fields = ['id', 'created_at', 'user']
+        # Model fields read by the SerializerMethodFields (see api.fieldsets)
+        method_field_sources = {
+            'committed_to_goals': (),
+            'available_balance': ('balance',),
+        }
     
     def get_committed_to_goals(self, obj: Account) -> float:
         """Calculate total committed to active investments linked to this account"""
@@ -13,6 +13,9 @@ class DashboardStatsSerializer(serializers.Serializer[Dict[str, Any]]):
     total_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
     total_income = serializers.DecimalField(max_digits=12, decimal_places=2)
     total_expenses = serializers.DecimalField(max_digits=12, decimal_places=2)
+    month_income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    month_expenses = serializers.DecimalField(max_digits=14, decimal_places=2)
+    committed_funds = serializers.DecimalField(max_digits=14, decimal_places=2)
     accounts_count = serializers.IntegerField()
     recent_transactions = TransactionSerializer(many=True)
     goals_summary = serializers.DictField()
@@ -5,10 +5,12 @@ from decimal import Decimal
 from datetime import date, timedelta
 from rest_framework import serializers
 from django.db.models import Sum, Q
+from api.fieldsets import SparseFieldsMixin
 from api.models import Budget, BudgetHistory, Goal, Transfer, Transaction, Debt, DebtPayment, RecurringTransaction
+from .rows import RowSerializer, format_date, format_decimal
 
 
-class BudgetSerializer(serializers.ModelSerializer[Budget]):
+class BudgetSerializer(SparseFieldsMixin, serializers.ModelSerializer[Budget]):
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_icon = serializers.CharField(source='category.icon', read_only=True)
     spent = serializers.SerializerMethodField()
@@ -25,7 +27,7 @@ class BudgetSerializer(serializers.ModelSerializer[Budget]):
         if request and hasattr(request, 'user'):
             from api.models import Category
             self.fields['category'] = serializers.PrimaryKeyRelatedField(
-                queryset=Category.objects.filter(user=request.user)
+                queryset=Category.objects.filter(user_id=request.user.id)
             )
     
     class Meta:
@@ -37,6 +39,15 @@ class BudgetSerializer(serializers.ModelSerializer[Budget]):
             'spent', 'remaining', 'percentage', 'days_left', 'history_count', 'is_indefinite'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'user']
+        # Model fields read by the SerializerMethodFields (see api.fieldsets)
+        method_field_sources = {
+            'spent': ('user', 'category'),
+            'remaining': ('user', 'category', 'amount'),
+            'percentage': ('user', 'category', 'amount'),
+            'days_left': ('is_recurring', 'period_end'),
+            'history_count': (),
+            'is_indefinite': ('period_end',),
+        }
     
     def get_spent(self, obj: Budget) -> float:
         """Calculate total spent in current month for the category"""
@@ -53,8 +64,8 @@ class BudgetSerializer(serializers.ModelSerializer[Budget]):
         
         # Build filter conditions
         filters = {
-            'user': obj.user,
-            'category': obj.category,
+            'user_id': obj.user_id,
+            'category_id': obj.category_id,
             'type': 'Expense',
             'transaction_date__gte': month_start,
             'transaction_date__lte': month_end,
@@ -102,7 +113,7 @@ class BudgetSerializer(serializers.ModelSerializer[Budget]):
         return obj.period_end is None
 
 
-class BudgetHistorySerializer(serializers.ModelSerializer[BudgetHistory]):
+class BudgetHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer[BudgetHistory]):
     changed_by_username = serializers.CharField(source='changed_by.username', read_only=True, allow_null=True)
     
     class Meta:
@@ -115,7 +126,7 @@ class BudgetHistorySerializer(serializers.ModelSerializer[BudgetHistory]):
         read_only_fields = ['id', 'changed_at']
 
 
-class GoalSerializer(serializers.ModelSerializer[Goal]):
+class GoalSerializer(SparseFieldsMixin, serializers.ModelSerializer[Goal]):
     progress_percentage = serializers.SerializerMethodField()
     account_name = serializers.CharField(source='account.name', read_only=True, allow_null=True)
     account_id = serializers.IntegerField(source='account.id', read_only=True, allow_null=True)
@@ -127,7 +138,7 @@ class GoalSerializer(serializers.ModelSerializer[Goal]):
         if request and hasattr(request, 'user'):
             from api.models import Account
             self.fields['account'] = serializers.PrimaryKeyRelatedField(
-                queryset=Account.objects.filter(user=request.user),
+                queryset=Account.objects.filter(user_id=request.user.id),
                 allow_null=True
             )
     
@@ -139,6 +150,9 @@ class GoalSerializer(serializers.ModelSerializer[Goal]):
             'deadline', 'status', 'progress_percentage', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'user']
+        method_field_sources = {
+            'progress_percentage': ('current_amount', 'target_amount'),
+        }
     
     def get_progress_percentage(self, obj: Goal) -> float:
         if obj.target_amount > 0:
@@ -146,13 +160,13 @@ class GoalSerializer(serializers.ModelSerializer[Goal]):
         return 0.0
 
 
-class TransferSerializer(serializers.ModelSerializer[Transfer]):
+class TransferSerializer(SparseFieldsMixin, serializers.ModelSerializer[Transfer]):
     # Read-only fields for display
     from_account_name = serializers.CharField(source='from_account.name', read_only=True)
     to_account_name = serializers.CharField(source='to_account.name', read_only=True)
     from_account_id = serializers.IntegerField(source='from_account.id', read_only=True)
     to_account_id = serializers.IntegerField(source='to_account.id', read_only=True)
-    user_id = serializers.IntegerField(source='user.id', read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -160,7 +174,7 @@ class TransferSerializer(serializers.ModelSerializer[Transfer]):
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
             from api.models import Account
-            account_queryset = Account.objects.filter(user=request.user)
+            account_queryset = Account.objects.filter(user_id=request.user.id)
             self.fields['from_account'] = serializers.PrimaryKeyRelatedField(
                 queryset=account_queryset
             )
@@ -200,7 +214,7 @@ class TransferSerializer(serializers.ModelSerializer[Transfer]):
         read_only_fields = ['id', 'created_at', 'user']
 
 
-class DebtSerializer(serializers.ModelSerializer[Debt]):
+class DebtSerializer(SparseFieldsMixin, serializers.ModelSerializer[Debt]):
     total_interest = serializers.SerializerMethodField()
     total_amount = serializers.SerializerMethodField()
     remaining_balance = serializers.SerializerMethodField()
@@ -216,6 +230,18 @@ class DebtSerializer(serializers.ModelSerializer[Debt]):
             'remaining_balance', 'payment_progress', 'payments_count'
         ]
         read_only_fields = ['id', 'created_at', 'user']
+        # payments_count uses the prefetched payments
+        method_field_sources = {
+            'total_interest': ('interest_type', 'principal_amount', 'interest_rate', 'term_months', 'monthly_payment'),
+            'total_amount': ('interest_type', 'principal_amount', 'interest_rate', 'term_months', 'monthly_payment'),
+            'remaining_balance': (
+                'interest_type', 'principal_amount', 'interest_rate', 'term_months', 'monthly_payment', 'amount_paid',
+            ),
+            'payment_progress': (
+                'interest_type', 'principal_amount', 'interest_rate', 'term_months', 'monthly_payment', 'amount_paid',
+            ),
+            'payments_count': (),
+        }
     
     def get_total_interest(self, obj: Debt) -> float:
         return obj.total_interest
@@ -233,11 +259,26 @@ class DebtSerializer(serializers.ModelSerializer[Debt]):
         return obj.payments.count()
 
 
-class DebtPaymentSerializer(serializers.ModelSerializer[DebtPayment]):
+class DebtPaymentSerializer(SparseFieldsMixin, serializers.ModelSerializer[DebtPayment]):
     debt_creditor = serializers.CharField(source='debt.creditor_name', read_only=True)
     account_name = serializers.CharField(source='account.name', read_only=True, allow_null=True)
     account_id = serializers.IntegerField(source='account.id', read_only=True, allow_null=True)
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the user's own debts and accounts can be referenced
+        request = self.context.get('request')
+        if request and hasattr(request, 'user'):
+            from api.models import Account, Debt
+            self.fields['debt'] = serializers.PrimaryKeyRelatedField(
+                queryset=Debt.objects.filter(user_id=request.user.id)
+            )
+            self.fields['account'] = serializers.PrimaryKeyRelatedField(
+                queryset=Account.objects.filter(user_id=request.user.id),
+                allow_null=True,
+                required=False
+            )
+    
     class Meta:
         model = DebtPayment
         fields = [
@@ -247,7 +288,29 @@ class DebtPaymentSerializer(serializers.ModelSerializer[DebtPayment]):
         read_only_fields = ['id', 'created_at', 'transaction']
 
 
-class RecurringTransactionSerializer(serializers.ModelSerializer[RecurringTransaction]):
+class DebtPaymentReadSerializer(RowSerializer):
+    """DebtPaymentSerializer output for the payment history list"""
+    columns = {
+        'id': 'id',
+        'debt': 'debt_id',
+        'debt_creditor': 'debt__creditor_name',
+        'account': 'account_id',
+        'account_id': 'account_id',
+        'account_name': 'account__name',
+        'amount': 'amount',
+        'payment_date': 'payment_date',
+        'notes': 'notes',
+        'transaction': 'transaction_id',
+        'created_at': 'created_at',
+    }
+    formatters = {
+        'amount': format_decimal,
+        'payment_date': format_date,
+    }
+    datetime_columns = ('created_at',)
+
+
+class RecurringTransactionSerializer(SparseFieldsMixin, serializers.ModelSerializer[RecurringTransaction]):
     account_name = serializers.CharField(source='account.name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True, allow_null=True)
     next_occurrence = serializers.SerializerMethodField()
@@ -260,11 +323,11 @@ class RecurringTransactionSerializer(serializers.ModelSerializer[RecurringTransa
         if request and hasattr(request, 'user'):
             from api.models import Account, Category
             self.fields['account'] = serializers.PrimaryKeyRelatedField(
-                queryset=Account.objects.filter(user=request.user)
+                queryset=Account.objects.filter(user_id=request.user.id)
             )
             # Category filtering will be done in validation based on transaction_type
             self.fields['category'] = serializers.PrimaryKeyRelatedField(
-                queryset=Category.objects.filter(user=request.user),
+                queryset=Category.objects.filter(user_id=request.user.id),
                 allow_null=True,
                 required=False
             )
@@ -279,6 +342,10 @@ class RecurringTransactionSerializer(serializers.ModelSerializer[RecurringTransa
             'next_occurrence', 'total_generated'
         ]
         read_only_fields = ['id', 'created_at', 'last_generated_date', 'user']
+        method_field_sources = {
+            'next_occurrence': ('frequency', 'day_of_period', 'start_date', 'last_generated_date'),
+            'total_generated': ('user', 'account', 'category', 'transaction_type', 'name'),
+        }
     
     def get_next_occurrence(self, obj: RecurringTransaction) -> str:
         """Get next occurrence date"""
@@ -288,9 +355,9 @@ class RecurringTransactionSerializer(serializers.ModelSerializer[RecurringTransa
     def get_total_generated(self, obj: RecurringTransaction) -> int:
         """Count transactions generated by this recurring transaction"""
         return Transaction.objects.filter(
-            user=obj.user,
-            account=obj.account,
-            category=obj.category,
+            user_id=obj.user_id,
+            account_id=obj.account_id,
+            category_id=obj.category_id,
             type=obj.transaction_type,
             description__icontains=obj.name
         ).count()
@@ -2,10 +2,12 @@
 Investment serializers
 """
 from rest_framework import serializers
+from api.fieldsets import SparseFieldsMixin
 from api.models import Investment, InvestmentTransaction
+from .rows import RowSerializer, format_date, format_decimal
 
 
-class InvestmentSerializer(serializers.ModelSerializer[Investment]):
+class InvestmentSerializer(SparseFieldsMixin, serializers.ModelSerializer[Investment]):
     account_name = serializers.CharField(source='account.name', read_only=True, allow_null=True)
     progress_percentage = serializers.SerializerMethodField()
     projected_return = serializers.SerializerMethodField()
@@ -19,7 +21,7 @@ class InvestmentSerializer(serializers.ModelSerializer[Investment]):
         if request and hasattr(request, 'user'):
             from api.models import Account
             self.fields['account'] = serializers.PrimaryKeyRelatedField(
-                queryset=Account.objects.filter(user=request.user),
+                queryset=Account.objects.filter(user_id=request.user.id),
                 allow_null=True,
                 required=False
             )
@@ -37,6 +39,13 @@ class InvestmentSerializer(serializers.ModelSerializer[Investment]):
             'movements_count'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'user', 'last_return_date']
+        # Model fields read by the SerializerMethodFields (see api.fieldsets)
+        method_field_sources = {
+            'progress_percentage': ('investment_type', 'current_amount', 'target_amount'),
+            'projected_return': ('initial_amount', 'expected_return_rate', 'maturity_term_months'),
+            'projected_final_value': ('initial_amount', 'expected_return_rate', 'maturity_term_months'),
+            'movements_count': (),
+        }
     
     def get_progress_percentage(self, obj: Investment) -> float:
         return obj.progress_percentage
@@ -80,7 +89,7 @@ class InvestmentSerializer(serializers.ModelSerializer[Investment]):
         return attrs
 
 
-class InvestmentTransactionSerializer(serializers.ModelSerializer[InvestmentTransaction]):
+class InvestmentTransactionSerializer(SparseFieldsMixin, serializers.ModelSerializer[InvestmentTransaction]):
     investment_name = serializers.CharField(source='investment.name', read_only=True)
     account_name = serializers.CharField(source='account.name', read_only=True)
     
@@ -93,3 +102,24 @@ class InvestmentTransactionSerializer(serializers.ModelSerializer[InvestmentTran
         ]
         read_only_fields = ['id', 'created_at', 'account_transaction']
 
+
+class InvestmentTransactionReadSerializer(RowSerializer):
+    """InvestmentTransactionSerializer output for movement history lists"""
+    columns = {
+        'id': 'id',
+        'investment': 'investment_id',
+        'investment_name': 'investment__name',
+        'transaction_type': 'transaction_type',
+        'amount': 'amount',
+        'transaction_date': 'transaction_date',
+        'account': 'account_id',
+        'account_name': 'account__name',
+        'notes': 'notes',
+        'account_transaction': 'account_transaction_id',
+        'created_at': 'created_at',
+    }
+    formatters = {
+        'amount': format_decimal,
+        'transaction_date': format_date,
+    }
+    datetime_columns = ('created_at',)
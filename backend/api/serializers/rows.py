@@ -0,0 +1,98 @@
+"""
+Read-only serializers for list endpoints
+
+A RowSerializer produces the same output as the ModelSerializer it stands
+in for, without building model instances or running per-field serializer
+machinery: list views hand it QuerySet.values() rows (see rows()). It also
+accepts model instances whose relations were select_related, for small
+result sets that are already loaded. ?fields=/?omit= narrow both the
+values() columns and the output (see api.fieldsets).
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.fieldsets import select_fields
+
+
+# DRF's own formatting, so output matches the ModelSerializers exactly
+format_decimal = serializers.DecimalField(max_digits=12, decimal_places=2).to_representation
+format_date = serializers.DateField().to_representation
+
+
+class RowSerializer(serializers.BaseSerializer):
+    """
+    columns: output key -> values() lookup ('account__name' follows a relation)
+    formatters: output key -> function for values JSON can't carry as they are
+    datetime_columns: keys formatted like DRF's DateTimeField, with the
+    current timezone looked up once per serializer instead of once per row
+    omit_if_null: keys left out when null, like DRF does for read-only fields
+    (without allow_null) whose source relation is null
+    """
+    columns: Dict[str, str] = {}
+    formatters: Dict[str, Callable[[Any], Any]] = {}
+    datetime_columns: Tuple[str, ...] = ()
+    omit_if_null: Tuple[str, ...] = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.columns = self.sparse_columns(self.context.get('request'))
+
+    @classmethod
+    def sparse_columns(cls, request=None) -> Dict[str, str]:
+        """columns limited to the request's ?fields=/?omit= selection"""
+        return {key: cls.columns[key] for key in select_fields(cls.columns, request)}
+
+    @classmethod
+    def rows(cls, queryset: QuerySet, request=None) -> QuerySet:
+        """The queryset as values() rows with exactly the columns needed, in one query"""
+        return queryset.values(*dict.fromkeys(cls.sparse_columns(request).values()))
+
+    def to_representation(self, item: Union[Dict[str, Any], Model]) -> Dict[str, Any]:
+        if isinstance(item, dict):
+            data = {key: item[lookup] for key, lookup in self.columns.items()}
+        else:
+            data = {key: self._attribute(item, lookup) for key, lookup in self.columns.items()}
+        # Keys dropped by ?fields=/?omit= are missing from data
+        for key, formatter in self.formatters.items():
+            if data.get(key) is not None:
+                data[key] = formatter(data[key])
+        for key in self.datetime_columns:
+            if data.get(key) is not None:
+                data[key] = self._format_datetime(data[key])
+        for key in self.omit_if_null:
+            if key in data and data[key] is None:
+                del data[key]
+        return data
+
+    def _format_datetime(self, value: datetime) -> str:
+        if self._timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(self._timezone)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    @staticmethod
+    def _attribute(obj: Model, lookup: str) -> Any:
+        *relations, name = lookup.split('__')
+        for relation in relations:
+            obj = getattr(obj, relation)
+            if obj is None:
+                return None
+        return getattr(obj, name)
+
+
+def serialize_rows(serializer_class: type, queryset: Union[QuerySet, Iterable],
+                   context: Optional[Dict[str, Any]] = None) -> list:
+    """
+    RowSerializer output for a queryset (as values() rows) or already loaded
+    instances. Pass the view's serializer context to honour ?fields=/?omit=.
+    """
+    context = context or {}
+    if isinstance(queryset, QuerySet):
+        queryset = serializer_class.rows(queryset, context.get('request'))
+    return serializer_class(queryset, many=True, context=context).data
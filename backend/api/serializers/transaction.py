@@ -2,24 +2,26 @@
 Transaction and Category serializers
 """
 from rest_framework import serializers
+from api.fieldsets import SparseFieldsMixin
 from api.models import Category, Transaction
+from .rows import RowSerializer, format_date, format_decimal
 
 
-class CategorySerializer(serializers.ModelSerializer[Category]):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer[Category]):
     class Meta:
         model = Category
         fields = ['id', 'user', 'name', 'type', 'icon']
         read_only_fields = ['id', 'user']
 
 
-class TransactionSerializer(serializers.ModelSerializer[Transaction]):
+class TransactionSerializer(SparseFieldsMixin, serializers.ModelSerializer[Transaction]):
     # Read-only fields for display
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_icon = serializers.CharField(source='category.icon', read_only=True, allow_null=True)
     account_name = serializers.CharField(source='account.name', read_only=True)
-    user_id = serializers.IntegerField(source='user.id', read_only=True)
-    account_id = serializers.IntegerField(source='account.id', read_only=True)
-    category_id = serializers.IntegerField(source='category.id', read_only=True, allow_null=True)
+    user_id = serializers.IntegerField(read_only=True)
+    account_id = serializers.IntegerField(read_only=True)
+    category_id = serializers.IntegerField(read_only=True, allow_null=True)
     
     # Write-only fields for creating/updating
     # Note: queryset is set in __init__ to avoid circular imports
@@ -36,13 +38,13 @@ class TransactionSerializer(serializers.ModelSerializer[Transaction]):
         if request and hasattr(request, 'user'):
             self.fields['account'] = serializers.PrimaryKeyRelatedField(
                 write_only=True, 
-                queryset=Account.objects.filter(user=request.user)
+                queryset=Account.objects.filter(user_id=request.user.id)
             )
             self.fields['category'] = serializers.PrimaryKeyRelatedField(
                 write_only=True, 
                 allow_null=True, 
                 required=False, 
-                queryset=Category.objects.filter(user=request.user)
+                queryset=Category.objects.filter(user_id=request.user.id)
             )
         else:
             # Fallback for cases without request (e.g., nested serializers)
@@ -100,3 +102,26 @@ class TransactionSerializer(serializers.ModelSerializer[Transaction]):
         read_only_fields = ['id', 'created_at', 'user']
 
 
+class TransactionReadSerializer(RowSerializer):
+    """TransactionSerializer output for lists (transactions list, dashboard recent transactions)"""
+    columns = {
+        'id': 'id',
+        'user': 'user_id',
+        'user_id': 'user_id',
+        'account_id': 'account_id',
+        'account_name': 'account__name',
+        'category_id': 'category_id',
+        'category_name': 'category__name',
+        'category_icon': 'category__icon',
+        'type': 'type',
+        'amount': 'amount',
+        'description': 'description',
+        'transaction_date': 'transaction_date',
+        'created_at': 'created_at',
+    }
+    formatters = {
+        'amount': format_decimal,
+        'transaction_date': format_date,
+    }
+    datetime_columns = ('created_at',)
+    omit_if_null = ('category_name',)
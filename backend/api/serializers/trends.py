@@ -66,21 +66,39 @@ class CategoryDistributionItemSerializer(serializers.Serializer):
     percentage = serializers.FloatField()
 
 
+class DescriptionBreakdownItemSerializer(serializers.Serializer):
+    """Serializer for one expense description in a category drill-down"""
+    description = serializers.CharField()
+    amount = serializers.FloatField()
+    count = serializers.IntegerField()
+    percentage = serializers.FloatField()
+
+
+class CategoryDrillDownSerializer(serializers.Serializer):
+    """Serializer for the top descriptions of one category"""
+    category_id = serializers.IntegerField()
+    items = DescriptionBreakdownItemSerializer(many=True)
+    other_amount = serializers.FloatField()
+
+
 class CategoryDistributionSerializer(serializers.Serializer):
     """Serializer for category distribution (pie chart data)"""
     distribution = CategoryDistributionItemSerializer(many=True)
     total_expenses = serializers.FloatField()
     period_start = serializers.CharField()
     period_end = serializers.CharField()
+    drill_down = CategoryDrillDownSerializer(required=False)
 
 
 class PeriodDataSerializer(serializers.Serializer):
     """Serializer for period comparison data"""
+    label = serializers.CharField()
     income = serializers.FloatField()
     expenses = serializers.FloatField()
     net = serializers.FloatField()
     start_date = serializers.CharField()
     end_date = serializers.CharField()
+    closed = serializers.BooleanField()
 
 
 class ChangeDataSerializer(serializers.Serializer):
@@ -95,5 +113,6 @@ class SpendingComparisonSerializer(serializers.Serializer):
     current = PeriodDataSerializer()
     previous = PeriodDataSerializer()
     change = ChangeDataSerializer()
+    series = PeriodDataSerializer(many=True)
 
 
@@ -5,10 +5,56 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.db import transaction
+from api.fieldsets import SparseFieldsMixin
 from api.models import User, Category
 
 
-class UserSerializer(serializers.ModelSerializer[User]):
+# Categories every new user starts with: (name, type, icon)
+DEFAULT_CATEGORIES = (
+    # Income categories
+    ('Sueldo', 'Income', '💰'),
+    ('Bonificaciones', 'Income', '🎁'),
+    ('Freelance', 'Income', '💼'),
+    ('Inversiones', 'Income', '📈'),
+    ('Ventas', 'Income', '💵'),
+    ('Otros Ingresos', 'Income', '💸'),
+    
+    # Expense categories - Housing & Utilities
+    ('Renta', 'Expense', '🏠'),
+    ('Servicios', 'Expense', '💡'),
+    
+    # Transportation
+    ('Transporte', 'Expense', '🚌'),
+    ('Vehículo', 'Expense', '🚗'),
+    
+    # Food & Dining
+    ('Supermercado', 'Expense', '🛒'),
+    ('Restaurantes', 'Expense', '🍽️'),
+    
+    # Health & Personal
+    ('Salud', 'Expense', '⚕️'),
+    ('Farmacia', 'Expense', '💊'),
+    
+    # Entertainment & Lifestyle
+    ('Entretenimiento', 'Expense', '🎬'),
+    ('Suscripciones', 'Expense', '📺'),
+    ('Ropa', 'Expense', '👕'),
+    
+    # Education & Technology
+    ('Educación', 'Expense', '📚'),
+    ('Tecnología', 'Expense', '💻'),
+    
+    # Financial
+    ('Seguros', 'Expense', '🛡️'),
+    ('Impuestos', 'Expense', '📋'),
+    
+    # Other
+    ('Otros Gastos', 'Expense', '📦'),
+)
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer[User]):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'created_at']
@@ -44,78 +90,41 @@ class RegisterSerializer(serializers.ModelSerializer[User]):
         validated_data.pop('password_confirm')
         
         # Generate username from email (before @)
-        username = validated_data['email'].split('@')[0]
-        
-        # Ensure username is unique
-        base_username = username
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}{counter}"
-            counter += 1
-        
-        user = User.objects.create_user(
-            username=username,
-            email=validated_data['email'],
-            password=validated_data['password'],
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name']
-        )
+        username = self._unique_username(validated_data['email'].split('@')[0])
         
-        # Create default categories for the new user
-        default_categories = [
-            # Income categories
-            {'name': 'Sueldo', 'type': 'Income', 'icon': '💰'},
-            {'name': 'Bonificaciones', 'type': 'Income', 'icon': '🎁'},
-            {'name': 'Freelance', 'type': 'Income', 'icon': '💼'},
-            {'name': 'Inversiones', 'type': 'Income', 'icon': '📈'},
-            {'name': 'Ventas', 'type': 'Income', 'icon': '💵'},
-            {'name': 'Otros Ingresos', 'type': 'Income', 'icon': '💸'},
-            
-            # Expense categories - Housing & Utilities
-            {'name': 'Renta', 'type': 'Expense', 'icon': '🏠'},
-            {'name': 'Servicios', 'type': 'Expense', 'icon': '💡'},
-            
-            # Transportation
-            {'name': 'Transporte', 'type': 'Expense', 'icon': '🚌'},
-            {'name': 'Vehículo', 'type': 'Expense', 'icon': '🚗'},
-            
-            # Food & Dining
-            {'name': 'Supermercado', 'type': 'Expense', 'icon': '🛒'},
-            {'name': 'Restaurantes', 'type': 'Expense', 'icon': '🍽️'},
-            
-            # Health & Personal
-            {'name': 'Salud', 'type': 'Expense', 'icon': '⚕️'},
-            {'name': 'Farmacia', 'type': 'Expense', 'icon': '💊'},
-            
-            # Entertainment & Lifestyle
-            {'name': 'Entretenimiento', 'type': 'Expense', 'icon': '🎬'},
-            {'name': 'Suscripciones', 'type': 'Expense', 'icon': '📺'},
-            {'name': 'Ropa', 'type': 'Expense', 'icon': '👕'},
-            
-            # Education & Technology
-            {'name': 'Educación', 'type': 'Expense', 'icon': '📚'},
-            {'name': 'Tecnología', 'type': 'Expense', 'icon': '💻'},
-            
-            # Financial
-            {'name': 'Seguros', 'type': 'Expense', 'icon': '🛡️'},
-            {'name': 'Impuestos', 'type': 'Expense', 'icon': '📋'},
-            
-            # Other
-            {'name': 'Otros Gastos', 'type': 'Expense', 'icon': '📦'},
-        ]
-        
-        for cat_data in default_categories:
-            Category.objects.create(
-                user=user,
-                name=cat_data['name'],
-                type=cat_data['type'],
-                icon=cat_data['icon']
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=username,
+                email=validated_data['email'],
+                password=validated_data['password'],
+                first_name=validated_data['first_name'],
+                last_name=validated_data['last_name']
             )
+            
+            # Create default categories for the new user in a single INSERT
+            Category.objects.bulk_create([
+                Category(user=user, name=name, type=category_type, icon=icon)
+                for name, category_type, icon in DEFAULT_CATEGORIES
+            ])
         
         return user
+    
+    @staticmethod
+    def _unique_username(base_username: str) -> str:
+        """
+        First free name of base, base1, base2, ... found with one prefix
+        query (served by the LIKE index on the unique username column)
+        """
+        taken = set(User.objects.filter(username__startswith=base_username).values_list('username', flat=True))
+        username = base_username
+        counter = 1
+        while username in taken:
+            username = f"{base_username}{counter}"
+            counter += 1
+        return username
 
 
-class UserProfileSerializer(serializers.ModelSerializer[User]):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer[User]):
     """Serializer for updating user profile"""
     email = serializers.EmailField(required=False)
     
@@ -2,12 +2,23 @@
 Services package
 Business logic layer
 """
+from .backup_service import BackupService, BackupError
+from .budget_performance_service import BudgetPerformanceService
 from .dashboard_service import DashboardService
+from .health_service import HealthService
+from .lookup_service import LookupService
+from .summary_service import SummaryService
 from .transaction_service import TransactionService
 from .trends_service import TrendsService
 
 __all__ = [
+    'BackupError',
+    'BackupService',
+    'BudgetPerformanceService',
     'DashboardService',
+    'HealthService',
+    'LookupService',
+    'SummaryService',
     'TransactionService',
     'TrendsService',
 ]
@@ -0,0 +1,563 @@
+"""
+Backup service
+Streams every table of the api app into a gzip-compressed CSV file and
+restores them, with a manifest holding row counts and SHA-256 checksums
+
+PostgreSQL uses COPY ... TO STDOUT / FROM STDIN (psycopg 3) so rows never
+pass through the ORM; tables are dumped in parallel from one exported
+snapshot, like pg_dump -j. Other engines (SQLite) read with chunked
+.iterator() and write with executemany batches. Both produce the same CSV
+dialect, so a backup taken on one engine restores on the other.
+
+Incremental backups point at a parent backup and only export rows whose
+updated_at is past the parent's per-table watermark (tables without
+updated_at are small and copied whole), plus the DeletedRecord tombstones
+written since. Restoring an increment restores its full backup and then
+replays every increment of the chain: upserts, then deletes.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api import signals
+from api.models import DeletedRecord
+
+
+MANIFEST_NAME = 'manifest.json'
+BACKUP_FORMAT_VERSION = 1
+
+# Same NULL marker as COPY ... WITH (NULL '\N'), so empty strings survive
+NULL = '\\N'
+CHUNK_SIZE = 2000
+COPY_BLOCK_SIZE = 1 << 16
+COPY_OPTIONS = "FORMAT csv, HEADER true, NULL '\\N'"
+
+FULL = 'full'
+INCREMENTAL = 'incremental'
+TOMBSTONES_FILE = 'deleted_records.csv.gz'
+
+# Increments re-read this much before the parent's watermark: rows saved by a
+# transaction that committed after the parent backup started (auto_now is set
+# at save time, not at commit) or stamped by a server with a skewed clock.
+# Restores upsert, so rows exported twice are harmless.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be written or restored safely"""
+
+
+class _HashingWriter(io.RawIOBase):
+    """File wrapper that hashes and counts the bytes written through it"""
+
+    def __init__(self, raw) -> None:
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.raw.write(data)
+
+
+def _file_sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while block := f.read(COPY_BLOCK_SIZE):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _to_csv(value: Any) -> Any:
+    """Python value -> text in the format PostgreSQL's COPY produces"""
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class BackupService:
+    """
+    Service class for streaming backups and restores
+    """
+
+    @staticmethod
+    def backup_models() -> List[type]:
+        """
+        Concrete api models plus their auto-created M2M tables (only those
+        whose both ends are backed up; auth groups and permissions are not)
+        """
+        candidates = [
+            model for model in apps.get_app_config('api').get_models(include_auto_created=True)
+            if model._meta.managed and not model._meta.proxy and model is not DeletedRecord
+        ]
+        included = set(candidates)
+        return [
+            model for model in candidates
+            if not model._meta.auto_created or all(
+                field.related_model in included
+                for field in model._meta.concrete_fields if field.is_relation
+            )
+        ]
+
+    @staticmethod
+    def dependency_levels(model_list: Iterable[type]) -> List[List[type]]:
+        """
+        Group models so every level only references models of earlier levels.
+        Tables of one level can be restored concurrently.
+        """
+        remaining = list(model_list)
+        members = set(remaining)
+        done: set = set()
+        levels = []
+        while remaining:
+            level = [
+                model for model in remaining
+                if all(
+                    field.related_model in done or field.related_model is model
+                    for field in model._meta.concrete_fields
+                    if field.is_relation and field.related_model in members
+                )
+            ]
+            if not level:
+                raise BackupError(f'Circular foreign keys between: {", ".join(m._meta.db_table for m in remaining)}')
+            levels.append(level)
+            done.update(level)
+            remaining = [model for model in remaining if model not in done]
+        return levels
+
+    @staticmethod
+    def watermark_column(model: type) -> Optional[str]:
+        """Column that tells which rows changed since the last backup (None: copy the whole table)"""
+        if model is DeletedRecord:
+            return 'deleted_at'
+        try:
+            return model._meta.get_field('updated_at').column
+        except FieldDoesNotExist:
+            return None
+
+    @classmethod
+    def _dump_table(
+        cls,
+        model: type,
+        path: Path,
+        database: str,
+        snapshot: Optional[str],
+        since: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Write one table (only rows changed after since, if given) to path.
+        Runs in a worker thread with its own connection when snapshot is set.
+        """
+        connection = connections[database]
+        meta = model._meta
+        columns = [field.column for field in meta.concrete_fields]
+        watermark_column = cls.watermark_column(model)
+        started = time.perf_counter()
+
+        try:
+            with open(path, 'wb') as raw, transaction.atomic(using=database):
+                hashing = _HashingWriter(raw)
+                with gzip.GzipFile(fileobj=hashing, mode='wb', compresslevel=6) as compressed:
+                    if connection.vendor == 'postgresql':
+                        quote = connection.ops.quote_name
+                        with connection.cursor() as cursor:
+                            if snapshot is not None:
+                                # Worker transaction: attach to the snapshot exported by backup()
+                                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+                                cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot])
+                            column_list = ', '.join(quote(column) for column in columns)
+                            if since is not None:
+                                source = (
+                                    f'(SELECT {column_list} FROM {quote(meta.db_table)} '
+                                    f'WHERE {quote(watermark_column)} > %s)'
+                                )
+                                params = [since]
+                            else:
+                                source = f'{quote(meta.db_table)} ({column_list})'
+                                params = None
+                            with cursor.copy(f'COPY {source} TO STDOUT WITH ({COPY_OPTIONS})', params) as copy:
+                                for block in copy:
+                                    compressed.write(block)
+                            rows = cursor.rowcount
+                            watermark = None
+                            if watermark_column:
+                                cursor.execute(f'SELECT MAX({quote(watermark_column)}) FROM {quote(meta.db_table)}')
+                                watermark = cursor.fetchone()[0]
+                    else:
+                        text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+                        writer = csv.writer(text, lineterminator='\n')
+                        writer.writerow(columns)
+                        attnames = [field.attname for field in meta.concrete_fields]
+                        queryset = model._base_manager.using(database).order_by()
+                        if since is not None:
+                            queryset = queryset.filter(**{f'{watermark_column}__gt': since})
+                        watermark_index = columns.index(watermark_column) if watermark_column else None
+                        watermark = None
+                        rows = 0
+                        for row in queryset.values_list(*attnames).iterator(chunk_size=CHUNK_SIZE):
+                            writer.writerow([_to_csv(value) for value in row])
+                            rows += 1
+                            if watermark_index is not None and (watermark is None or row[watermark_index] > watermark):
+                                watermark = row[watermark_index]
+                        text.flush()
+                        text.detach()
+                        if since is not None and watermark is None and watermark_column:
+                            # Nothing changed: keep the parent's position
+                            watermark = since + WATERMARK_OVERLAP
+        finally:
+            if snapshot is not None:
+                connection.close()
+
+        return {
+            'table': meta.db_table,
+            'model': meta.label,
+            'file': path.name,
+            'columns': columns,
+            'rows': rows,
+            'bytes': hashing.bytes,
+            'sha256': hashing.sha256.hexdigest(),
+            'seconds': round(time.perf_counter() - started, 3),
+            'watermark_column': watermark_column,
+            'since': since.isoformat() if since else None,
+            'watermark': watermark.isoformat() if watermark else None,
+        }
+
+    @staticmethod
+    def _since(parent_entry: Optional[Dict[str, Any]]) -> Optional[datetime]:
+        """Lower bound for an increment: the parent's watermark minus the overlap"""
+        if not parent_entry or not parent_entry.get('watermark'):
+            return None
+        return parse_datetime(parent_entry['watermark']) - WATERMARK_OVERLAP
+
+    @classmethod
+    def backup(
+        cls,
+        output_dir: str,
+        database: str = DEFAULT_DB_ALIAS,
+        jobs: int = 4,
+        parent_dir: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Dump every table into output_dir/<table>.csv.gz and write the manifest last,
+        so a directory without manifest.json is an incomplete backup.
+        With parent_dir, write an increment on top of that backup instead.
+        """
+        parent = cls.verify(parent_dir) if parent_dir else None
+        parent_tables = {entry['model']: entry for entry in parent['tables']} if parent else {}
+
+        backup_path = Path(output_dir)
+        backup_path.mkdir(parents=True, exist_ok=False)
+        connection = connections[database]
+
+        # (model, since); the full backup only records where the tombstones end
+        work = [(model, cls._since(parent_tables.get(model._meta.label))) for model in cls.backup_models()]
+        if parent:
+            work.append((DeletedRecord, cls._since(parent['tombstones'])))
+
+        def dump(item, snapshot):
+            model, since = item
+            name = TOMBSTONES_FILE if model is DeletedRecord else f'{model._meta.db_table}.csv.gz'
+            return cls._dump_table(model, backup_path / name, database, snapshot, since)
+
+        started_at = timezone.now()
+        started = time.perf_counter()
+
+        if connection.vendor == 'postgresql' and jobs > 1:
+            # Workers attach to this transaction's snapshot: every table reflects the same instant
+            with transaction.atomic(using=database):
+                with connection.cursor() as cursor:
+                    cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+                    cursor.execute('SELECT pg_export_snapshot()')
+                    snapshot = cursor.fetchone()[0]
+                    cursor.execute(f"SELECT MAX(deleted_at) FROM {DeletedRecord._meta.db_table}")
+                    tombstones_end = cursor.fetchone()[0]
+                with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='backup') as executor:
+                    tables = list(executor.map(lambda item: dump(item, snapshot), work))
+        else:
+            # One transaction: a single consistent read (SQLite holds its read lock until commit)
+            with transaction.atomic(using=database):
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+                tombstones_end = DeletedRecord.objects.using(database).aggregate(end=models.Max('deleted_at'))['end']
+                tables = [dump(item, None) for item in work]
+
+        if parent:
+            tombstones = tables.pop()
+        else:
+            tombstones = {'watermark': tombstones_end.isoformat() if tombstones_end else started_at.isoformat()}
+
+        manifest = {
+            'format': BACKUP_FORMAT_VERSION,
+            'type': INCREMENTAL if parent else FULL,
+            'parent': Path(parent_dir).name if parent else None,
+            'created_at': timezone.now().isoformat(),
+            'started_at': started_at.isoformat(),
+            'vendor': connection.vendor,
+            'database': database,
+            'seconds': round(time.perf_counter() - started, 3),
+            'tables': tables,
+            'tombstones': tombstones,
+        }
+        (backup_path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+        return manifest
+
+    @staticmethod
+    def read_manifest(backup_dir: str) -> Dict[str, Any]:
+        manifest_path = Path(backup_dir) / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise BackupError(f'{manifest_path} not found (incomplete or legacy backup)')
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get('format') != BACKUP_FORMAT_VERSION:
+            raise BackupError(f"Unsupported backup format: {manifest.get('format')}")
+        # Backups written before increments existed: full, without watermarks
+        manifest.setdefault('type', FULL)
+        manifest.setdefault('parent', None)
+        manifest.setdefault('tombstones', {'watermark': manifest['created_at']})
+        return manifest
+
+    @classmethod
+    def verify(cls, backup_dir: str) -> Dict[str, Any]:
+        """Check every file against the manifest checksum before anything is loaded"""
+        manifest = cls.read_manifest(backup_dir)
+        entries = list(manifest['tables'])
+        if manifest['type'] == INCREMENTAL:
+            entries.append(manifest['tombstones'])
+        for entry in entries:
+            path = Path(backup_dir) / entry['file']
+            if not path.exists():
+                raise BackupError(f'Missing backup file: {path}')
+            if _file_sha256(path) != entry['sha256']:
+                raise BackupError(f'Checksum mismatch: {path}')
+        return manifest
+
+    @classmethod
+    def chain(cls, backup_dir: str) -> List[str]:
+        """Directories to restore, oldest first: the full backup, then each increment"""
+        directories = []
+        current: Optional[Path] = Path(backup_dir)
+        while current is not None:
+            if str(current) in directories:
+                raise BackupError(f'Backup chain loops back to {current}')
+            manifest = cls.read_manifest(str(current))
+            directories.append(str(current))
+            current = current.parent / manifest['parent'] if manifest['type'] == INCREMENTAL else None
+        return list(reversed(directories))
+
+    @staticmethod
+    def _load_table(
+        model: type,
+        entry: Dict[str, Any],
+        backup_dir: Path,
+        database: str,
+        upsert: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Load one table file, inserting new rows (or also updating existing ones
+        with upsert=True). Runs in a worker thread with its own connection.
+        """
+        connection = connections[database]
+        meta = model._meta
+        fields_by_column = {field.column: field for field in meta.concrete_fields}
+        columns = entry['columns']
+        if set(columns) != set(fields_by_column):
+            raise BackupError(
+                f"Columns of {meta.db_table} changed since the backup: "
+                f"backup {sorted(columns)}, model {sorted(fields_by_column)}"
+            )
+
+        started = time.perf_counter()
+        quote = connection.ops.quote_name
+        column_list = ', '.join(quote(column) for column in columns)
+        table = quote(meta.db_table)
+        path = backup_dir / entry['file']
+
+        on_conflict = ''
+        if upsert:
+            # Same syntax on PostgreSQL and SQLite (3.24+)
+            assignments = ', '.join(
+                f'{quote(column)} = excluded.{quote(column)}' for column in columns if column != meta.pk.column
+            )
+            on_conflict = f' ON CONFLICT ({quote(meta.pk.column)}) DO UPDATE SET {assignments}'
+
+        try:
+            with transaction.atomic(using=database), connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    target = table
+                    if upsert:
+                        # COPY cannot upsert: stage the rows, then merge them
+                        target = quote(f'restore_{meta.db_table}')
+                        cursor.execute(f'CREATE TEMPORARY TABLE {target} (LIKE {table}) ON COMMIT DROP')
+                    sql = f'COPY {target} ({column_list}) FROM STDIN WITH ({COPY_OPTIONS})'
+                    with gzip.open(path, 'rb') as compressed, cursor.copy(sql) as copy:
+                        while block := compressed.read(COPY_BLOCK_SIZE):
+                            copy.write(block)
+                    rows = cursor.rowcount
+                    if upsert:
+                        cursor.execute(
+                            f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {target}{on_conflict}'
+                        )
+                else:
+                    fields = [fields_by_column[column] for column in columns]
+                    placeholders = ', '.join(['%s'] * len(columns))
+                    sql = f'INSERT INTO {table} ({column_list}) VALUES ({placeholders}){on_conflict}'
+                    rows = 0
+                    with gzip.open(path, 'rt', encoding='utf-8', newline='') as text:
+                        reader = csv.reader(text)
+                        next(reader)  # header
+                        batch = []
+                        for record in reader:
+                            batch.append([
+                                None if value == NULL else BackupService._db_value(field, value, connection)
+                                for field, value in zip(fields, record)
+                            ])
+                            if len(batch) >= CHUNK_SIZE:
+                                cursor.executemany(sql, batch)
+                                rows += len(batch)
+                                batch = []
+                        if batch:
+                            cursor.executemany(sql, batch)
+                            rows += len(batch)
+        finally:
+            connection.close()
+
+        if rows != entry['rows']:
+            raise BackupError(f"{meta.db_table}: restored {rows} rows, manifest lists {entry['rows']}")
+        return {'table': meta.db_table, 'rows': rows, 'seconds': round(time.perf_counter() - started, 3)}
+
+    @staticmethod
+    def _db_value(field: models.Field, value: str, connection) -> Any:
+        # Raw SQL instead of bulk_create: pre_save() would overwrite auto_now/auto_now_add timestamps
+        if isinstance(field, models.JSONField):
+            return field.get_db_prep_save(json.loads(value), connection)
+        return field.get_db_prep_save(field.to_python(value), connection)
+
+    @classmethod
+    def _load_levels(
+        cls,
+        manifest: Dict[str, Any],
+        backup_dir: str,
+        database: str,
+        jobs: int,
+        upsert: bool,
+    ) -> List[Dict[str, Any]]:
+        """Load tables level by level; tables of one level run concurrently on PostgreSQL"""
+        entries = {entry['model']: entry for entry in manifest['tables']}
+        model_list = [model for model in cls.backup_models() if model._meta.label in entries]
+
+        # SQLite allows a single writer; parallel inserts would only wait on the lock
+        workers = jobs if connections[database].vendor == 'postgresql' else 1
+        results = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='restore') as executor:
+            for level in cls.dependency_levels(model_list):
+                results.extend(executor.map(
+                    lambda model: cls._load_table(model, entries[model._meta.label], Path(backup_dir), database, upsert),
+                    level,
+                ))
+        return results
+
+    @classmethod
+    def _apply_tombstones(cls, manifest: Dict[str, Any], backup_dir: str, database: str) -> int:
+        """
+        Delete the rows an increment recorded as deleted, children first.
+        The ORM delete also applies CASCADE and SET_NULL to rows that still point at them.
+        Receivers are muted: a replayed delete writes no new tombstones and
+        refreshes no caches or derived rows.
+        """
+        models_by_table = {model._meta.db_table: model for model in cls.backup_models()}
+        deleted_ids: Dict[str, List[int]] = {}
+        with gzip.open(Path(backup_dir) / manifest['tombstones']['file'], 'rt', encoding='utf-8', newline='') as text:
+            reader = csv.DictReader(text)
+            for record in reader:
+                deleted_ids.setdefault(record['table_name'], []).append(int(record['object_id']))
+
+        deleted = 0
+        with transaction.atomic(using=database), signals.suppressed():
+            for level in reversed(cls.dependency_levels(models_by_table.values())):
+                for model in level:
+                    ids = deleted_ids.get(model._meta.db_table)
+                    for offset in range(0, len(ids or []), CHUNK_SIZE):
+                        chunk = ids[offset:offset + CHUNK_SIZE]
+                        count, _ = model._base_manager.using(database).filter(pk__in=chunk).delete()
+                        deleted += count
+        return deleted
+
+    @classmethod
+    def restore(
+        cls,
+        backup_dir: str,
+        database: str = DEFAULT_DB_ALIAS,
+        jobs: int = 4,
+        truncate: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load a backup into empty tables (or empty them first with truncate=True).
+        For an increment, restore its full backup and replay the chain up to it.
+        """
+        directories = cls.chain(backup_dir)
+        manifests = [cls.verify(directory) for directory in directories]
+        connection = connections[database]
+        model_list = [
+            model for model in cls.backup_models()
+            if model._meta.label in {entry['model'] for entry in manifests[0]['tables']}
+        ]
+
+        if truncate:
+            tables = [model._meta.db_table for model in model_list]
+            connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables, allow_cascade=True))
+        else:
+            for model in model_list:
+                if model._base_manager.using(database).exists():
+                    raise BackupError(f'Table {model._meta.db_table} is not empty (use truncate to replace its data)')
+
+        results = []
+        for directory, manifest in zip(directories, manifests):
+            if manifest['type'] == FULL:
+                loaded = cls._load_levels(manifest, directory, database, jobs, upsert=False)
+            else:
+                loaded = cls._load_levels(manifest, directory, database, jobs, upsert=True)
+                deleted = cls._apply_tombstones(manifest, directory, database)
+                loaded.append({'table': DeletedRecord._meta.db_table, 'rows': deleted, 'seconds': 0.0})
+            results.append({'backup': Path(directory).name, 'type': manifest['type'], 'tables': loaded})
+
+        # Explicit ids were inserted: move sequences past them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), model_list):
+                cursor.execute(sql)
+
+        return results
+
+    @staticmethod
+    def prune_tombstones(older_than: datetime, database: str = DEFAULT_DB_ALIAS) -> int:
+        """
+        Drop old tombstones. Only safe for times before the oldest full backup
+        that still has increments to be taken or restored on top of it.
+        """
+        count, _ = DeletedRecord.objects.using(database).filter(deleted_at__lt=older_than).delete()
+        return count
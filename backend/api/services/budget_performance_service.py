@@ -0,0 +1,249 @@
+"""
+Budget performance service
+Monthly budget-vs-actual results (BudgetPeriodResult)
+"""
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import DEFAULT_DB_ALIAS, transaction as db_transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from api.models import Budget, BudgetHistory, BudgetPeriodResult, Transaction
+
+
+def month_range(month: date) -> tuple[date, date]:
+    """First and last day of the month containing `month`"""
+    start = month.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+# Budgets and (user_id, category_id) pairs written in this thread since the
+# last refresh, per database alias. Every write registers its own on_commit:
+# the first one to run refreshes them all and the rest find nothing left.
+# Entries of a rolled back write are refreshed with the next commit, which
+# recomputes from the tables and so only costs a redundant refresh.
+_pending_refreshes = threading.local()
+
+
+def _pending(using: str) -> Dict[str, set]:
+    by_alias = getattr(_pending_refreshes, 'by_alias', None)
+    if by_alias is None:
+        by_alias = _pending_refreshes.by_alias = {}
+    return by_alias.setdefault(using, {'budget_ids': set(), 'categories': set()})
+
+
+class BudgetPerformanceService:
+    """
+    Service class for budget period results
+
+    A month's rows cover the budgets that are Active and whose period overlaps
+    the month; spent follows BudgetSerializer.get_spent (the category's
+    expenses in the calendar month). The monthly close job snapshots past
+    months with the amount each budget had at month end (from BudgetHistory);
+    the open month's row of a budget is refreshed after a write to it or to
+    an expense of its category in the month.
+    """
+
+    @staticmethod
+    def _amounts_at(budgets: List[Dict[str, Any]], moment: datetime) -> Dict[int, Decimal]:
+        """
+        Amount of each budget at `moment`: the previous_amount of its first
+        change after that moment, or its current amount if it wasn't changed since
+        """
+        amounts = {budget['id']: budget['amount'] for budget in budgets}
+        changes = (
+            BudgetHistory.objects.filter(budget_id__in=list(amounts), changed_at__gt=moment)
+            .order_by('budget_id', 'changed_at')
+            .values_list('budget_id', 'previous_amount')
+        )
+        seen = set()
+        for budget_id, previous_amount in changes:
+            if budget_id not in seen:
+                seen.add(budget_id)
+                if previous_amount is not None:
+                    amounts[budget_id] = previous_amount
+        return amounts
+
+    @staticmethod
+    @db_transaction.atomic
+    def refresh_month(
+        month: date,
+        user_ids: Optional[Iterable[int]] = None,
+        close: bool = False,
+        budget_ids: Optional[Iterable[int]] = None,
+        categories: Optional[Iterable[tuple[int, int]]] = None,
+    ) -> int:
+        """
+        Recompute the results of one month for these users (everyone by default),
+        or only for these budgets or (user_id, category_id) pairs, and return
+        the number of rows written
+
+        A query for the budgets, one GROUP BY (user, category) over the month's
+        expenses, one for the budget history when closing, and one upsert.
+        Open rows of budgets that no longer apply are removed; closed rows are
+        only rewritten by closing the month again.
+        """
+        month_start, month_end = month_range(month)
+        budgets = Budget.objects.filter(status='Active', period_start__lte=month_end).filter(
+            Q(period_end__isnull=True) | Q(period_end__gte=month_start)
+        )
+        stale = BudgetPeriodResult.objects.filter(month=month_start, is_closed=False)
+        expenses = Transaction.objects.filter(
+            type='Expense',
+            transaction_date__gte=month_start,
+            transaction_date__lte=month_end,
+        )
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            budgets = budgets.filter(user_id__in=user_ids)
+            stale = stale.filter(user_id__in=user_ids)
+            expenses = expenses.filter(user_id__in=user_ids)
+        if budget_ids is not None:
+            budget_ids = list(budget_ids)
+            budgets = budgets.filter(id__in=budget_ids)
+            stale = stale.filter(budget_id__in=budget_ids)
+        if categories is not None:
+            pairs = Q(pk__in=[])
+            for user_id, category_id in categories:
+                pairs |= Q(user_id=user_id, category_id=category_id)
+            budgets = budgets.filter(pairs)
+            # Expense writes don't change which budgets apply: no row goes stale
+            stale = None
+
+        budgets = list(budgets.values('id', 'user_id', 'category_id', 'amount'))
+        if stale is not None:
+            stale.exclude(budget_id__in=[budget['id'] for budget in budgets]).delete()
+        if not budgets:
+            return 0
+
+        spent = {
+            (row['user_id'], row['category_id']): row['total']
+            for row in expenses.filter(category_id__in={budget['category_id'] for budget in budgets})
+            .values('user_id', 'category_id').annotate(total=Sum('amount')).order_by()
+        }
+        if close:
+            month_end_moment = timezone.make_aware(datetime.combine(month_end, time.max))
+            amounts = BudgetPerformanceService._amounts_at(budgets, month_end_moment)
+        else:
+            amounts = {budget['id']: budget['amount'] for budget in budgets}
+
+        results = [
+            BudgetPeriodResult(
+                budget_id=budget['id'],
+                user_id=budget['user_id'],
+                month=month_start,
+                budgeted=amounts[budget['id']],
+                spent=spent.get((budget['user_id'], budget['category_id']), Decimal('0')),
+                is_closed=close,
+            )
+            for budget in budgets
+        ]
+        BudgetPeriodResult.objects.bulk_create(
+            results,
+            update_conflicts=True,
+            unique_fields=['budget', 'month'],
+            update_fields=['user', 'budgeted', 'spent', 'is_closed', 'updated_at'],
+        )
+        return len(results)
+
+    @staticmethod
+    def schedule_refresh(
+        budget_ids: Iterable[int] = (),
+        categories: Iterable[tuple[int, int]] = (),
+        using: Optional[str] = None,
+    ) -> None:
+        """
+        Refresh the open month's rows of these budgets, and of the budgets of
+        these (user_id, category_id) pairs, once the current transaction commits.
+        The writes of one transaction share a single refresh; after a
+        cascading delete (of the user) it finds nothing left to write.
+        """
+        using = using or DEFAULT_DB_ALIAS
+        pending = _pending(using)
+        pending['budget_ids'].update(budget_ids)
+        pending['categories'].update(categories)
+        db_transaction.on_commit(lambda: BudgetPerformanceService._refresh_pending(using), using=using)
+
+    @staticmethod
+    def _refresh_pending(using: str) -> None:
+        pending = _pending(using)
+        budget_ids, categories = set(pending['budget_ids']), set(pending['categories'])
+        pending['budget_ids'].clear()
+        pending['categories'].clear()
+        today = date.today()
+        if budget_ids:
+            BudgetPerformanceService.refresh_month(today, budget_ids=budget_ids)
+        if categories:
+            BudgetPerformanceService.refresh_month(today, categories=categories)
+
+    @staticmethod
+    def get_performance(user_id: int, months: int = 12) -> Dict[str, Any]:
+        """
+        Budget adherence over the last `months` months (the current one included),
+        read from the stored results in one query
+
+        Returns:
+            Per-budget monthly results with their adherence, and monthly totals
+        """
+        current_start = date.today().replace(day=1)
+        index = current_start.year * 12 + current_start.month - 1 - (months - 1)
+        period_start = date(index // 12, index % 12 + 1, 1)
+
+        rows = (
+            BudgetPeriodResult.objects.filter(user_id=user_id, month__gte=period_start)
+            .values(
+                'budget_id', 'budget__category_id', 'budget__category__name', 'budget__category__icon',
+                'month', 'budgeted', 'spent', 'is_closed',
+            )
+            .order_by('budget_id', 'month')
+        )
+
+        budgets: Dict[int, Dict[str, Any]] = {}
+        totals: Dict[date, Dict[str, Decimal]] = {}
+        for row in rows:
+            budgeted, spent = row['budgeted'], row['spent']
+            budget = budgets.setdefault(row['budget_id'], {
+                'budget_id': row['budget_id'],
+                'category_id': row['budget__category_id'],
+                'category_name': row['budget__category__name'],
+                'category_icon': row['budget__category__icon'],
+                'periods': [],
+            })
+            budget['periods'].append({
+                'month': row['month'].strftime('%Y-%m'),
+                'budgeted': float(budgeted),
+                'spent': float(spent),
+                'remaining': float(budgeted - spent),
+                'percentage': round(float(spent / budgeted * 100), 2) if budgeted > 0 else 0.0,
+                'within_budget': spent <= budgeted,
+                'closed': row['is_closed'],
+            })
+            month_totals = totals.setdefault(row['month'], {'budgeted': Decimal('0'), 'spent': Decimal('0')})
+            month_totals['budgeted'] += budgeted
+            month_totals['spent'] += spent
+
+        for budget in budgets.values():
+            within = sum(1 for period in budget['periods'] if period['within_budget'])
+            budget['months_within_budget'] = within
+            budget['adherence_percentage'] = round(within / len(budget['periods']) * 100, 2)
+
+        return {
+            'months': months,
+            'period_start': period_start.strftime('%Y-%m'),
+            'period_end': current_start.strftime('%Y-%m'),
+            'budgets': list(budgets.values()),
+            'monthly_totals': [
+                {
+                    'month': month.strftime('%Y-%m'),
+                    'budgeted': float(values['budgeted']),
+                    'spent': float(values['spent']),
+                    'percentage': round(float(values['spent'] / values['budgeted'] * 100), 2)
+                    if values['budgeted'] > 0 else 0.0,
+                }
+                for month, values in sorted(totals.items())
+            ],
+        }
@@ -7,22 +7,44 @@ from datetime import datetime, timedelta, date
 from decimal import Decimal
 from typing import Dict, Any, Optional, List
 
+from api.concurrency import gather_in_threads, run_in_thread
+from api.db_router import reads_from_replica
 from api.models import Account, Transaction, Goal, Budget, Debt, Investment, RecurringTransaction
+from .summary_service import SummaryService
 
 
+@reads_from_replica
 class DashboardService:
     """
     Service class for dashboard-related business logic
     """
     
+    @staticmethod
+    def get_headline_figures(user_id: int) -> Dict[str, Any]:
+        """
+        Headline figures of a user from their UserFinancialSummary: one PK lookup
+        (month_income/month_expenses cover the current calendar month)
+        """
+        summary = SummaryService.get_summary(user_id)
+        return {
+            'total_balance': summary.total_balance,
+            'accounts_count': summary.accounts_count,
+            'goals_summary': {
+                'in_progress': summary.goals_in_progress,
+                'completed': summary.goals_completed,
+            },
+            'month_income': summary.month_income,
+            'month_expenses': summary.month_expenses,
+            'committed_funds': summary.committed_funds,
+        }
+    
     @staticmethod
     def get_total_balance(user_id: Optional[int] = None) -> Decimal:
         """Get total balance across all accounts"""
-        queryset = Account.objects.all()
         if user_id:
-            queryset = queryset.filter(user_id=user_id)
+            return SummaryService.get_summary(user_id).total_balance
         
-        result = queryset.aggregate(total=Sum('balance'))
+        result = Account.objects.aggregate(total=Sum('balance'))
         return result['total'] or Decimal('0')
     
     @staticmethod
@@ -56,10 +78,9 @@ class DashboardService:
     @staticmethod
     def get_accounts_count(user_id: Optional[int] = None) -> int:
         """Get count of accounts"""
-        queryset = Account.objects.all()
         if user_id:
-            queryset = queryset.filter(user_id=user_id)
-        return queryset.count()
+            return SummaryService.get_summary(user_id).accounts_count
+        return Account.objects.count()
     
     @staticmethod
     def get_recent_transactions(limit: int = 10, user_id: Optional[int] = None) -> QuerySet[Transaction]:
@@ -72,10 +93,10 @@ class DashboardService:
     @staticmethod
     def get_goals_summary(user_id: Optional[int] = None) -> Dict[str, int]:
         """Get summary of goals"""
-        queryset = Goal.objects.all()
         if user_id:
-            queryset = queryset.filter(user_id=user_id)
+            return DashboardService.get_headline_figures(user_id)['goals_summary']
         
+        queryset = Goal.objects.all()
         return {
             'in_progress': queryset.filter(status='In Progress').count(),
             'completed': queryset.filter(status='Completed').count(),
@@ -206,8 +227,13 @@ class DashboardService:
         return sorted(payments, key=lambda x: x['days_until_due'])[:5]
     
     @staticmethod
-    def get_mini_projection(user_id: Optional[int] = None, months: int = 3) -> Dict[str, Any]:
-        """Get mini projection data for next N months"""
+    def get_mini_projection(
+        user_id: Optional[int] = None, months: int = 3, current_balance: Optional[Decimal] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get mini projection data for next N months
+        current_balance: the total balance when the caller already read it
+        """
         # Get active recurring transactions
         recurring_income = RecurringTransaction.objects.filter(
             is_active=True,
@@ -236,7 +262,8 @@ class DashboardService:
         monthly_net = monthly_income - total_monthly_expenses
         
         # Get current total balance
-        current_balance = DashboardService.get_total_balance(user_id)
+        if current_balance is None:
+            current_balance = DashboardService.get_total_balance(user_id)
         
         # Generate projection
         projection_data = []
@@ -255,26 +282,58 @@ class DashboardService:
             'final_balance': round(balance, 2),
         }
     
+    @classmethod
+    def _headline(cls, user_id: Optional[int]) -> Dict[str, Any]:
+        """Summary-backed figures of get_dashboard_stats (aggregates over everyone without a user)"""
+        if user_id:
+            return cls.get_headline_figures(user_id)
+        return {
+            'total_balance': cls.get_total_balance(),
+            'accounts_count': cls.get_accounts_count(),
+            'goals_summary': cls.get_goals_summary(),
+        }
+    
     @classmethod
     def get_dashboard_stats(cls, user_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Get all dashboard statistics
         Consolidates all dashboard data in one method
         """
-        mini_projection = cls.get_mini_projection(user_id, 3)
+        headline = cls._headline(user_id)
+        mini_projection = cls.get_mini_projection(user_id, 3, headline['total_balance'])
         
         return {
-            'total_balance': cls.get_total_balance(user_id),
+            **headline,
             'total_income': cls.get_period_income(30, user_id),
             'total_expenses': cls.get_period_expenses(30, user_id),
-            'accounts_count': cls.get_accounts_count(user_id),
             'recent_transactions': cls.get_recent_transactions(10, user_id),
-            'goals_summary': cls.get_goals_summary(user_id),
             'budget_status': cls.get_budget_status(user_id),
             'top_goals': cls.get_top_goals(user_id),
             'upcoming_payments': cls.get_upcoming_payments(user_id),
             'mini_projection': mini_projection['data'],
             'projection_final_balance': mini_projection['final_balance'],
         }
+    
+    @classmethod
+    async def aget_dashboard_stats(cls, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Async variant of get_dashboard_stats
+        The independent aggregates run concurrently in the ORM thread pool,
+        after the headline figures: the projection starts from their balance
+        """
+        headline = await run_in_thread(cls._headline, user_id)
+        results = await gather_in_threads({
+            'total_income': lambda: cls.get_period_income(30, user_id),
+            'total_expenses': lambda: cls.get_period_expenses(30, user_id),
+            'recent_transactions': lambda: list(cls.get_recent_transactions(10, user_id)),
+            'budget_status': lambda: cls.get_budget_status(user_id),
+            'top_goals': lambda: cls.get_top_goals(user_id),
+            'upcoming_payments': lambda: cls.get_upcoming_payments(user_id),
+            'mini_projection': lambda: cls.get_mini_projection(user_id, 3, headline['total_balance']),
+        })
 
-
+        results.update(headline)
+        mini_projection = results.pop('mini_projection')
+        results['mini_projection'] = mini_projection['data']
+        results['projection_final_balance'] = mini_projection['final_balance']
+        return results
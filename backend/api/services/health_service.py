@@ -0,0 +1,168 @@
+"""
+Health service
+Dependency probes for the deep health check
+"""
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from api.models import JobRun
+
+
+HEALTHY = 'healthy'
+DEGRADED = 'degraded'
+UNHEALTHY = 'unhealthy'
+
+_SEVERITY = {HEALTHY: 0, DEGRADED: 1, UNHEALTHY: 2}
+
+
+class HealthService:
+    """
+    Service class for dependency health checks
+    Results are kept in process memory for HEALTH_CHECK_CACHE_SECONDS so load
+    balancers probing the endpoint cannot hammer the database
+    """
+
+    _lock = threading.Lock()
+    _cached_result: Optional[Dict[str, Any]] = None
+    _cached_at: float = 0.0
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 2)
+
+    @staticmethod
+    def check_database() -> Dict[str, Any]:
+        """Round-trip a trivial query and compare latency with the threshold"""
+        started = time.perf_counter()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except Exception as e:
+            return {'status': UNHEALTHY, 'latency_ms': HealthService._elapsed_ms(started), 'error': str(e)}
+
+        latency_ms = HealthService._elapsed_ms(started)
+        threshold = settings.HEALTH_DB_LATENCY_WARNING_MS
+        return {
+            'status': DEGRADED if latency_ms > threshold else HEALTHY,
+            'latency_ms': latency_ms,
+            'vendor': connection.vendor,
+        }
+
+    @staticmethod
+    def check_migrations() -> Dict[str, Any]:
+        """Report migrations present in code but not applied to the database"""
+        started = time.perf_counter()
+        try:
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        except Exception as e:
+            return {'status': UNHEALTHY, 'latency_ms': HealthService._elapsed_ms(started), 'error': str(e)}
+
+        pending = [f'{migration.app_label}.{migration.name}' for migration, _backwards in plan]
+        return {
+            'status': UNHEALTHY if pending else HEALTHY,
+            'latency_ms': HealthService._elapsed_ms(started),
+            'pending': pending,
+        }
+
+    @staticmethod
+    def check_cache() -> Dict[str, Any]:
+        """Write and read back a key on the default cache backend"""
+        started = time.perf_counter()
+        key = 'health_check:probe'
+        token = str(time.time())
+        try:
+            cache.set(key, token, timeout=30)
+            ok = cache.get(key) == token
+        except Exception as e:
+            return {'status': DEGRADED, 'latency_ms': HealthService._elapsed_ms(started), 'error': str(e)}
+
+        return {
+            'status': HEALTHY if ok else DEGRADED,
+            'latency_ms': HealthService._elapsed_ms(started),
+            'backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+        }
+
+    @staticmethod
+    def check_batch_jobs() -> Dict[str, Any]:
+        """Age of the last successful run of each daily generation command"""
+        started = time.perf_counter()
+        max_age = timedelta(hours=settings.HEALTH_JOB_MAX_AGE_HOURS)
+        now = timezone.now()
+        jobs: Dict[str, Any] = {}
+        status = HEALTHY
+
+        try:
+            for job in JobRun.TRACKED_JOBS:
+                last_success = (
+                    JobRun.objects
+                    .filter(job=job, status='success', finished_at__isnull=False)
+                    .order_by('-finished_at')
+                    .values_list('finished_at', flat=True)
+                    .first()
+                )
+                if last_success is None:
+                    jobs[job] = {'status': DEGRADED, 'last_success': None, 'age_hours': None}
+                    status = DEGRADED
+                    continue
+
+                age = now - last_success
+                job_status = DEGRADED if age > max_age else HEALTHY
+                if job_status == DEGRADED:
+                    status = DEGRADED
+                jobs[job] = {
+                    'status': job_status,
+                    'last_success': last_success.isoformat(),
+                    'age_hours': round(age.total_seconds() / 3600, 2),
+                }
+        except Exception as e:
+            return {'status': DEGRADED, 'latency_ms': HealthService._elapsed_ms(started), 'error': str(e)}
+
+        return {
+            'status': status,
+            'latency_ms': HealthService._elapsed_ms(started),
+            'max_age_hours': settings.HEALTH_JOB_MAX_AGE_HOURS,
+            'jobs': jobs,
+        }
+
+    @staticmethod
+    def run_checks() -> Dict[str, Any]:
+        """Run every probe and derive the overall status from the worst one"""
+        started = time.perf_counter()
+        checks = {
+            'database': HealthService.check_database(),
+        }
+        # Without a database the remaining probes would only repeat the same error
+        if checks['database']['status'] != UNHEALTHY:
+            checks['migrations'] = HealthService.check_migrations()
+            checks['batch_jobs'] = HealthService.check_batch_jobs()
+        checks['cache'] = HealthService.check_cache()
+
+        status = max((check['status'] for check in checks.values()), key=_SEVERITY.__getitem__)
+        return {
+            'status': status,
+            'checked_at': timezone.now().isoformat(),
+            'duration_ms': HealthService._elapsed_ms(started),
+            'checks': checks,
+        }
+
+    @classmethod
+    def get_deep_health(cls) -> Dict[str, Any]:
+        """Return the cached result while fresh, otherwise probe again"""
+        ttl = settings.HEALTH_CHECK_CACHE_SECONDS
+        with cls._lock:
+            age = time.monotonic() - cls._cached_at
+            if cls._cached_result is None or age >= ttl:
+                cls._cached_result = cls.run_checks()
+                cls._cached_at = time.monotonic()
+                age = 0.0
+            return {**cls._cached_result, 'cached': age > 0, 'cache_age_seconds': round(age, 2)}
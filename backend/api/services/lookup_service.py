@@ -0,0 +1,70 @@
+"""
+Lookup service
+Compact account and category lists for form dropdowns
+"""
+from typing import Any, Dict, Iterable, List, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from api import metrics
+from api.models import Account, Category
+
+
+ACCOUNT_COLUMNS = ('id', 'name', 'type', 'color')
+CATEGORY_COLUMNS = ('id', 'name', 'type', 'icon')
+
+
+class LookupService:
+    """
+    Service class for the /api/lookups/ payload
+    Cached per user for LOOKUPS_CACHE_SECONDS; creating, deleting or saving
+    the listed columns of an account or category drops its owner's entry (see
+    api.signals). Balance updates save with update_fields=['balance'] and keep it.
+    """
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f'lookups:{user_id}'
+
+    @staticmethod
+    def _rows(queryset, columns: Sequence[str]) -> List[Dict[str, Any]]:
+        return [dict(zip(columns, row)) for row in queryset.values_list(*columns)]
+
+    @staticmethod
+    def get_lookups(user_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Accounts (id, name, type, color) and categories (id, name, type, icon)
+        of a user, ordered by name: two values_list queries on a cache miss
+        """
+        key = LookupService._cache_key(user_id)
+        lookups = cache.get(key)
+        metrics.record_cache_access('lookups', hit=lookups is not None)
+        if lookups is None:
+            lookups = {
+                'accounts': LookupService._rows(
+                    Account.objects.filter(user_id=user_id).order_by('name', 'id'), ACCOUNT_COLUMNS,
+                ),
+                'categories': LookupService._rows(
+                    Category.objects.filter(user_id=user_id).order_by('type', 'name', 'id'), CATEGORY_COLUMNS,
+                ),
+            }
+            cache.set(key, lookups, settings.LOOKUPS_CACHE_SECONDS)
+        return lookups
+
+    @staticmethod
+    def affected_by(model: type, update_fields: Iterable[str]) -> bool:
+        """Whether saving these fields of an account/category can change the payload"""
+        columns = ACCOUNT_COLUMNS if model is Account else CATEGORY_COLUMNS
+        return not {*columns, 'user', 'user_id'}.isdisjoint(update_fields)
+
+    @staticmethod
+    def invalidate(*user_ids: int) -> None:
+        """
+        Drop the cached lookups of these users once the current transaction
+        commits, so a concurrent request can't cache the old rows again
+        """
+        keys = [LookupService._cache_key(user_id) for user_id in user_ids if user_id is not None]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,236 @@
+"""
+Summary service
+Per-user headline figures (UserFinancialSummary) maintained by the write paths
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from api.models import Account, Goal, Investment, Transaction, UserFinancialSummary
+
+
+# Figures that are recomputed together, by source table
+GROUPS: Dict[str, Tuple[str, ...]] = {
+    'accounts': ('total_balance', 'accounts_count'),
+    'month': ('month', 'month_income', 'month_expenses'),
+    'goals': ('goals_in_progress', 'goals_completed'),
+    'investments': ('committed_funds',),
+}
+
+FIELDS: Tuple[str, ...] = tuple(field for fields in GROUPS.values() for field in fields)
+
+
+def month_bounds(today: Optional[date] = None) -> Tuple[date, date]:
+    """First day of the current month and of the next one"""
+    first = (today or date.today()).replace(day=1)
+    return first, (first + timedelta(days=32)).replace(day=1)
+
+
+class SummaryService:
+    """
+    Service class for UserFinancialSummary
+
+    Money movements update the row with F() deltas inside the writing
+    transaction (apply_transaction); changes that aren't a simple delta
+    (goal or investment status, account edits) recompute their group
+    (refresh). A missing row, or one whose month figures belong to an earlier
+    month, is rebuilt from the source tables.
+    """
+
+    @staticmethod
+    def _zeros(groups: Sequence[str], month: date) -> Dict[str, Any]:
+        figures = {
+            field: UserFinancialSummary._meta.get_field(field).get_default()
+            for group in groups for field in GROUPS[group]
+        }
+        if 'month' in groups:
+            figures['month'] = month
+        return figures
+
+    @staticmethod
+    def compute(user_ids: List[int], groups: Sequence[str] = tuple(GROUPS)) -> Dict[int, Dict[str, Any]]:
+        """
+        Figures of the given groups for each user, from the source tables:
+        one GROUP BY user_id query per group, whatever the number of users
+        """
+        first, next_first = month_bounds()
+        figures = {user_id: SummaryService._zeros(groups, first) for user_id in user_ids}
+
+        querysets = []
+        if 'accounts' in groups:
+            querysets.append(Account.objects.filter(user_id__in=user_ids).values('user_id').annotate(
+                total_balance=Sum('balance'),
+                accounts_count=Count('id'),
+            ))
+        if 'month' in groups:
+            querysets.append(Transaction.objects.filter(
+                user_id__in=user_ids,
+                transaction_date__gte=first,
+                transaction_date__lt=next_first,
+            ).values('user_id').annotate(
+                month_income=Sum('amount', filter=Q(type='Income')),
+                month_expenses=Sum('amount', filter=Q(type='Expense')),
+            ))
+        if 'goals' in groups:
+            querysets.append(Goal.objects.filter(user_id__in=user_ids).values('user_id').annotate(
+                goals_in_progress=Count('id', filter=Q(status='In Progress')),
+                goals_completed=Count('id', filter=Q(status='Completed')),
+            ))
+        if 'investments' in groups:
+            # Same rule as AccountSerializer.committed_to_goals, over all accounts
+            querysets.append(Investment.objects.filter(
+                user_id__in=user_ids,
+                status='active',
+                account__isnull=False,
+            ).values('user_id').annotate(
+                committed_funds=Sum('current_amount'),
+            ))
+
+        for queryset in querysets:
+            # order_by(): model orderings would end up in the GROUP BY
+            for row in queryset.order_by():
+                user_id = row.pop('user_id')
+                figures[user_id].update({field: value for field, value in row.items() if value is not None})
+        return figures
+
+    @staticmethod
+    @db_transaction.atomic
+    def rebuild(user_id: int) -> UserFinancialSummary:
+        """
+        Recompute every figure of a user and store it
+        The row is locked before the source tables are read, so a concurrent
+        writer's delta lands either in what we read or on top of what we store
+        """
+        list(UserFinancialSummary.objects.select_for_update().filter(pk=user_id).values_list('pk', flat=True))
+        figures = SummaryService.compute([user_id])[user_id]
+        summary, _ = UserFinancialSummary.objects.update_or_create(user_id=user_id, defaults=figures)
+        return summary
+
+    @staticmethod
+    def refresh(user_id: int, *groups: str) -> None:
+        """Recompute some figure groups of a user (all of them by default)"""
+        groups = groups or tuple(GROUPS)
+        figures = SummaryService.compute([user_id], groups)[user_id]
+        figures.pop('month', None)
+        updated = UserFinancialSummary.objects.filter(pk=user_id, month=month_bounds()[0]).update(
+            **figures, updated_at=timezone.now(),
+        )
+        if not updated:
+            SummaryService.rebuild(user_id)
+
+    @staticmethod
+    def _deltas(trans: Transaction, sign: int, first: date, next_first: date) -> Dict[str, Decimal]:
+        amount = Decimal(str(trans.amount)) * sign
+        if trans.type == 'Income':
+            deltas = {'total_balance': amount}
+            month_field = 'month_income'
+        elif trans.type == 'Expense':
+            deltas = {'total_balance': -amount}
+            month_field = 'month_expenses'
+        else:
+            return {}
+
+        transaction_date = trans.transaction_date
+        if isinstance(transaction_date, str):
+            transaction_date = parse_date(transaction_date)
+        if transaction_date and first <= transaction_date < next_first:
+            deltas[month_field] = amount
+        return deltas
+
+    @staticmethod
+    def apply_transaction(
+        new: Optional[Transaction] = None, old: Optional[Transaction] = None, balance: bool = True,
+    ) -> None:
+        """
+        Apply a created (new), deleted (old) or edited (both) transaction and
+        the account balance change that went with it, in one UPDATE.
+        balance=False for writes that left the account balance as it was.
+        Call it after the source rows are written, in the same transaction.
+        """
+        first, next_first = month_bounds()
+        deltas: Dict[str, Decimal] = {}
+        for trans, sign in ((new, 1), (old, -1)):
+            if trans is not None:
+                for field, amount in SummaryService._deltas(trans, sign, first, next_first).items():
+                    deltas[field] = deltas.get(field, Decimal('0')) + amount
+        if not balance:
+            deltas.pop('total_balance', None)
+        if not any(deltas.values()):
+            return
+
+        user_id = (new or old).user_id
+        updated = UserFinancialSummary.objects.filter(pk=user_id, month=first).update(
+            **{field: F(field) + amount for field, amount in deltas.items()},
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            # Missing or last month's row: the rebuild already sees this write
+            SummaryService.rebuild(user_id)
+
+    @staticmethod
+    def get_summary(user_id: int) -> UserFinancialSummary:
+        """
+        The user's summary row: one PK lookup. A missing row (users created by
+        bulk paths) or one from an earlier month is recomputed and stored with
+        single-statement writes that concurrent readers can't deadlock on:
+        an insert that skips an existing row, or an update limited to rows
+        still on an earlier month (a writer may already have rebuilt it)
+        """
+        first = month_bounds()[0]
+        summary = UserFinancialSummary.objects.filter(pk=user_id).first()
+        if summary is not None and summary.month == first:
+            return summary
+
+        figures = SummaryService.compute([user_id])[user_id]
+        if summary is None:
+            UserFinancialSummary.objects.bulk_create(
+                [UserFinancialSummary(user_id=user_id, **figures)], ignore_conflicts=True,
+            )
+        else:
+            UserFinancialSummary.objects.filter(pk=user_id, month__lt=first).update(
+                **figures, updated_at=timezone.now(),
+            )
+        return UserFinancialSummary(user_id=user_id, **figures)
+
+    @staticmethod
+    def check(user_ids: Iterable[int], repair: bool = False) -> Dict[str, int]:
+        """
+        Compare the stored rows of these users with the source tables
+        {'checked', 'missing', 'drifted'}; with repair, write the recomputed
+        figures under row locks (see rebuild)
+        """
+        user_ids = list(user_ids)
+        counts = {'checked': len(user_ids), 'missing': 0, 'drifted': 0}
+        with db_transaction.atomic():
+            stored = UserFinancialSummary.objects.filter(pk__in=user_ids)
+            if repair:
+                stored = stored.select_for_update()
+            stored = {summary.pk: summary for summary in stored}
+            figures = SummaryService.compute(user_ids)
+
+            missing, drifted = [], []
+            for user_id, values in figures.items():
+                summary = stored.get(user_id)
+                if summary is None:
+                    missing.append(UserFinancialSummary(user_id=user_id, **values))
+                elif any(getattr(summary, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(summary, field, value)
+                    drifted.append(summary)
+            counts['missing'], counts['drifted'] = len(missing), len(drifted)
+
+            if repair:
+                if missing:
+                    # A write path may have created one since we looked
+                    UserFinancialSummary.objects.bulk_create(missing, ignore_conflicts=True)
+                if drifted:
+                    now = timezone.now()
+                    for summary in drifted:
+                        summary.updated_at = now
+                    UserFinancialSummary.objects.bulk_update(drifted, [*FIELDS, 'updated_at'])
+        return counts
@@ -2,12 +2,14 @@
 Transaction service
 Handles business logic for transactions
 """
+import copy
 from decimal import Decimal
 from datetime import date
 from typing import Optional
 
 from django.db import transaction as db_transaction
 from api.models import Transaction, Account
+from .summary_service import SummaryService
 
 
 class TransactionService:
@@ -46,7 +48,9 @@ class TransactionService:
             account.balance += amount
         elif transaction_type == 'Expense':
             account.balance -= amount
-        account.save()
+        account.save(update_fields=['balance'])
+        
+        SummaryService.apply_transaction(new=new_transaction)
         
         return new_transaction
     
@@ -64,10 +68,12 @@ class TransactionService:
             account.balance -= trans.amount
         elif trans.type == 'Expense':
             account.balance += trans.amount
-        account.save()
+        account.save(update_fields=['balance'])
         
         # Delete transaction
         trans.delete()
+        
+        SummaryService.apply_transaction(old=trans)
     
     @staticmethod
     @db_transaction.atomic
@@ -82,6 +88,7 @@ class TransactionService:
         """
         trans = Transaction.objects.select_related('account').get(id=transaction_id)
         account = Account.objects.select_for_update().get(id=trans.account_id)
+        previous = copy.copy(trans)
         
         # Revert old transaction effect
         if trans.type == 'Income':
@@ -101,9 +108,11 @@ class TransactionService:
         elif trans.type == 'Expense':
             account.balance -= trans.amount
         
-        account.save()
+        account.save(update_fields=['balance'])
         trans.save()
         
+        SummaryService.apply_transaction(new=trans, old=previous)
+        
         return trans
 
 
@@ -2,15 +2,93 @@
 Trends service
 Handles business logic for spending trends analysis
 """
-from django.db.models import Sum, QuerySet
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import Count, Q, Sum, QuerySet
 from datetime import datetime, timedelta, date
 from decimal import Decimal
 from typing import Dict, Any, Optional, List
 from calendar import monthrange
 
+from api import metrics
+from api.db_router import reads_from_replica
 from api.models import Transaction, Budget, Category
 
 
+PERIOD_TYPES = ('week', 'month', 'quarter', 'year', 'rolling', 'custom')
+
+
+def _shift_months(first_day: date, months: int) -> date:
+    """First day of the month `months` away from first_day's month"""
+    index = first_day.year * 12 + first_day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _period_label(period_type: str, start: date) -> str:
+    if period_type == 'week':
+        year, week, _ = start.isocalendar()
+        return f'{year}-W{week:02d}'
+    if period_type == 'month':
+        return start.strftime('%Y-%m')
+    if period_type == 'quarter':
+        return f'{start.year}-Q{(start.month - 1) // 3 + 1}'
+    if period_type == 'year':
+        return str(start.year)
+    return start.isoformat()
+
+
+def comparison_periods(
+    period_type: str,
+    count: int = 2,
+    days: int = 30,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    today: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    `count` consecutive periods, oldest first. The last one is the current
+    period: calendar periods (week from Monday, month, quarter, year) run to
+    today, 'rolling' is the last `days` days and 'custom' is
+    start_date..end_date. Earlier periods have the same length and end the
+    day before the next one starts.
+    """
+    today = today or date.today()
+    bounds = []
+    if period_type in ('rolling', 'custom'):
+        if period_type == 'custom':
+            end, length = end_date, (end_date - start_date).days + 1
+        else:
+            end, length = today, days
+        for i in range(count):
+            period_end = end - timedelta(days=length * i)
+            bounds.append((period_end - timedelta(days=length - 1), period_end))
+    else:
+        if period_type == 'week':
+            current = today - timedelta(days=today.weekday())
+            starts = [current - timedelta(weeks=i) for i in range(count + 1)]
+        else:
+            step = {'month': 1, 'quarter': 3, 'year': 12}[period_type]
+            current = date(today.year, (today.month - 1) // step * step + 1, 1)
+            starts = [_shift_months(current, -step * i) for i in range(count + 1)]
+        bounds.append((starts[0], today))
+        for i in range(1, count):
+            bounds.append((starts[i], starts[i - 1] - timedelta(days=1)))
+
+    return [
+        {
+            'label': _period_label(period_type, start),
+            'start_date': start,
+            'end_date': end,
+            'closed': end < today,
+        }
+        for start, end in reversed(bounds)
+    ]
+
+
+@reads_from_replica
 class TrendsService:
     """
     Service class for trends-related business logic
@@ -299,18 +377,25 @@ class TrendsService:
     def get_category_distribution(
         user_id: int,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None,
+        top: int = 10
     ) -> Dict[str, Any]:
         """
         Get spending distribution by category for pie/donut charts
         
+        One GROUP BY category query: memory depends on the number of
+        categories, not on the number of expenses in the range.
+        
         Args:
             user_id: User ID
             start_date: Optional start date (defaults to first day of current month)
             end_date: Optional end date (defaults to today)
+            category_id: Optional category to drill down into (0 = uncategorized)
+            top: Descriptions listed in the drill-down
             
         Returns:
-            Dictionary with category breakdown
+            Dictionary with category breakdown (plus 'drill_down' for a category_id)
         """
         # Default to current month if no dates provided
         if start_date is None:
@@ -318,145 +403,214 @@ class TrendsService:
         if end_date is None:
             end_date = date.today()
         
-        # Query expenses in date range, grouped by category
         expenses = Transaction.objects.filter(
             user_id=user_id,
             type='Expense',
             transaction_date__gte=start_date,
             transaction_date__lte=end_date
-        ).select_related('category')
+        )
         
-        # Aggregate by category
-        category_totals: Dict[int, Dict[str, Any]] = {}
-        total_expenses = Decimal('0')
-        
-        for expense in expenses:
-            category_id = expense.category_id if expense.category_id else 0
-            category_name = expense.category.name if expense.category else 'Sin Categoría'
-            category_icon = expense.category.icon if expense.category else '❓'
-            
-            if category_id not in category_totals:
-                category_totals[category_id] = {
-                    'id': category_id,
-                    'name': category_name,
-                    'icon': category_icon,
-                    'amount': Decimal('0')
-                }
-            
-            category_totals[category_id]['amount'] += expense.amount
-            total_expenses += expense.amount
+        # order_by() replaces the model ordering, which would end up in the GROUP BY
+        rows = list(
+            expenses.values('category_id', 'category__name', 'category__icon')
+            .annotate(amount=Sum('amount'))
+            .order_by('-amount', 'category_id')
+        )
+        total_expenses = sum((row['amount'] for row in rows), Decimal('0'))
         
-        # Convert to list and calculate percentages
         distribution = []
-        for cat_data in category_totals.values():
-            amount = cat_data['amount']
+        for row in rows:
+            amount = row['amount']
             percentage = float((amount / total_expenses * 100)) if total_expenses > 0 else 0
             
             distribution.append({
-                'category_id': cat_data['id'],
-                'category_name': cat_data['name'],
-                'category_icon': cat_data['icon'],
+                'category_id': row['category_id'] or 0,
+                'category_name': row['category__name'] if row['category_id'] else 'Sin Categoría',
+                'category_icon': row['category__icon'] if row['category_id'] else '❓',
                 'amount': float(amount),
                 'percentage': round(percentage, 2)
             })
         
-        # Sort by amount descending
-        distribution.sort(key=lambda x: x['amount'], reverse=True)
-        
-        return {
+        result = {
             'distribution': distribution,
             'total_expenses': float(total_expenses),
             'period_start': start_date.isoformat(),
             'period_end': end_date.isoformat()
         }
+        
+        if category_id is not None:
+            category_total = next(
+                (row['amount'] for row in rows if (row['category_id'] or 0) == category_id), Decimal('0')
+            )
+            result['drill_down'] = TrendsService._description_breakdown(
+                expenses, category_id, category_total, top
+            )
+        
+        return result
+    
+    @staticmethod
+    def _description_breakdown(
+        expenses: QuerySet[Transaction],
+        category_id: int,
+        category_total: Decimal,
+        top: int
+    ) -> Dict[str, Any]:
+        """
+        Top expense descriptions of one category (categories have no
+        subcategories): a GROUP BY description limited to top rows, the
+        rest reported as other_amount
+        """
+        if category_id:
+            expenses = expenses.filter(category_id=category_id)
+        else:
+            expenses = expenses.filter(category__isnull=True)
+        
+        rows = (
+            expenses.values('description')
+            .annotate(amount=Sum('amount'), count=Count('id'))
+            .order_by('-amount', 'description')[:top]
+        )
+        
+        items = []
+        listed = Decimal('0')
+        for row in rows:
+            amount = row['amount']
+            listed += amount
+            percentage = float((amount / category_total * 100)) if category_total > 0 else 0
+            
+            items.append({
+                'description': row['description'] or 'Sin descripción',
+                'amount': float(amount),
+                'count': row['count'],
+                'percentage': round(percentage, 2)
+            })
+        
+        return {
+            'category_id': category_id,
+            'items': items,
+            'other_amount': float(category_total - listed),
+        }
+    
+    @staticmethod
+    def _periods_version_key(user_id: int) -> str:
+        return f'trends:periods-version:{user_id}'
+    
+    @staticmethod
+    def invalidate_periods(*user_ids: int) -> None:
+        """
+        Forget the cached totals of these users' closed periods (a backdated
+        or edited transaction changes them) once the current transaction commits
+        """
+        keys = [TrendsService._periods_version_key(user_id) for user_id in user_ids if user_id is not None]
+        if keys:
+            # A new version orphans every cached period: they expire on their own
+            db_transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None))
+    
+    @staticmethod
+    def get_period_totals(user_id: int, periods: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Income, expenses and net (Decimal) of each period (see comparison_periods)
+        
+        Closed periods are cached for TRENDS_PERIOD_CACHE_SECONDS; the others
+        are computed together in one conditional-aggregate query over the
+        range they cover.
+        """
+        # An evicted version is replaced by a new one, never by a version used before
+        version = cache.get_or_set(TrendsService._periods_version_key(user_id), time.time_ns, None)
+        keys = {
+            index: f"trends:period:{user_id}:{version}:{period['start_date']}:{period['end_date']}"
+            for index, period in enumerate(periods) if period['closed']
+        }
+        cached = cache.get_many(list(keys.values())) if keys else {}
+        for key in keys.values():
+            metrics.record_cache_access('trend_periods', hit=key in cached)
+        
+        totals: Dict[int, Dict[str, Decimal]] = {
+            index: cached[key] for index, key in keys.items() if key in cached
+        }
+        missing = [index for index in range(len(periods)) if index not in totals]
+        if missing:
+            aggregates = {}
+            for index in missing:
+                in_period = Q(
+                    transaction_date__gte=periods[index]['start_date'],
+                    transaction_date__lte=periods[index]['end_date'],
+                )
+                aggregates[f'income_{index}'] = Sum('amount', filter=in_period & Q(type='Income'))
+                aggregates[f'expenses_{index}'] = Sum('amount', filter=in_period & Q(type='Expense'))
+            
+            row = Transaction.objects.filter(
+                user_id=user_id,
+                transaction_date__gte=min(periods[index]['start_date'] for index in missing),
+                transaction_date__lte=max(periods[index]['end_date'] for index in missing),
+            ).aggregate(**aggregates)
+            
+            fresh = {}
+            for index in missing:
+                totals[index] = {
+                    'income': row[f'income_{index}'] or Decimal('0'),
+                    'expenses': row[f'expenses_{index}'] or Decimal('0'),
+                }
+                if index in keys:
+                    fresh[keys[index]] = totals[index]
+            if fresh:
+                cache.set_many(fresh, settings.TRENDS_PERIOD_CACHE_SECONDS)
+        
+        series = []
+        for index, period in enumerate(periods):
+            income, expenses = totals[index]['income'], totals[index]['expenses']
+            # Decimals: callers compute changes before the serializer turns them into floats
+            series.append({
+                'label': period['label'],
+                'income': income,
+                'expenses': expenses,
+                'net': income - expenses,
+                'start_date': period['start_date'].isoformat(),
+                'end_date': period['end_date'].isoformat(),
+                'closed': period['closed'],
+            })
+        return series
     
     @staticmethod
     def get_spending_comparison(
         user_id: int,
-        period_type: str = 'month'  # 'month' or 'year'
+        period_type: str = 'month',
+        count: int = 2,
+        days: int = 30,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """
-        Compare current period spending vs previous period
+        Compare the current period with the previous ones
         
         Args:
             user_id: User ID
-            period_type: 'month' or 'year'
+            period_type: 'week', 'month', 'quarter', 'year', 'rolling' (last `days` days)
+                or 'custom' (start_date..end_date)
+            count: Number of periods in the series (at least 2)
+            days: Length of a 'rolling' period
+            start_date: Start of the 'custom' period
+            end_date: End of the 'custom' period
             
         Returns:
-            Comparison data with change percentages
+            Comparison data with change percentages, plus the whole series
+            (oldest first) for sparklines
         """
-        today = date.today()
-        
-        if period_type == 'month':
-            # Current month
-            current_start = today.replace(day=1)
-            current_end = today
-            
-            # Previous month
-            prev_end = current_start - timedelta(days=1)
-            prev_start = prev_end.replace(day=1)
-        else:  # year
-            # Current year
-            current_start = today.replace(month=1, day=1)
-            current_end = today
-            
-            # Previous year
-            prev_start = current_start.replace(year=current_start.year - 1)
-            prev_end = prev_start.replace(month=12, day=31)
-        
-        # Get current period totals
-        current_income = Transaction.objects.filter(
-            user_id=user_id,
-            type='Income',
-            transaction_date__gte=current_start,
-            transaction_date__lte=current_end
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        current_expenses = Transaction.objects.filter(
-            user_id=user_id,
-            type='Expense',
-            transaction_date__gte=current_start,
-            transaction_date__lte=current_end
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        # Get previous period totals
-        prev_income = Transaction.objects.filter(
-            user_id=user_id,
-            type='Income',
-            transaction_date__gte=prev_start,
-            transaction_date__lte=prev_end
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        prev_expenses = Transaction.objects.filter(
-            user_id=user_id,
-            type='Expense',
-            transaction_date__gte=prev_start,
-            transaction_date__lte=prev_end
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        periods = comparison_periods(period_type, count, days, start_date, end_date)
+        series = TrendsService.get_period_totals(user_id, periods)
+        current, previous = series[-1], series[-2]
         
         # Calculate changes
-        income_change = float((current_income - prev_income) / prev_income * 100) if prev_income > 0 else 0
-        expenses_change = float((current_expenses - prev_expenses) / prev_expenses * 100) if prev_expenses > 0 else 0
+        income_change = float((current['income'] - previous['income']) / previous['income'] * 100) if previous['income'] > 0 else 0
+        expenses_change = float((current['expenses'] - previous['expenses']) / previous['expenses'] * 100) if previous['expenses'] > 0 else 0
         
         return {
             'period_type': period_type,
-            'current': {
-                'income': float(current_income),
-                'expenses': float(current_expenses),
-                'net': float(current_income - current_expenses),
-                'start_date': current_start.isoformat(),
-                'end_date': current_end.isoformat()
-            },
-            'previous': {
-                'income': float(prev_income),
-                'expenses': float(prev_expenses),
-                'net': float(prev_income - prev_expenses),
-                'start_date': prev_start.isoformat(),
-                'end_date': prev_end.isoformat()
-            },
+            'current': current,
+            'previous': previous,
             'change': {
                 'income_percent': round(income_change, 2),
                 'expenses_percent': round(expenses_change, 2)
-            }
+            },
+            'series': series,
         }
-
@@ -0,0 +1,202 @@
+"""
+Signal receivers
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from functools import wraps
+from typing import Callable, Iterator
+
+from django.apps import AppConfig
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+
+_suppressed: ContextVar[bool] = ContextVar('api_signals_suppressed', default=False)
+
+
+@contextmanager
+def suppressed() -> Iterator[None]:
+    """
+    Mute the receivers below: for writes that replay or move existing data
+    (backup restores, user merges) rather than being new user actions
+    """
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def receiver(func: Callable) -> Callable:
+    """Skip the wrapped receiver inside suppressed()"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _suppressed.get():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Rows of the deletion in progress in this thread. Collector.delete() sends
+# pre_delete for every row (cascades included) before it sends any post_delete,
+# so the first post_delete writes the whole batch.
+_pending_tombstones = threading.local()
+
+# Models deleted directly (API destroy routes, management commands). Rows that
+# go with them through CASCADE or SET_NULL need no tombstone of their own: the
+# replayed delete is an ORM delete too and applies them again
+# (BackupService._apply_tombstones). Models only ever removed that way (budget
+# history and period results, investment movements, summaries) get no
+# receivers, so Django keeps deleting them with fast, signal-less queries.
+TOMBSTONE_MODELS = (
+    'User', 'Account', 'Category', 'Transaction', 'Budget', 'Goal', 'Transfer',
+    'Debt', 'DebtPayment', 'RecurringTransaction', 'Investment',
+)
+
+
+def _deleted_directly(sender, instance, origin) -> bool:
+    """Whether the row is what delete() was called on, rather than one of its cascades"""
+    if origin is None:
+        return True
+    if isinstance(origin, QuerySet):
+        return sender is origin.model
+    return type(origin) is sender and origin.pk == instance.pk
+
+
+@receiver
+def collect_deletion(sender, instance, using, origin=None, **kwargs) -> None:
+    """Queue a tombstone for incremental backups"""
+    pending = getattr(_pending_tombstones, 'batch', None)
+    if pending is None or pending['written'] or pending['origin'] is not origin:
+        pending = _pending_tombstones.batch = {'origin': origin, 'using': using, 'rows': [], 'written': False}
+    if _deleted_directly(sender, instance, origin):
+        pending['rows'].append((sender._meta.db_table, instance.pk))
+
+
+@receiver
+def record_deletion(sender, instance, using, origin=None, **kwargs) -> None:
+    """Write the queued tombstones in one bulk insert, in the deleting transaction"""
+    pending = getattr(_pending_tombstones, 'batch', None)
+    if pending is None or pending['written'] or pending['origin'] is not origin:
+        return
+    pending['written'] = True
+
+    from api.models import DeletedRecord
+    DeletedRecord.objects.using(pending['using']).bulk_create([
+        DeletedRecord(table_name=table_name, object_id=object_id) for table_name, object_id in pending['rows']
+    ])
+    pending['rows'] = []
+
+
+def connect_tombstones(app_config: AppConfig) -> None:
+    """
+    Track deletes of TOMBSTONE_MODELS. A receiver still turns off Django's fast
+    cascade delete for these models, so their cascades load the rows they delete
+    """
+    for name in TOMBSTONE_MODELS:
+        model = app_config.get_model(name)
+        pre_delete.connect(collect_deletion, sender=model, dispatch_uid=f'tombstone:collect:{model._meta.label}')
+        post_delete.connect(record_deletion, sender=model, dispatch_uid=f'tombstone:{model._meta.label}')
+
+
+@receiver
+def forget_active_user(sender, instance, **kwargs) -> None:
+    """Make stateless JWT auth re-check a saved (maybe deactivated) or deleted user"""
+    from api.authentication import forget_user
+    forget_user(instance.pk)
+
+
+def connect_active_user_cache() -> None:
+    """Only reaches the current process: other workers notice within JWT_ACTIVE_USER_CACHE_SECONDS"""
+    from api.models import User
+    post_save.connect(forget_active_user, sender=User, dispatch_uid='active-user-cache:save')
+    post_delete.connect(forget_active_user, sender=User, dispatch_uid='active-user-cache:delete')
+
+
+@receiver
+def invalidate_lookups(sender, instance, update_fields=None, **kwargs) -> None:
+    """
+    A created, deleted or edited account/category changes its owner's
+    /api/lookups/ payload; saves of other columns only (balance) don't
+    """
+    from api.services import LookupService
+    if update_fields is not None and not LookupService.affected_by(sender, update_fields):
+        return
+    LookupService.invalidate(instance.user_id)
+
+
+def connect_lookup_cache() -> None:
+    """Bulk updates skip these signals: callers invalidate with LookupService.invalidate()"""
+    from api.models import Account, Category
+    for model in (Account, Category):
+        post_save.connect(invalidate_lookups, sender=model, dispatch_uid=f'lookups:save:{model._meta.label}')
+        post_delete.connect(invalidate_lookups, sender=model, dispatch_uid=f'lookups:delete:{model._meta.label}')
+
+
+@receiver
+def invalidate_trend_periods(sender, instance, **kwargs) -> None:
+    """A saved or deleted transaction may change a closed period of /api/trends/comparison/"""
+    from api.services import TrendsService
+    TrendsService.invalidate_periods(instance.user_id)
+
+
+def connect_trend_period_cache() -> None:
+    """Bulk updates skip these signals: callers invalidate with TrendsService.invalidate_periods()"""
+    from api.models import Transaction
+    post_save.connect(invalidate_trend_periods, sender=Transaction, dispatch_uid='trend-periods:save')
+    post_delete.connect(invalidate_trend_periods, sender=Transaction, dispatch_uid='trend-periods:delete')
+
+
+# Transaction fields whose change can move an expense between budget rows or change its spent
+BUDGET_UPDATE_FIELDS = {'user', 'user_id', 'type', 'category', 'category_id', 'transaction_date', 'amount'}
+
+
+def _budget_category(user_id, kind, category_id, transaction_date):
+    """(user_id, category_id) of an expense of the open month, None for anything else"""
+    today = date.today()
+    if kind != 'Expense' or category_id is None or transaction_date is None:
+        return None
+    if (transaction_date.year, transaction_date.month) != (today.year, today.month):
+        return None
+    return user_id, category_id
+
+
+@receiver
+def refresh_budget_results(sender, instance, update_fields=None, using=None, **kwargs) -> None:
+    """
+    An expense of the open month changes the spent of its category's budget
+    on /api/budgets/performance/: refresh that row, and the one an update
+    moved it out of (from the values it was loaded with, see Transaction.from_db)
+    """
+    from api.services import BudgetPerformanceService
+    if update_fields is not None and not BUDGET_UPDATE_FIELDS & set(update_fields):
+        return
+    current = (instance.user_id, instance.type, instance.category_id, instance.transaction_date)
+    categories = {_budget_category(*current)}
+    loaded = getattr(instance, '_loaded_budget_values', None)
+    if loaded is not None:
+        categories.add(_budget_category(*loaded))
+    # A later save of the same instance starts from what was just written
+    instance._loaded_budget_values = current
+    categories.discard(None)
+    if categories:
+        BudgetPerformanceService.schedule_refresh(categories=categories, using=using)
+
+
+@receiver
+def refresh_budget_result(sender, instance, using=None, **kwargs) -> None:
+    """A saved budget changes its own open-month row only"""
+    from api.services import BudgetPerformanceService
+    BudgetPerformanceService.schedule_refresh(budget_ids=[instance.pk], using=using)
+
+
+def connect_budget_results() -> None:
+    """
+    Bulk writes skip these signals: the daily close_budget_periods run catches them up.
+    A deleted budget's rows go with it (on_delete=CASCADE)
+    """
+    from api.models import Budget, Transaction
+    post_save.connect(refresh_budget_results, sender=Transaction, dispatch_uid='budget-results:transaction-save')
+    post_delete.connect(refresh_budget_results, sender=Transaction, dispatch_uid='budget-results:transaction-delete')
+    post_save.connect(refresh_budget_result, sender=Budget, dispatch_uid='budget-results:budget-save')
@@ -0,0 +1,158 @@
+"""
+Ownership tests for OwnedQuerysetMixin and IsOwnerPermission
+
+Other users' rows must be invisible (404, never 403) on every detail route,
+and the owner check must not add queries on top of the scoped queryset.
+
+Run with: python manage.py test api.tests
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from api.models import (
+    Account, Category, Debt, DebtPayment, Investment, InvestmentTransaction, Transaction, User,
+)
+from api.permissions import IsOwnerPermission
+from api.views import DebtPaymentViewSet
+
+
+def create_owned_rows(username: str) -> dict:
+    """One row of each model under test, owned by a new user"""
+    user = User.objects.create_user(username=username, email=f'{username}@test.local', password='x')
+    account = Account.objects.create(user=user, name='Main', type='bank', balance=Decimal('1000.00'))
+    category = Category.objects.create(user=user, name='Food', type='Expense')
+    transaction = Transaction.objects.create(
+        user=user, account=account, category=category, type='Expense',
+        amount=Decimal('10.00'), transaction_date=date.today(),
+    )
+    debt = Debt.objects.create(
+        user=user, creditor_name='Bank', principal_amount=Decimal('1200.00'), interest_rate=Decimal('0'),
+        term_months=12, monthly_payment=Decimal('100.00'), start_date=date.today(),
+    )
+    payment = DebtPayment.objects.create(debt=debt, account=account, amount=Decimal('100.00'), payment_date=date.today())
+    investment = Investment.objects.create(
+        user=user, investment_type='goal', name='Savings', account=account, start_date=date.today(),
+    )
+    movement = InvestmentTransaction.objects.create(
+        investment=investment, transaction_type='contribution', amount=Decimal('50.00'),
+        transaction_date=date.today(), account=account,
+    )
+    return {
+        'user': user,
+        'account': account,
+        'transaction': transaction,
+        'debt-payment': payment,
+        'investment-transaction': movement,
+    }
+
+
+class OwnershipTests(APITestCase):
+    """Requests as `owner` against `other`'s rows"""
+
+    writable = ('account', 'transaction', 'debt-payment')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.own = create_owned_rows('owner')
+        cls.other = create_owned_rows('other')
+
+    def setUp(self):
+        self.client.force_authenticate(self.own['user'])
+
+    def url(self, kind: str, pk: int) -> str:
+        return f'/api/{kind}s/{pk}/'
+
+    def test_retrieve_own_rows(self):
+        for kind in (*self.writable, 'investment-transaction'):
+            with self.subTest(kind=kind):
+                response = self.client.get(self.url(kind, self.own[kind].pk))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_other_users_rows_is_404(self):
+        for kind in (*self.writable, 'investment-transaction'):
+            with self.subTest(kind=kind):
+                response = self.client.get(self.url(kind, self.other[kind].pk))
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_other_users_rows_is_404(self):
+        for kind in self.writable:
+            with self.subTest(kind=kind):
+                url = self.url(kind, self.other[kind].pk)
+                self.assertEqual(self.client.patch(url, {}, format='json').status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(self.client.put(url, {}, format='json').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_other_users_rows_is_404(self):
+        for kind in self.writable:
+            with self.subTest(kind=kind):
+                response = self.client.delete(self.url(kind, self.other[kind].pk))
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertTrue(type(self.other[kind]).objects.filter(pk=self.other[kind].pk).exists())
+
+    def test_investment_movements_are_read_only(self):
+        url = self.url('investment-transaction', self.other['investment-transaction'].pk)
+        self.assertEqual(self.client.patch(url, {}, format='json').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertTrue(InvestmentTransaction.objects.filter(pk=self.other['investment-transaction'].pk).exists())
+
+    def test_lists_only_contain_own_rows(self):
+        for kind in (*self.writable, 'investment-transaction'):
+            with self.subTest(kind=kind):
+                response = self.client.get(f'/api/{kind}s/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual([row['id'] for row in response.json()], [self.own[kind].pk])
+
+
+class OwnershipQueryCountTests(APITestCase):
+    """The owner check reads data loaded with the object: no per-object lookup"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.own = create_owned_rows('owner')
+
+    def setUp(self):
+        self.client.force_authenticate(self.own['user'])
+
+    def test_nested_owner_detail_is_one_query(self):
+        # debt__user_id / investment__user_id come from the joined parent row
+        for kind in ('debt-payment', 'investment-transaction'):
+            with self.subTest(kind=kind), self.assertNumQueries(1):
+                response = self.client.get(f"/api/{kind}s/{self.own[kind].pk}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_nested_owner_sparse_detail_is_one_query(self):
+        # ?fields= drops the debt from the response, but the owner relation stays joined
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/debt-payments/{self.own['debt-payment'].pk}/?fields=id,amount")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_nested_owner_list_is_one_query(self):
+        for kind in ('debt-payment', 'investment-transaction'):
+            with self.subTest(kind=kind), self.assertNumQueries(1):
+                response = self.client.get(f'/api/{kind}s/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_transaction_detail_and_list_are_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(f"/api/transactions/{self.own['transaction'].pk}/")
+        with self.assertNumQueries(1):
+            self.client.get('/api/transactions/')
+
+
+class IsOwnerPermissionTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.own = create_owned_rows('owner')
+
+    def test_unloaded_owner_fails_closed(self):
+        request = APIRequestFactory().get('/')
+        request.user = self.own['user']
+        view = DebtPaymentViewSet()
+        # Without select_related('debt') the owner can't be checked without a query
+        payment = DebtPayment.objects.get(pk=self.own['debt-payment'].pk)
+        with self.assertRaises(ImproperlyConfigured):
+            IsOwnerPermission().has_object_permission(request, view, payment)
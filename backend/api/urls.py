@@ -21,6 +21,9 @@ from api.views import (
     TrendsViewSet,
     dashboard_stats,
     health_check,
+    lookups,
+    batch,
+    metrics,
 )
 
 router = DefaultRouter()
@@ -41,7 +44,10 @@ router.register(r'trends', TrendsViewSet, basename='trends')
 urlpatterns = [
     path('', include(router.urls)),
     path('dashboard/', dashboard_stats, name='dashboard-stats'),
+    path('lookups/', lookups, name='lookups'),
+    path('batch/', batch, name='batch'),
     path('health/', health_check, name='health-check'),
+    path('metrics/', metrics, name='metrics'),
     
     # Authentication endpoints
     path('auth/register/', RegisterView.as_view(), name='auth-register'),
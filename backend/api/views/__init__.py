@@ -1,34 +1,56 @@
 """
 Views package
+Submodules are imported on first access (PEP 562), so processes that
+never route requests (management commands, cron jobs) skip them
 """
-from .user import UserViewSet, RegisterView, UserProfileView, ChangePasswordView, CustomTokenObtainPairView
-from .account import AccountViewSet
-from .transaction import CategoryViewSet, TransactionViewSet
-from .financial import BudgetViewSet, GoalViewSet, TransferViewSet, DebtViewSet, DebtPaymentViewSet, RecurringTransactionViewSet
-from .investment import InvestmentViewSet, InvestmentTransactionViewSet
-from .trends import TrendsViewSet
-from .dashboard import dashboard_stats, health_check
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
-    'UserViewSet',
-    'RegisterView',
-    'UserProfileView',
-    'ChangePasswordView',
-    'CustomTokenObtainPairView',
-    'AccountViewSet',
-    'CategoryViewSet',
-    'TransactionViewSet',
-    'BudgetViewSet',
-    'GoalViewSet',
-    'TransferViewSet',
-    'DebtViewSet',
-    'DebtPaymentViewSet',
-    'RecurringTransactionViewSet',
-    'InvestmentViewSet',
-    'InvestmentTransactionViewSet',
-    'TrendsViewSet',
-    'dashboard_stats',
-    'health_check',
-]
+if TYPE_CHECKING:
+    from .user import UserViewSet, RegisterView, UserProfileView, ChangePasswordView, CustomTokenObtainPairView
+    from .account import AccountViewSet
+    from .transaction import CategoryViewSet, TransactionViewSet
+    from .financial import BudgetViewSet, GoalViewSet, TransferViewSet, DebtViewSet, DebtPaymentViewSet, RecurringTransactionViewSet
+    from .investment import InvestmentViewSet, InvestmentTransactionViewSet
+    from .trends import TrendsViewSet
+    from .dashboard import dashboard_stats, health_check
+    from .lookups import lookups
+    from .batch import batch
+    from .monitoring import metrics
 
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'UserViewSet': '.user',
+    'RegisterView': '.user',
+    'UserProfileView': '.user',
+    'ChangePasswordView': '.user',
+    'CustomTokenObtainPairView': '.user',
+    'AccountViewSet': '.account',
+    'CategoryViewSet': '.transaction',
+    'TransactionViewSet': '.transaction',
+    'BudgetViewSet': '.financial',
+    'GoalViewSet': '.financial',
+    'TransferViewSet': '.financial',
+    'DebtViewSet': '.financial',
+    'DebtPaymentViewSet': '.financial',
+    'RecurringTransactionViewSet': '.financial',
+    'InvestmentViewSet': '.investment',
+    'InvestmentTransactionViewSet': '.investment',
+    'TrendsViewSet': '.trends',
+    'dashboard_stats': '.dashboard',
+    'health_check': '.dashboard',
+    'lookups': '.lookups',
+    'batch': '.batch',
+    'metrics': '.monitoring',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
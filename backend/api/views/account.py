@@ -3,21 +3,36 @@ Account views
 """
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from api.models import Account
 from api.serializers import AccountSerializer
-from api.permissions import IsOwnerPermission
+from api.fieldsets import SparseQuerysetMixin
+from api.permissions import IsOwnerPermission, OwnedQuerysetMixin
+from api.services import SummaryService
 
 
-class AccountViewSet(viewsets.ModelViewSet[Account]):
+class AccountViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Account]):
     serializer_class = AccountSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    queryset = Account.objects.all()
     
-    def get_queryset(self):
-        """Filter accounts by authenticated user"""
-        return Account.objects.filter(user=self.request.user)
-    
+    @transaction.atomic
     def perform_create(self, serializer):
         """Automatically assign the authenticated user when creating an account"""
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+        SummaryService.refresh(self.request.user.id, 'accounts')
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """The balance can be edited directly: recompute the summary's account figures"""
+        instance = serializer.save()
+        SummaryService.refresh(instance.user_id, 'accounts')
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """The delete cascades to transactions and unlinks investments: recompute the whole summary"""
+        user_id = instance.user_id
+        instance.delete()
+        SummaryService.refresh(user_id)
 
 
@@ -0,0 +1,130 @@
+"""
+Batch views
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from api.middleware import observe_queries
+
+
+logger = logging.getLogger('api')
+
+API_PREFIX = '/api/'
+
+
+def _parse_items(data: Any) -> Tuple[Optional[List[Dict[str, str]]], Optional[str]]:
+    """(items, None) with an id and path per sub-request, or (None, error message)"""
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, 'requests must be a non-empty list of paths or {"id", "path"} objects'
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        return None, f'At most {settings.BATCH_MAX_REQUESTS} requests per batch'
+
+    parsed = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return None, f'requests[{index}] must be a path or an object with a path'
+        if item.get('method', 'GET').upper() != 'GET':
+            return None, f'requests[{index}]: only GET requests can be batched'
+        if not item['path'].startswith(API_PREFIX):
+            return None, f'requests[{index}]: path must start with {API_PREFIX}'
+        parsed.append({'id': str(item.get('id', index)), 'path': item['path']})
+    return parsed, None
+
+
+def _sub_request(request, path: str, query: str) -> HttpRequest:
+    """
+    GET request for path that reuses the batch request's headers and its
+    already authenticated user (DRF's forced authentication: no JWT decode)
+    """
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {**request.META, 'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query}
+    sub.META.pop('CONTENT_LENGTH', None)
+    sub.META.pop('CONTENT_TYPE', None)
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _run(request, path: str) -> Tuple[int, Any]:
+    """Status code and response data of one sub-request"""
+    path, _, query = path.partition('?')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {'detail': 'Not found.'}
+    if match.func is batch:
+        return status.HTTP_400_BAD_REQUEST, {'detail': 'Batches cannot be nested.'}
+
+    sub = _sub_request(request, path, query)
+    sub.resolver_match = match
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(sub, *match.args, **match.kwargs)
+
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    # Plain Django responses (metrics) are passed through as text
+    return response.status_code, response.content.decode(response.charset)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request) -> Response:
+    """
+    POST /api/batch/
+    Run several GET requests in one round-trip:
+        {"requests": ["/api/accounts/?fields=id,name", {"id": "debts", "path": "/api/debts/"}]}
+
+    Sub-requests run one after the other in this process, on this request's
+    user and DB connection, without going through the middleware again.
+    Each response carries its own status, data and timing.
+    """
+    items, error = _parse_items(request.data)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    started = time.perf_counter()
+    responses = []
+    for item in items:
+        db_durations: list = []
+        item_started = time.perf_counter()
+        with observe_queries(lambda elapsed, context: db_durations.append(elapsed)):
+            try:
+                code, data = _run(request, item['path'])
+            except Exception:
+                logger.exception('Batch sub-request %s failed', item['path'])
+                code, data = status.HTTP_500_INTERNAL_SERVER_ERROR, {'detail': 'Internal server error.'}
+        responses.append({
+            'id': item['id'],
+            'path': item['path'],
+            'status': code,
+            'data': data,
+            'timing': {
+                'total_ms': round((time.perf_counter() - item_started) * 1000, 2),
+                'db_ms': round(sum(db_durations) * 1000, 2),
+                'db_queries': len(db_durations),
+            },
+        })
+
+    return Response({
+        'responses': responses,
+        'total_ms': round((time.perf_counter() - started) * 1000, 2),
+    })
@@ -1,36 +1,37 @@
 """
 Dashboard views
 """
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from adrf.decorators import api_view as async_api_view
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from api.services import DashboardService
-from api.serializers import TransactionSerializer, DashboardStatsSerializer
+from api.services import DashboardService, HealthService
+from api.serializers import TransactionReadSerializer, DashboardStatsSerializer, serialize_rows
 
 
-@api_view(['GET'])
+@async_api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def dashboard_stats(request) -> Response:
+async def dashboard_stats(request) -> Response:
     """
     Get dashboard statistics for authenticated user
-    Uses DashboardService for business logic with user filtering
+    Async view: the independent aggregates run concurrently (DashboardService.aget_dashboard_stats)
     """
     # Get dashboard stats from service layer filtered by authenticated user
-    stats_data = DashboardService.get_dashboard_stats(user_id=request.user.id)
+    stats_data = await DashboardService.aget_dashboard_stats(user_id=request.user.id)
     
-    # Serialize recent transactions with context to allow proper field filtering
-    recent_transactions_data = TransactionSerializer(
-        stats_data['recent_transactions'], 
-        many=True,
-        context={'request': request}
-    ).data
+    # Recent transactions were loaded with select_related: only attribute reads left
+    recent_transactions_data = serialize_rows(TransactionReadSerializer, stats_data['recent_transactions'])
     
     # Build response data manually (no need for DashboardStatsSerializer)
     response_data = {
         'total_balance': str(stats_data['total_balance']),
         'total_income': str(stats_data['total_income']),
         'total_expenses': str(stats_data['total_expenses']),
+        'month_income': str(stats_data['month_income']),
+        'month_expenses': str(stats_data['month_expenses']),
+        'committed_funds': str(stats_data['committed_funds']),
         'accounts_count': stats_data['accounts_count'],
         'recent_transactions': recent_transactions_data,
         'goals_summary': stats_data['goals_summary'],
@@ -45,12 +46,21 @@ def dashboard_stats(request) -> Response:
 
 
 @api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
 def health_check(request) -> Response:
     """
-    Simple health check endpoint
+    Health check endpoint
+    ?deep=1 probes database latency, migrations, cache and batch job freshness;
+    unhealthy results return 503 so load balancers take the instance out
     """
-    return Response({
-        'status': 'healthy',
-        'message': 'Budget API is running'
-    })
+    if request.query_params.get('deep') not in ('1', 'true', 'True'):
+        return Response({
+            'status': 'healthy',
+            'message': 'Budget API is running'
+        })
+
+    result = HealthService.get_deep_health()
+    http_status = status.HTTP_503_SERVICE_UNAVAILABLE if result['status'] == 'unhealthy' else status.HTTP_200_OK
+    return Response(result, status=http_status)
 
@@ -5,24 +5,22 @@ from decimal import Decimal
 from datetime import date, timedelta
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from django.core.management import call_command
-from io import StringIO
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from django.db.models import Sum
 from api.models import Budget, BudgetHistory, Goal, Transfer, Debt, DebtPayment, Account, Transaction, RecurringTransaction
-from api.serializers import BudgetSerializer, BudgetHistorySerializer, GoalSerializer, TransferSerializer, DebtSerializer, DebtPaymentSerializer, RecurringTransactionSerializer
-from api.permissions import IsOwnerPermission
+from api.serializers import BudgetSerializer, BudgetHistorySerializer, GoalSerializer, TransferSerializer, DebtSerializer, DebtPaymentSerializer, DebtPaymentReadSerializer, RecurringTransactionSerializer, serialize_rows
+from api.db_router import reads_from_replica
+from api.fieldsets import SparseQuerysetMixin
+from api.permissions import IsOwnerPermission, OwnedQuerysetMixin
+from api.services import BudgetPerformanceService, SummaryService
 
 
-class BudgetViewSet(viewsets.ModelViewSet[Budget]):
+class BudgetViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Budget]):
     serializer_class = BudgetSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter budgets by authenticated user"""
-        return Budget.objects.filter(user=self.request.user).select_related('category', 'user')
+    queryset = Budget.objects.select_related('category', 'user')
     
     def perform_create(self, serializer):
         """Automatically assign the authenticated user and set monthly period when creating a budget"""
@@ -43,7 +41,7 @@ class BudgetViewSet(viewsets.ModelViewSet[Budget]):
                 period_end = (today.replace(day=1, month=today.month + 1) - timedelta(days=1))
         
         serializer.save(
-            user=self.request.user,
+            user_id=self.request.user.id,
             period_start=month_start,
             period_end=period_end
         )
@@ -59,7 +57,7 @@ class BudgetViewSet(viewsets.ModelViewSet[Budget]):
             new_amount=serializer.validated_data.get('amount', instance.amount),
             previous_period_end=instance.period_end,
             new_period_end=serializer.validated_data.get('period_end'),
-            changed_by=instance.user,  # Using budget's user since we don't have auth yet
+            changed_by_id=instance.user_id,  # Using budget's user since we don't have auth yet
             change_reason=self.request.data.get('change_reason')
         )
         
@@ -73,6 +71,23 @@ class BudgetViewSet(viewsets.ModelViewSet[Budget]):
         serializer = BudgetHistorySerializer(history, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    @reads_from_replica
+    def performance(self, request):
+        """
+        GET /api/budgets/performance/?months=12
+        Budget vs actual of the last N months (current one included) from the
+        monthly results, without reading transactions
+        """
+        try:
+            months = int(request.query_params.get('months', 12))
+        except ValueError:
+            return Response({'error': 'months parameter must be a valid integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= months <= 36:
+            return Response({'error': 'months parameter must be between 1 and 36'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(BudgetPerformanceService.get_performance(request.user.id, months))
+    
     @action(detail=True, methods=['post'])
     def toggle_status(self, request, pk=None):
         """Pause/Resume/Archive budget"""
@@ -88,55 +103,62 @@ class BudgetViewSet(viewsets.ModelViewSet[Budget]):
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GoalViewSet(viewsets.ModelViewSet[Goal]):
+class GoalViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Goal]):
     serializer_class = GoalSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    queryset = Goal.objects.select_related('account')
     
-    def get_queryset(self):
-        """Filter goals by authenticated user (via account relationship)"""
-        return Goal.objects.filter(user=self.request.user).select_related('account')
-    
+    @transaction.atomic
     def perform_create(self, serializer):
         """Automatically assign the authenticated user when creating a goal"""
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+        SummaryService.refresh(self.request.user.id, 'goals')
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Status changes move the goal counts of the summary"""
+        instance = serializer.save()
+        SummaryService.refresh(instance.user_id, 'goals')
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        user_id = instance.user_id
+        instance.delete()
+        SummaryService.refresh(user_id, 'goals')
 
 
-class TransferViewSet(viewsets.ModelViewSet[Transfer]):
+class TransferViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Transfer]):
     serializer_class = TransferSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter transfers by authenticated user"""
-        return Transfer.objects.filter(user=self.request.user).select_related('from_account', 'to_account', 'user')
+    queryset = Transfer.objects.select_related('from_account', 'to_account', 'user')
     
     @transaction.atomic
     def perform_create(self, serializer):
         """Create transfer and update both account balances"""
         # Save transfer
-        instance = serializer.save(user=self.request.user)
+        instance = serializer.save(user_id=self.request.user.id)
         
         # Update from_account (subtract)
         from_account = instance.from_account
         from_account.balance -= instance.amount
-        from_account.save()
+        from_account.save(update_fields=['balance'])
         
         # Update to_account (add)
         to_account = instance.to_account
         to_account.balance += instance.amount
-        to_account.save()
+        to_account.save(update_fields=['balance'])
+        
+        # Both accounts are the user's: the total balance of the summary doesn't move
 
 
-class DebtViewSet(viewsets.ModelViewSet[Debt]):
+class DebtViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Debt]):
     serializer_class = DebtSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter debts by authenticated user"""
-        return Debt.objects.filter(user=self.request.user).prefetch_related('payments')
+    queryset = Debt.objects.prefetch_related('payments')
     
     def perform_create(self, serializer):
         """Automatically assign the authenticated user when creating a debt"""
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
     
     def perform_update(self, serializer):
         """Recalculate monthly_payment when updating debt"""
@@ -190,7 +212,7 @@ class DebtViewSet(viewsets.ModelViewSet[Debt]):
         
         try:
             # SECURITY FIX: Filter account by user to prevent IDOR
-            account = Account.objects.get(id=account_id, user=request.user)
+            account = Account.objects.get(id=account_id, user_id=request.user.id)
         except Account.DoesNotExist:
             return Response(
                 {'error': 'Cuenta no encontrada'},
@@ -206,7 +228,7 @@ class DebtViewSet(viewsets.ModelViewSet[Debt]):
         
         # Create transaction (Expense)
         new_transaction = Transaction.objects.create(
-            user=debt.user,
+            user_id=debt.user_id,
             account=account,
             category=None,  # Debt payments don't have category
             type='Expense',
@@ -217,7 +239,8 @@ class DebtViewSet(viewsets.ModelViewSet[Debt]):
         
         # Update account balance
         account.balance -= payment_amount
-        account.save()
+        account.save(update_fields=['balance'])
+        SummaryService.apply_transaction(new=new_transaction)
         
         # Create payment record
         payment = DebtPayment.objects.create(
@@ -243,13 +266,15 @@ class DebtViewSet(viewsets.ModelViewSet[Debt]):
         return Response(serializer.data)
 
 
-class DebtPaymentViewSet(viewsets.ModelViewSet[DebtPayment]):
+class DebtPaymentViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[DebtPayment]):
     serializer_class = DebtPaymentSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    queryset = DebtPayment.objects.select_related('debt', 'account')
+    owner_field = 'debt__user_id'
     
     def get_queryset(self):
-        """Filter payments by authenticated user (via debt relationship) and optionally by debt"""
-        queryset = DebtPayment.objects.filter(debt__user=self.request.user).select_related('debt', 'account')
+        """Payments of the user's debts (owner_field), optionally of one debt"""
+        queryset = super().get_queryset()
         
         # Optional: filter by specific debt
         debt_id = self.request.query_params.get('debt')
@@ -257,19 +282,21 @@ class DebtPaymentViewSet(viewsets.ModelViewSet[DebtPayment]):
             queryset = queryset.filter(debt_id=debt_id)
         
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """Read path: values() rows straight to dicts, no model instances"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(serialize_rows(DebtPaymentReadSerializer, queryset, self.get_serializer_context()))
 
 
-class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
+class RecurringTransactionViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[RecurringTransaction]):
     serializer_class = RecurringTransactionSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter recurring transactions by authenticated user"""
-        return RecurringTransaction.objects.filter(user=self.request.user).select_related('user', 'account', 'category')
+    queryset = RecurringTransaction.objects.select_related('user', 'account', 'category')
     
     def perform_create(self, serializer):
         """Automatically assign the authenticated user and optionally generate first transaction"""
-        instance = serializer.save(user=self.request.user)
+        instance = serializer.save(user_id=self.request.user.id)
         
         # Check if immediate generation was requested
         generate_now = self.request.data.get('generate_now')
@@ -328,6 +355,10 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
         # Security: You might want to restrict this to admins or specific service accounts
         # if not request.user.is_staff: ...
         
+        # Imported here: only this rarely used action needs the management machinery
+        from io import StringIO
+        from django.core.management import call_command
+        
         output = StringIO()
         dry_run = request.data.get('dry_run', False)
         
@@ -345,6 +376,9 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
             else:
                 output.write("\n[DRY RUN] Skipping insurance returns generation (not supported in dry run)\n")
             
+            # 3. Close budget periods (after the generation steps, so the open month includes what they wrote)
+            call_command('close_budget_periods', stdout=output, dry_run=dry_run)
+            
             return Response({
                 'status': 'success',
                 'message': 'Daily generation process completed' + (' (DRY RUN)' if dry_run else ''),
@@ -358,6 +392,7 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'])
+    @reads_from_replica
     def projections(self, request):
         """Get financial projections for the next N months (income and expenses)"""
         months = int(request.query_params.get('months', 12))
@@ -366,12 +401,12 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
         # Get all active recurring transactions for the authenticated user
         active_income_transactions = RecurringTransaction.objects.filter(
             is_active=True, 
-            user=request.user,
+            user_id=request.user.id,
             transaction_type='Income'
         )
         active_expense_transactions = RecurringTransaction.objects.filter(
             is_active=True,
-            user=request.user,
+            user_id=request.user.id,
             transaction_type='Expense'
         )
         
@@ -380,7 +415,7 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
         if include_variable:
             # Get IDs of all recurring transactions to exclude them
             recurring_transaction_ids = set()
-            for rt in RecurringTransaction.objects.filter(user=request.user, is_active=True):
+            for rt in RecurringTransaction.objects.filter(user_id=request.user.id, is_active=True):
                 # Get transactions created by this recurring transaction
                 # Note: This assumes transactions have a description matching the recurring transaction
                 # You might need to adjust this logic based on your actual data model
@@ -396,7 +431,7 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
             # Get all non-recurring expenses (expenses not linked to recurring transactions)
             # This is a simplified approach - ideally you'd track which transactions came from recurring ones
             all_expenses = Transaction.objects.filter(
-                user=request.user,
+                user_id=request.user.id,
                 type='Expense',
                 transaction_date__gte=three_months_ago,
                 transaction_date__lte=today
@@ -414,7 +449,7 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
                     recurring_expenses_total += expense.amount * 12
             
             # Add debt payments for 3 months
-            active_debts = Debt.objects.filter(status='Active', user=request.user)
+            active_debts = Debt.objects.filter(status='Active', user_id=request.user.id)
             debt_payments_total = sum(Decimal(str(d.monthly_payment)) * 3 for d in active_debts)
             
             # Variable spending = Total expenses - Recurring expenses - Debt payments
@@ -489,7 +524,7 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet[RecurringTransaction]):
             projected_expenses += recurring_expenses
             
             # Add debt payments
-            active_debts = Debt.objects.filter(status='Active', user=request.user)
+            active_debts = Debt.objects.filter(status='Active', user_id=request.user.id)
             debt_payments = sum(Decimal(str(d.monthly_payment)) for d in active_debts)
             projected_expenses += debt_payments
             
@@ -9,21 +9,34 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from api.models import Investment, InvestmentTransaction, Account, Transaction
-from api.serializers import InvestmentSerializer, InvestmentTransactionSerializer
-from api.permissions import IsOwnerPermission
+from api.serializers import InvestmentSerializer, InvestmentTransactionSerializer, InvestmentTransactionReadSerializer, serialize_rows
+from api.fieldsets import SparseQuerysetMixin
+from api.permissions import IsOwnerPermission, OwnedQuerysetMixin
+from api.services import SummaryService
 
 
-class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
+class InvestmentViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Investment]):
     serializer_class = InvestmentSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    queryset = Investment.objects.select_related('account')
     
-    def get_queryset(self):
-        """Filter investments by authenticated user"""
-        return Investment.objects.filter(user=self.request.user).select_related('account')
-    
+    @transaction.atomic
     def perform_create(self, serializer):
         """Automatically assign the authenticated user when creating an investment"""
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+        SummaryService.refresh(self.request.user.id, 'investments')
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Amount, status and account edits move the committed funds of the summary"""
+        instance = serializer.save()
+        SummaryService.refresh(instance.user_id, 'investments')
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        user_id = instance.user_id
+        instance.delete()
+        SummaryService.refresh(user_id, 'investments')
     
     @action(detail=True, methods=['post'])
     @transaction.atomic
@@ -39,7 +52,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Validate account
         try:
-            account = Account.objects.get(id=account_id, user=request.user)
+            account = Account.objects.get(id=account_id, user_id=request.user.id)
         except Account.DoesNotExist:
             return Response(
                 {'error': 'Cuenta no encontrada'},
@@ -55,7 +68,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Create Transaction (Expense - money leaves account)
         trans = Transaction.objects.create(
-            user=request.user,
+            user_id=request.user.id,
             account=account,
             category=None,  # Could create "Inversiones" category
             type='Expense',
@@ -66,7 +79,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Update account balance
         account.balance -= amount
-        account.save()
+        account.save(update_fields=['balance'])
         
         # Create InvestmentTransaction
         InvestmentTransaction.objects.create(
@@ -88,6 +101,8 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
                 investment.status = 'completed'
         
         investment.save()
+        SummaryService.apply_transaction(new=trans)
+        SummaryService.refresh(investment.user_id, 'investments')
         
         serializer = self.get_serializer(investment)
         return Response({
@@ -110,7 +125,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Validate account
         try:
-            account = Account.objects.get(id=account_id, user=request.user)
+            account = Account.objects.get(id=account_id, user_id=request.user.id)
         except Account.DoesNotExist:
             return Response(
                 {'error': 'Cuenta no encontrada'},
@@ -126,7 +141,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Create Transaction (Income - money enters account)
         trans = Transaction.objects.create(
-            user=request.user,
+            user_id=request.user.id,
             account=account,
             category=None,
             type='Income',
@@ -137,7 +152,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         # Update account balance
         account.balance += amount
-        account.save()
+        account.save(update_fields=['balance'])
         
         # Create InvestmentTransaction
         InvestmentTransaction.objects.create(
@@ -153,6 +168,8 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         # Update investment
         investment.current_amount -= amount
         investment.save()
+        SummaryService.apply_transaction(new=trans)
+        SummaryService.refresh(investment.user_id, 'investments')
         
         serializer = self.get_serializer(investment)
         return Response({
@@ -162,6 +179,7 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         })
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def cancel_policy(self, request, pk=None):
         """Cancel an insurance policy"""
         investment = self.get_object()
@@ -174,16 +192,19 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
         
         investment.status = 'cancelled'
         investment.save()
+        SummaryService.refresh(investment.user_id, 'investments')
         
         serializer = self.get_serializer(investment)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def complete(self, request, pk=None):
         """Mark investment as completed"""
         investment = self.get_object()
         investment.status = 'completed'
         investment.save()
+        SummaryService.refresh(investment.user_id, 'investments')
         
         serializer = self.get_serializer(investment)
         return Response(serializer.data)
@@ -192,24 +213,24 @@ class InvestmentViewSet(viewsets.ModelViewSet[Investment]):
     def history(self, request, pk=None):
         """Get investment transaction history"""
         investment = self.get_object()
-        movements = investment.movements.all()
-        serializer = InvestmentTransactionSerializer(movements, many=True)
-        return Response(serializer.data)
+        return Response(serialize_rows(
+            InvestmentTransactionReadSerializer, investment.movements.all(), self.get_serializer_context()
+        ))
 
 
-class InvestmentTransactionViewSet(viewsets.ReadOnlyModelViewSet[InvestmentTransaction]):
+class InvestmentTransactionViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ReadOnlyModelViewSet[InvestmentTransaction]):
     """
     Read-only viewset for investment transactions
     Transactions are created via Investment.contribute/withdraw actions
     """
     serializer_class = InvestmentTransactionSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    queryset = InvestmentTransaction.objects.select_related('investment', 'account', 'account_transaction')
+    owner_field = 'investment__user_id'
     
     def get_queryset(self):
-        """Filter by authenticated user via investment relationship"""
-        queryset = InvestmentTransaction.objects.filter(
-            investment__user=self.request.user
-        ).select_related('investment', 'account', 'account_transaction')
+        """Movements of the user's investments (owner_field), optionally of one investment"""
+        queryset = super().get_queryset()
         
         # Optional: filter by investment
         investment_id = self.request.query_params.get('investment')
@@ -217,4 +238,9 @@ class InvestmentTransactionViewSet(viewsets.ReadOnlyModelViewSet[InvestmentTrans
             queryset = queryset.filter(investment_id=investment_id)
         
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """Read path: values() rows straight to dicts, no model instances"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(serialize_rows(InvestmentTransactionReadSerializer, queryset, self.get_serializer_context()))
 
@@ -0,0 +1,19 @@
+"""
+Lookup views
+"""
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from api.services import LookupService
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def lookups(request) -> Response:
+    """
+    GET /api/lookups/
+    Accounts and categories of the user for form dropdowns, without the
+    per-account balance aggregates of /api/accounts/
+    """
+    return Response(LookupService.get_lookups(user_id=request.user.id))
@@ -0,0 +1,38 @@
+"""
+Monitoring views
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from api.metrics import registry
+
+
+def _has_metrics_access(request: HttpRequest) -> bool:
+    """
+    Require METRICS_TOKEN when it is set; without one, only serve in DEBUG
+    (route names and job stats are not for the public internet)
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return settings.DEBUG
+
+    provided = request.GET.get('token', '')
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    if auth_header.startswith('Bearer '):
+        provided = auth_header[len('Bearer '):]
+    return hmac.compare_digest(provided, token)
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus text-format metrics for this worker process
+    Plain Django view: skips JWT authentication so scrapers only need METRICS_TOKEN
+    """
+    if not _has_metrics_access(request):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
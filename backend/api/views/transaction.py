@@ -1,42 +1,40 @@
 """
 Transaction and Category views
 """
+import copy
+
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from api.models import Category, Transaction
-from api.serializers import CategorySerializer, TransactionSerializer
-from api.permissions import IsOwnerPermission
+from api.serializers import CategorySerializer, TransactionSerializer, TransactionReadSerializer, serialize_rows
+from api.fieldsets import SparseQuerysetMixin
+from api.permissions import IsOwnerPermission, OwnedQuerysetMixin
+from api.services import SummaryService
 
 
-class CategoryViewSet(viewsets.ModelViewSet[Category]):
+class CategoryViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Category]):
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter categories by authenticated user"""
-        return Category.objects.filter(user=self.request.user)
+    queryset = Category.objects.all()
     
     def perform_create(self, serializer):
         """Automatically assign the authenticated user when creating a category"""
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
 
-class TransactionViewSet(viewsets.ModelViewSet[Transaction]):
+class TransactionViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[Transaction]):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated, IsOwnerPermission]
-    
-    def get_queryset(self):
-        """Filter transactions by authenticated user"""
-        return Transaction.objects.filter(user=self.request.user).select_related('account', 'category', 'user')
+    queryset = Transaction.objects.select_related('account', 'category', 'user')
     
     @transaction.atomic
     def perform_create(self, serializer):
         """Create transaction and update account balance"""
         # Save transaction
-        instance = serializer.save(user=self.request.user)
+        instance = serializer.save(user_id=self.request.user.id)
         
         # Update account balance
         account = instance.account
@@ -45,7 +43,26 @@ class TransactionViewSet(viewsets.ModelViewSet[Transaction]):
         elif instance.type == 'Expense':
             account.balance -= instance.amount
         
-        account.save()
+        account.save(update_fields=['balance'])
+        SummaryService.apply_transaction(new=instance)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Edits don't touch account balances: only the month figures of the summary can change"""
+        previous = copy.copy(serializer.instance)
+        instance = serializer.save()
+        SummaryService.apply_transaction(new=instance, old=previous, balance=False)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Deletes don't touch account balances: only the month figures of the summary can change"""
+        instance.delete()
+        SummaryService.apply_transaction(old=instance, balance=False)
+    
+    def list(self, request, *args, **kwargs):
+        """Read path: values() rows straight to dicts, no model instances"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(serialize_rows(TransactionReadSerializer, queryset, self.get_serializer_context()))
     
     def create(self, request, *args, **kwargs):
         """Override create to add detailed error logging"""
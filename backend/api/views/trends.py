@@ -1,14 +1,17 @@
 """
 Trends views
 """
-from rest_framework import viewsets, status
+from adrf import viewsets
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from typing import Dict, Any
 from datetime import datetime
 
+from api.concurrency import run_in_thread
 from api.services import TrendsService
+from api.services.trends_service import PERIOD_TYPES
 from api.serializers import (
     CategoryTrendSerializer, 
     CategoryOverviewSerializer,
@@ -21,17 +24,19 @@ from api.serializers import (
 class TrendsViewSet(viewsets.ViewSet):
     """
     ViewSet for spending trends analysis
+    Async (adrf): the blocking TrendsService queries run in the ORM thread pool,
+    so a slow trends query does not hold a worker under ASGI
     """
     permission_classes = [IsAuthenticated]
     lookup_value_regex = '[0-9]+'  # Only match numeric IDs for retrieve
 
     
-    def list(self, request) -> Response:
+    async def list(self, request) -> Response:
         """
         GET /api/trends/
         List all categories that have budgets for trends analysis
         """
-        categories = TrendsService.get_categories_with_budgets(user_id=request.user.id)
+        categories = await run_in_thread(TrendsService.get_categories_with_budgets, user_id=request.user.id)
         
         serializer = CategoryOverviewSerializer(categories, many=True)
         
@@ -39,7 +44,7 @@ class TrendsViewSet(viewsets.ViewSet):
             'categories': serializer.data
         })
     
-    def retrieve(self, request, pk: int = None) -> Response:
+    async def retrieve(self, request, pk: int = None) -> Response:
         """
         GET /api/trends/{category_id}/?months=6
         Get spending trends for a specific category
@@ -66,7 +71,8 @@ class TrendsViewSet(viewsets.ViewSet):
         
         # Get category trends
         try:
-            trends_data = TrendsService.get_category_trends_with_budget(
+            trends_data = await run_in_thread(
+                TrendsService.get_category_trends_with_budget,
                 user_id=request.user.id,
                 category_id=pk,
                 months=months
@@ -82,7 +88,7 @@ class TrendsViewSet(viewsets.ViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'], url_path='global-trends')
-    def global_trends(self, request) -> Response:
+    async def global_trends(self, request) -> Response:
         """
         GET /api/trends/global_trends/?months=12
         Get global spending trends (income vs expenses)
@@ -105,7 +111,8 @@ class TrendsViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        trends_data = TrendsService.get_global_spending_trends(
+        trends_data = await run_in_thread(
+            TrendsService.get_global_spending_trends,
             user_id=request.user.id,
             months=months
         )
@@ -114,7 +121,7 @@ class TrendsViewSet(viewsets.ViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'], url_path='category-distribution')
-    def category_distribution(self, request) -> Response:
+    async def category_distribution(self, request) -> Response:
         """
         GET /api/trends/category_distribution/?start_date=2024-01-01&end_date=2024-01-31
         Get spending distribution by category
@@ -122,6 +129,8 @@ class TrendsViewSet(viewsets.ViewSet):
         Query params:
             start_date: Start date (YYYY-MM-DD, optional, defaults to first day of current month)
             end_date: End date (YYYY-MM-DD, optional, defaults to today)
+            category: Category ID to drill down into its top descriptions (optional, 0 = uncategorized)
+            top: Descriptions in the drill-down (1-50, default=10)
         """
         start_date_str = request.query_params.get('start_date')
         end_date_str = request.query_params.get('end_date')
@@ -140,38 +149,109 @@ class TrendsViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        distribution_data = TrendsService.get_category_distribution(
+        if start_date and end_date and start_date > end_date:
+            return Response(
+                {'error': 'start_date must be on or before end_date'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        category_str = request.query_params.get('category')
+        top_str = request.query_params.get('top', '10')
+        
+        try:
+            category_id = int(category_str) if category_str else None
+            top = int(top_str)
+        except ValueError:
+            return Response(
+                {'error': 'category and top parameters must be valid integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not 1 <= top <= 50:
+            return Response(
+                {'error': 'top parameter must be between 1 and 50'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        distribution_data = await run_in_thread(
+            TrendsService.get_category_distribution,
             user_id=request.user.id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            category_id=category_id,
+            top=top
         )
         
         serializer = CategoryDistributionSerializer(distribution_data)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
-    def comparison(self, request) -> Response:
+    async def comparison(self, request) -> Response:
         """
-        GET /api/trends/comparison/?period=month
-        Compare current period vs previous period
+        GET /api/trends/comparison/?period=month&periods=12
+        Compare current period vs previous period, with the series of the last N periods
         
         Query params:
-            period: 'month' or 'year' (default='month')
+            period: 'week', 'month', 'quarter', 'year', 'rolling' or 'custom' (default='month')
+            periods: Number of periods in the series (2-36, default=2)
+            days: Length of a 'rolling' period in days (1-366, default=30)
+            start_date, end_date: The 'custom' period (YYYY-MM-DD, required for custom)
         """
         period_type = request.query_params.get('period', 'month')
         
-        if period_type not in ['month', 'year']:
+        if period_type not in PERIOD_TYPES:
+            return Response(
+                {'error': f'period parameter must be one of: {", ".join(PERIOD_TYPES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            count = int(request.query_params.get('periods', '2'))
+            days = int(request.query_params.get('days', '30'))
+        except ValueError:
             return Response(
-                {'error': 'period parameter must be "month" or "year"'},
+                {'error': 'periods and days parameters must be valid integers'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        comparison_data = TrendsService.get_spending_comparison(
+        if not 2 <= count <= 36:
+            return Response(
+                {'error': 'periods parameter must be between 2 and 36'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= days <= 366:
+            return Response(
+                {'error': 'days parameter must be between 1 and 366'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        start_date = None
+        end_date = None
+        
+        if period_type == 'custom':
+            try:
+                start_date = datetime.strptime(request.query_params.get('start_date', ''), '%Y-%m-%d').date()
+                end_date = datetime.strptime(request.query_params.get('end_date', ''), '%Y-%m-%d').date()
+            except ValueError:
+                return Response(
+                    {'error': 'custom periods need start_date and end_date (YYYY-MM-DD)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if start_date > end_date:
+                return Response(
+                    {'error': 'start_date must be on or before end_date'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        comparison_data = await run_in_thread(
+            TrendsService.get_spending_comparison,
             user_id=request.user.id,
-            period_type=period_type
+            period_type=period_type,
+            count=count,
+            days=days,
+            start_date=start_date,
+            end_date=end_date
         )
         
         serializer = SpendingComparisonSerializer(comparison_data)
         return Response(serializer.data)
-
-
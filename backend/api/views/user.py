@@ -7,7 +7,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
+from api.authentication import request_user
 from api.models import User
+from api.fieldsets import SparseQuerysetMixin
+from api.permissions import OwnedQuerysetMixin
 from api.serializers import (
     UserSerializer, 
     RegisterSerializer, 
@@ -17,13 +20,12 @@ from api.serializers import (
 )
 
 
-class UserViewSet(viewsets.ModelViewSet[User]):
+class UserViewSet(SparseQuerysetMixin, OwnedQuerysetMixin, viewsets.ModelViewSet[User]):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
-    
-    def get_queryset(self):
-        """Users can only see their own profile"""
-        return User.objects.filter(id=self.request.user.id)
+    # Users can only see their own profile
+    queryset = User.objects.all()
+    owner_field = 'id'
 
 
 class RegisterView(generics.CreateAPIView):
@@ -65,7 +67,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
     
     def get_object(self):
-        return self.request.user
+        return request_user(self.request)
     
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -89,11 +91,12 @@ class ChangePasswordView(generics.GenericAPIView):
     permission_classes = (IsAuthenticated,)
     
     def post(self, request, *args, **kwargs):
+        # Load the User row first: the serializer checks the old password on request.user
+        user = request_user(request)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         # Set new password
-        user = request.user
         user.set_password(serializer.validated_data['new_password'])
         user.save()
         
@@ -0,0 +1,87 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import os
+import sys
+import math
+import subprocess
+import time
+import urllib.request
+import urllib.error
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Add parent directory to path so the scripts can import Django settings
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+
+def setup_django() -> None:
+    """Configure Django for standalone benchmark scripts"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'budget_project.settings')
+
+    import django
+    django.setup()
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (pct between 0 and 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def print_table(headers: List[str], rows: List[List[str]]) -> None:
+    """Print a simple left-aligned text table"""
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(str(cell)))
+
+    line = '  '.join(header.ljust(widths[i]) for i, header in enumerate(headers))
+    print(line)
+    print('-' * len(line))
+    for row in rows:
+        print('  '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
+
+
+def print_header(title: str) -> None:
+    print(f"\n{'='*60}")
+    print(f"  {title}")
+    print(f"{'='*60}\n")
+
+
+def start_gunicorn(args: List[str], port: int, env: Optional[Dict[str, str]] = None,
+                   timeout: float = 60) -> subprocess.Popen:
+    """
+    Start gunicorn from the backend directory (so gunicorn.conf.py applies)
+    and wait until /api/health/ answers
+    """
+    command = [sys.executable, '-m', 'gunicorn', *args, '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **(env or {})})
+
+    url = f'http://127.0.0.1:{port}/api/health/'
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f'gunicorn exited with code {server.returncode}: {" ".join(args)}')
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return server
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.05)
+
+    stop_server(server)
+    raise SystemExit(f'gunicorn did not start within {timeout:.0f}s')
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
@@ -0,0 +1,146 @@
+"""
+Database Connection Setup Benchmark
+Simulates the request lifecycle (close_old_connections on request start and
+finish) around a trivial query and measures connection setup time per request
+with: a new connection per request, persistent connections (CONN_MAX_AGE)
+and the psycopg3 native pool (DATABASE_POOL=psycopg)
+
+Requires DATABASE_URL to point at PostgreSQL; against a remote host
+(Supabase) the TLS handshake dominates the setup time.
+
+Usage:
+    python benchmarks/connections.py
+    python benchmarks/connections.py --threads 8 --requests 200 --pool-max-size 4
+"""
+
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from common import setup_django, percentile, print_table, print_header
+
+setup_django()
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+def register_alias(alias: str, conn_max_age: int, pool: Dict[str, float] = None) -> str:
+    """Clone the default database settings under a new alias"""
+    settings_dict = copy.deepcopy(connections['default'].settings_dict)
+    settings_dict['CONN_MAX_AGE'] = conn_max_age
+    options = {key: value for key, value in settings_dict.get('OPTIONS', {}).items() if key != 'pool'}
+    if pool is not None:
+        options['pool'] = pool
+    settings_dict['OPTIONS'] = options
+    connections.settings[alias] = settings_dict
+    return alias
+
+
+def simulate_request(alias: str) -> Dict[str, float]:
+    """One request: request_started cleanup, connect if needed, SELECT 1, request_finished cleanup"""
+    connection = connections[alias]
+    started = time.perf_counter()
+    connection.close_if_unusable_or_obsolete()
+
+    setup_started = time.perf_counter()
+    connection.ensure_connection()
+    setup = time.perf_counter() - setup_started
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+    connection.close_if_unusable_or_obsolete()
+    return {'setup': setup * 1000, 'total': (time.perf_counter() - started) * 1000}
+
+
+def run_mode(alias: str, threads: int, requests_per_thread: int) -> Dict[str, object]:
+    opened = []
+    lock = threading.Lock()
+
+    def count_connections(sender, connection, **kwargs):
+        if connection.alias == alias:
+            with lock:
+                opened.append(1)
+
+    def worker(_):
+        results = [simulate_request(alias) for _ in range(requests_per_thread)]
+        connections[alias].close()
+        return results
+
+    connection_created.connect(count_connections)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = [result for batch in executor.map(worker, range(threads)) for result in batch]
+        wall = time.perf_counter() - started
+    finally:
+        connection_created.disconnect(count_connections)
+
+    return {
+        'setup': [result['setup'] for result in results],
+        'total': [result['total'] for result in results],
+        'connections': len(opened),
+        'wall': wall,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Database Connection Setup Benchmark')
+    parser.add_argument('--threads', type=int, default=4, help='Concurrent request threads (default: 4)')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per thread (default: 100)')
+    parser.add_argument('--pool-min-size', type=int, default=2, help='psycopg pool min_size (default: 2)')
+    parser.add_argument('--pool-max-size', type=int, default=4, help='psycopg pool max_size (default: 4)')
+
+    args = parser.parse_args()
+
+    if connections['default'].vendor != 'postgresql':
+        raise SystemExit('This benchmark needs PostgreSQL: set DATABASE_URL=postgresql://...')
+
+    modes = [
+        ('new connection per request', register_alias('bench_no_reuse', 0)),
+        ('persistent (CONN_MAX_AGE=600)', register_alias('bench_persistent', 600)),
+        (f'psycopg pool (max_size={args.pool_max_size})', register_alias('bench_pool', 0, {
+            'min_size': args.pool_min_size,
+            'max_size': args.pool_max_size,
+            'timeout': 30,
+        })),
+    ]
+
+    print_header('CONNECTION SETUP BENCHMARK')
+    host = connections['default'].settings_dict.get('HOST') or 'localhost'
+    print(f'Host: {host}  Threads: {args.threads}  Requests/thread: {args.requests}\n')
+
+    rows: List[List[str]] = []
+    baseline_setup = None
+    for name, alias in modes:
+        result = run_mode(alias, args.threads, args.requests)
+        mean_setup = sum(result['setup']) / len(result['setup'])
+        if baseline_setup is None:
+            baseline_setup = mean_setup
+        rows.append([
+            name,
+            f'{mean_setup:.2f}',
+            f"{percentile(result['total'], 50):.2f}",
+            f"{percentile(result['total'], 95):.2f}",
+            str(result['connections']),
+            f"{len(result['total']) / result['wall']:.0f}",
+            f'{baseline_setup - mean_setup:.2f}',
+        ])
+        if hasattr(connections[alias], 'close_pool'):
+            connections[alias].close_pool()
+
+    print_table(
+        ['Mode', 'setup ms/req', 'p50 ms', 'p95 ms', 'connections opened', 'req/s', 'saved ms/req'],
+        rows,
+    )
+    print()
+
+
+if __name__ == "__main__":
+    main()
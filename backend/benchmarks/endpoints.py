@@ -0,0 +1,212 @@
+"""
+API Endpoint Latency Benchmark
+Measures p50/p95 latency per endpoint for users created by `seed_benchmark_data`
+
+Usage:
+    python benchmarks/endpoints.py                          # in-process Django test client
+    python benchmarks/endpoints.py --base-url http://localhost:8000 --concurrency 8
+"""
+
+import time
+import json
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from common import setup_django, percentile, print_table, print_header
+
+setup_django()
+
+from django.test import Client
+from django.test.utils import setup_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.middleware import observe_queries
+from api.models import User
+
+
+DEFAULT_ENDPOINTS = [
+    '/api/dashboard/',
+    '/api/trends/global-trends/?months=12',
+    '/api/trends/global-trends/?months=24',
+    '/api/trends/category-distribution/',
+    '/api/trends/comparison/?period=month',
+    '/api/recurring-transactions/projections/',
+    '/api/transactions/',
+    '/api/accounts/',
+    '/api/budgets/',
+    '/api/investments/',
+]
+
+
+def get_tokens(prefix: str, users: int) -> List[str]:
+    """Issue access tokens for the first N benchmark users"""
+    bench_users = list(
+        User.objects.filter(username__startswith=prefix, email__endswith='@bench.local').order_by('id')[:users]
+    )
+    if not bench_users:
+        raise SystemExit(
+            f'No benchmark users found with prefix "{prefix}". '
+            'Run: python manage.py seed_benchmark_data'
+        )
+    return [str(RefreshToken.for_user(user).access_token) for user in bench_users]
+
+
+def run_in_process(endpoint: str, tokens: List[str], iterations: int, warmup: int) -> Dict[str, object]:
+    """Benchmark an endpoint through Django's test client (no network)"""
+    clients = [Client(HTTP_AUTHORIZATION=f'Bearer {token}') for token in tokens]
+
+    for i in range(warmup):
+        clients[i % len(clients)].get(endpoint)
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    sizes: List[int] = []
+    statuses = set()
+
+    for i in range(iterations):
+        client = clients[i % len(clients)]
+        # Counted through the connection hook rather than CaptureQueriesContext,
+        # which only sees this thread: async and gather_in_threads views run
+        # their queries on worker threads
+        captured: List[float] = []
+        with observe_queries(lambda elapsed, context: captured.append(elapsed)):
+            started = time.perf_counter()
+            response = client.get(endpoint)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+        statuses.add(response.status_code)
+
+    return {
+        'latencies': latencies,
+        'queries': sum(queries) / len(queries),
+        'size': sum(sizes) / len(sizes),
+        'statuses': statuses,
+        'wall': sum(latencies) / 1000,
+    }
+
+
+def _http_get(url: str, token: str) -> Tuple[float, int, int]:
+    request = urllib.request.Request(url, headers={
+        'Authorization': f'Bearer {token}',
+        'Accept-Encoding': 'identity',
+    })
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        status = e.code
+    return (time.perf_counter() - started) * 1000, status, len(body)
+
+
+def run_http(
+    base_url: str, endpoint: str, tokens: List[str], iterations: int, warmup: int, concurrency: int
+) -> Dict[str, object]:
+    """Benchmark an endpoint against a running server with N concurrent clients"""
+    url = base_url.rstrip('/') + endpoint
+
+    for i in range(warmup):
+        _http_get(url, tokens[i % len(tokens)])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda i: _http_get(url, tokens[i % len(tokens)]), range(iterations)))
+        wall = time.perf_counter() - started
+
+    return {
+        'latencies': [latency for latency, _, _ in results],
+        'queries': None,
+        'size': sum(size for _, _, size in results) / len(results),
+        'statuses': {status for _, status, _ in results},
+        'wall': wall,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='API Endpoint Latency Benchmark')
+    parser.add_argument(
+        '--endpoint',
+        '-e',
+        action='append',
+        help='Endpoint path to benchmark (repeatable, default: dashboard, trends, projections, lists)'
+    )
+    parser.add_argument('--iterations', '-n', type=int, default=30, help='Requests per endpoint (default: 30)')
+    parser.add_argument('--warmup', type=int, default=3, help='Warmup requests per endpoint (default: 3)')
+    parser.add_argument('--users', type=int, default=5, help='Benchmark users to rotate through (default: 5)')
+    parser.add_argument('--prefix', default='bench', help='Benchmark user prefix (default: bench)')
+    parser.add_argument(
+        '--base-url',
+        help='Benchmark a running server (e.g. http://localhost:8000) instead of the in-process client'
+    )
+    parser.add_argument(
+        '--concurrency',
+        '-c',
+        type=int,
+        default=1,
+        help='Concurrent clients in --base-url mode (default: 1)'
+    )
+    parser.add_argument('--json', dest='json_output', help='Also write raw results to this JSON file')
+
+    args = parser.parse_args()
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+    tokens = get_tokens(args.prefix, args.users)
+
+    mode = f'HTTP {args.base_url} (concurrency={args.concurrency})' if args.base_url else 'in-process test client'
+    print_header('API ENDPOINT BENCHMARK')
+    print(f'Mode: {mode}')
+    print(f'Users: {len(tokens)}  Iterations: {args.iterations}  Warmup: {args.warmup}\n')
+
+    if not args.base_url:
+        setup_test_environment()
+
+    rows = []
+    raw: Dict[str, Dict[str, object]] = {}
+
+    for endpoint in endpoints:
+        if args.base_url:
+            result = run_http(args.base_url, endpoint, tokens, args.iterations, args.warmup, args.concurrency)
+        else:
+            result = run_in_process(endpoint, tokens, args.iterations, args.warmup)
+
+        latencies = result['latencies']
+        queries: Optional[float] = result['queries']
+        raw[endpoint] = {
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'max_ms': max(latencies),
+            'mean_ms': sum(latencies) / len(latencies),
+            'requests_per_second': len(latencies) / result['wall'] if result['wall'] else 0,
+            'queries': queries,
+            'bytes': result['size'],
+            'statuses': sorted(result['statuses']),
+        }
+        stats = raw[endpoint]
+        rows.append([
+            endpoint,
+            f"{stats['p50_ms']:.1f}",
+            f"{stats['p95_ms']:.1f}",
+            f"{stats['max_ms']:.1f}",
+            f"{stats['requests_per_second']:.1f}",
+            f'{queries:.1f}' if queries is not None else '-',
+            f"{stats['bytes'] / 1024:.1f}",
+            ','.join(str(s) for s in stats['statuses']),
+        ])
+
+    print_table(['Endpoint', 'p50 ms', 'p95 ms', 'max ms', 'req/s', 'queries', 'KB', 'status'], rows)
+    print()
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump({'mode': mode, 'results': raw}, f, indent=2)
+        print(f'Raw results written to {args.json_output}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Registration Throughput Benchmark
+Runs RegisterSerializer (validation + create) for a burst of sign-ups and
+compares the previous create() (a username exists() loop and 22 single-row
+category INSERTs) with the current one (one prefix query, one bulk INSERT)
+
+Emails share a few local parts (bench0@..., bench0@..., ...) like a sign-up burst
+would, so the username suffix search matters. Everything runs inside a
+transaction that is rolled back at the end. Password hashing is switched to
+MD5 unless --real-hasher is given: PBKDF2 would otherwise hide the database
+work being measured.
+
+Usage:
+    python benchmarks/registration.py
+    python benchmarks/registration.py --users 500 --prefixes 3 --real-hasher
+"""
+
+import time
+from typing import Dict, List, Type
+
+from common import setup_django, percentile, print_table, print_header
+
+setup_django()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from api.models import User, Category
+from api.serializers import RegisterSerializer
+from api.serializers.user import DEFAULT_CATEGORIES
+
+
+class LegacyRegisterSerializer(RegisterSerializer):
+    """create() as it was before the bulk provisioning change"""
+
+    def create(self, validated_data: dict) -> User:
+        validated_data.pop('password_confirm')
+        username = validated_data['email'].split('@')[0]
+        base_username = username
+        counter = 1
+        while User.objects.filter(username=username).exists():
+            username = f"{base_username}{counter}"
+            counter += 1
+
+        user = User.objects.create_user(
+            username=username,
+            email=validated_data['email'],
+            password=validated_data['password'],
+            first_name=validated_data['first_name'],
+            last_name=validated_data['last_name']
+        )
+        for name, category_type, icon in DEFAULT_CATEGORIES:
+            Category.objects.create(user=user, name=name, type=category_type, icon=icon)
+        return user
+
+
+class _Rollback(Exception):
+    pass
+
+
+def run(serializer_class: Type[RegisterSerializer], users: int, prefixes: int, tag: str) -> Dict[str, object]:
+    durations: List[float] = []
+    queries: List[int] = []
+    started = time.perf_counter()
+    try:
+        with transaction.atomic():
+            for i in range(users):
+                payload = {
+                    'email': f'bench{i % prefixes}@{tag}{i}.local',
+                    'password': 'Benchmark-123!',
+                    'password_confirm': 'Benchmark-123!',
+                    'first_name': 'Bench',
+                    'last_name': 'User',
+                }
+                # The query log is a bounded deque: keep it from filling up
+                connection.queries_log.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    request_started = time.perf_counter()
+                    serializer = serializer_class(data=payload)
+                    serializer.is_valid(raise_exception=True)
+                    serializer.save()
+                    durations.append((time.perf_counter() - request_started) * 1000)
+                queries.append(len(captured.captured_queries))
+            wall = time.perf_counter() - started
+            raise _Rollback
+    except _Rollback:
+        pass
+    return {'durations': durations, 'queries': queries, 'wall': wall}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Registration Throughput Benchmark')
+    parser.add_argument('--users', type=int, default=200, help='Registrations per mode (default: 200)')
+    parser.add_argument('--prefixes', type=int, default=5,
+                        help='Distinct email local parts, i.e. colliding usernames (default: 5)')
+    parser.add_argument('--real-hasher', action='store_true', help='Keep the configured password hasher')
+
+    args = parser.parse_args()
+
+    hashers = {} if args.real_hasher else {'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher']}
+    modes = [
+        ('previous (exists loop + 22 INSERTs)', LegacyRegisterSerializer, 'legacy'),
+        ('bulk template + prefix query', RegisterSerializer, 'bulk'),
+    ]
+
+    print_header('REGISTRATION THROUGHPUT BENCHMARK')
+    print(f'Database: {connection.vendor}  Registrations: {args.users}  Username prefixes: {args.prefixes}\n')
+
+    rows = []
+    with override_settings(**hashers):
+        for name, serializer_class, tag in modes:
+            result = run(serializer_class, args.users, args.prefixes, tag)
+            durations = result['durations']
+            rows.append([
+                name,
+                f"{args.users / result['wall']:.0f}",
+                f'{percentile(durations, 50):.2f}',
+                f'{percentile(durations, 95):.2f}',
+                f"{sum(result['queries']) / len(result['queries']):.1f}",
+                str(max(result['queries'])),
+            ])
+
+    print_table(['Mode', 'registrations/s', 'p50 ms', 'p95 ms', 'queries avg', 'queries max'], rows)
+    print()
+
+
+if __name__ == "__main__":
+    main()
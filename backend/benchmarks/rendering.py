@@ -0,0 +1,113 @@
+"""
+JSON Rendering Benchmark
+Renders API payloads with DRF's JSONRenderer (stdlib json) and with
+ORJSONRenderer, checks that both produce the same bytes, and times parsing
+the rendered transaction list back with JSONParser and ORJSONParser
+
+Payloads:
+    - transactions: a list of --rows serialized transactions, as
+      TransactionViewSet.list returns it
+    - trends: global trends (24 months), category distribution and
+      spending comparison of the first benchmark user, each rendered
+      --repeat times per run as a busy trends page would
+
+Usage:
+    python benchmarks/rendering.py
+    python benchmarks/rendering.py --rows 10000 --runs 10
+"""
+
+import io
+import itertools
+import time
+from typing import Callable, List
+
+from common import setup_django, percentile, print_table, print_header
+
+setup_django()
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Transaction
+from api.renderers import ORJSONParser, ORJSONRenderer
+from api.serializers import (
+    TransactionReadSerializer,
+    GlobalTrendsSerializer,
+    CategoryDistributionSerializer,
+    SpendingComparisonSerializer,
+    serialize_rows,
+)
+from api.services import TrendsService
+
+
+def timed(func: Callable[[], object], runs: int) -> List[float]:
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='JSON Rendering Benchmark')
+    parser.add_argument('--rows', type=int, default=10000, help='Transactions in the list payload (default: 10000)')
+    parser.add_argument('--repeat', type=int, default=100, help='Trends payloads rendered per run (default: 100)')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per measurement (default: 10)')
+
+    args = parser.parse_args()
+
+    transactions = serialize_rows(TransactionReadSerializer, Transaction.objects.order_by('-transaction_date')[:args.rows])
+    if not transactions:
+        raise SystemExit('No transactions: run python manage.py seed_benchmark_data first')
+    user_id = Transaction.objects.order_by('user_id').values_list('user_id', flat=True).first()
+    transactions = list(itertools.islice(itertools.cycle(transactions), args.rows))
+
+    trends = [
+        GlobalTrendsSerializer(TrendsService.get_global_spending_trends(user_id=user_id, months=24)).data,
+        CategoryDistributionSerializer(TrendsService.get_category_distribution(user_id=user_id)).data,
+        SpendingComparisonSerializer(TrendsService.get_spending_comparison(user_id=user_id)).data,
+    ]
+
+    payloads = [
+        (f'transactions ({args.rows} rows)', transactions, 1),
+        (f'trends (3 payloads x {args.repeat})', trends, args.repeat),
+    ]
+    renderers = [('JSONRenderer', JSONRenderer()), ('ORJSONRenderer', ORJSONRenderer())]
+
+    for name, payload, _ in payloads:
+        if JSONRenderer().render(payload) != ORJSONRenderer().render(payload):
+            raise SystemExit(f'ORJSONRenderer output differs from JSONRenderer for {name}')
+
+    print_header('JSON RENDERING BENCHMARK')
+    print(f'Runs: {args.runs}\n')
+
+    table = []
+    for name, payload, repeat in payloads:
+        items = payload if repeat > 1 else [payload]
+        size = sum(len(JSONRenderer().render(item)) for item in items) * repeat
+        for renderer_name, renderer in renderers:
+            durations = timed(lambda: [renderer.render(item) for _ in range(repeat) for item in items], args.runs)
+            p50 = percentile(durations, 50)
+            table.append([
+                'render', name, renderer_name, f'{size / 1024:.0f}',
+                f'{p50:.2f}', f'{percentile(durations, 95):.2f}', f'{size / 1024 / 1024 / p50 * 1000:.0f}',
+            ])
+
+    body = JSONRenderer().render(transactions)
+    for parser_name, json_parser in [('JSONParser', JSONParser()), ('ORJSONParser', ORJSONParser())]:
+        durations = timed(lambda: json_parser.parse(io.BytesIO(body)), args.runs)
+        p50 = percentile(durations, 50)
+        table.append([
+            'parse', f'transactions ({args.rows} rows)', parser_name, f'{len(body) / 1024:.0f}',
+            f'{p50:.2f}', f'{percentile(durations, 95):.2f}', f'{len(body) / 1024 / 1024 / p50 * 1000:.0f}',
+        ])
+
+    print_table(['Op', 'Payload', 'Implementation', 'KB', 'p50 ms', 'p95 ms', 'MB/s'], table)
+    print()
+
+
+if __name__ == "__main__":
+    main()
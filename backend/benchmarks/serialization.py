@@ -0,0 +1,88 @@
+"""
+List Serialization Benchmark
+Serializes N transactions with TransactionSerializer (model instances with
+select_related, as TransactionViewSet.list did) and with
+TransactionReadSerializer (values() rows, as it does now), and checks that
+both produce the same output
+
+Two measurements per path:
+    - serialize only: rows already in memory (repeated to reach --rows)
+    - query + serialize: fetching up to --rows transactions from the database
+
+Usage:
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --rows 10000 --runs 5
+"""
+
+import itertools
+import time
+from typing import Callable, List
+
+from common import setup_django, percentile, print_table, print_header
+
+setup_django()
+
+from api.models import Transaction
+from api.serializers import TransactionSerializer, TransactionReadSerializer, serialize_rows
+
+
+def timed(func: Callable[[], object], runs: int) -> List[float]:
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def repeat_to(items: list, count: int) -> list:
+    return list(itertools.islice(itertools.cycle(items), count))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='List Serialization Benchmark')
+    parser.add_argument('--rows', type=int, default=10000, help='Rows serialized per run (default: 10000)')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per measurement (default: 5)')
+
+    args = parser.parse_args()
+
+    queryset = Transaction.objects.select_related('account', 'category', 'user')
+    instances = list(queryset[:args.rows])
+    if not instances:
+        raise SystemExit('No transactions: run python manage.py seed_benchmark_data first')
+    rows = list(TransactionReadSerializer.rows(queryset[:args.rows]))
+
+    if TransactionSerializer(instances, many=True).data != serialize_rows(TransactionReadSerializer, rows):
+        raise SystemExit('TransactionReadSerializer output differs from TransactionSerializer')
+
+    print_header('LIST SERIALIZATION BENCHMARK')
+    print(f'Rows: {args.rows} ({len(instances)} in the database)  Runs: {args.runs}\n')
+
+    fetched = len(instances)
+    instances = repeat_to(instances, args.rows)
+    rows = repeat_to(rows, args.rows)
+    measurements = [
+        ('serialize only', 'TransactionSerializer (instances)', args.rows,
+         lambda: TransactionSerializer(instances, many=True).data),
+        ('serialize only', 'TransactionReadSerializer (values rows)', args.rows,
+         lambda: serialize_rows(TransactionReadSerializer, rows)),
+        ('query + serialize', 'TransactionSerializer (instances)', fetched,
+         lambda: TransactionSerializer(queryset[:args.rows], many=True).data),
+        ('query + serialize', 'TransactionReadSerializer (values rows)', fetched,
+         lambda: serialize_rows(TransactionReadSerializer, queryset[:args.rows])),
+    ]
+
+    table = []
+    for scope, name, count, func in measurements:
+        durations = timed(func, args.runs)
+        p50 = percentile(durations, 50)
+        table.append([scope, name, str(count), f'{p50:.1f}', f'{percentile(durations, 95):.1f}', f'{count / p50 * 1000:.0f}'])
+
+    print_table(['Scope', 'Serializer', 'Rows', 'p50 ms', 'p95 ms', 'rows/s'], table)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+WSGI vs ASGI Throughput Benchmark
+Starts gunicorn (gunicorn.conf.py) with gthread workers (WSGI) and with uvicorn
+workers (ASGI) and measures throughput of the aggregate endpoints under concurrent clients
+
+Usage:
+    python benchmarks/server_modes.py
+    python benchmarks/server_modes.py --workers 2 --concurrency 1 --concurrency 8 --concurrency 32
+"""
+
+from typing import Dict, List
+
+from common import percentile, print_table, print_header, start_gunicorn, stop_server
+from endpoints import get_tokens, run_http
+
+
+# gunicorn.conf.py picks the app and worker class from SERVER_MODE
+MODES = ['wsgi', 'asgi']
+
+DEFAULT_ENDPOINTS = [
+    '/api/dashboard/',
+    '/api/trends/global-trends/?months=24',
+    '/api/trends/category-distribution/',
+]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='WSGI vs ASGI Throughput Benchmark')
+    parser.add_argument('--endpoint', '-e', action='append', help='Endpoint path (repeatable)')
+    parser.add_argument(
+        '--concurrency',
+        '-c',
+        type=int,
+        action='append',
+        help='Concurrent clients (repeatable, default: 1, 8, 32)'
+    )
+    parser.add_argument('--iterations', '-n', type=int, default=200, help='Requests per run (default: 200)')
+    parser.add_argument('--warmup', type=int, default=10, help='Warmup requests per run (default: 10)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: 2, as in the Dockerfile)')
+    parser.add_argument('--users', type=int, default=5, help='Benchmark users to rotate through (default: 5)')
+    parser.add_argument('--prefix', default='bench', help='Benchmark user prefix (default: bench)')
+    parser.add_argument('--port', type=int, default=8765, help='Port for the temporary servers (default: 8765)')
+    parser.add_argument('--mode', choices=MODES, action='append', help='Only run these modes')
+
+    args = parser.parse_args()
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+    concurrency_levels = args.concurrency or [1, 8, 32]
+    modes = args.mode or MODES
+    tokens = get_tokens(args.prefix, args.users)
+
+    print_header('WSGI vs ASGI THROUGHPUT')
+    print(f'Workers: {args.workers}  Iterations: {args.iterations}  Users: {len(tokens)}\n')
+
+    results: Dict[tuple, Dict[str, float]] = {}
+    for mode in modes:
+        print(f'Starting {mode} server...')
+        server = start_gunicorn(['--workers', str(args.workers)], args.port, env={'SERVER_MODE': mode})
+        try:
+            for endpoint in endpoints:
+                for concurrency in concurrency_levels:
+                    result = run_http(
+                        f'http://127.0.0.1:{args.port}', endpoint, tokens,
+                        args.iterations, args.warmup, concurrency,
+                    )
+                    latencies: List[float] = result['latencies']
+                    results[(endpoint, concurrency, mode)] = {
+                        'rps': len(latencies) / result['wall'],
+                        'p50': percentile(latencies, 50),
+                        'p95': percentile(latencies, 95),
+                    }
+        finally:
+            stop_server(server)
+
+    rows = []
+    for endpoint in endpoints:
+        for concurrency in concurrency_levels:
+            row = [endpoint, str(concurrency)]
+            for mode in modes:
+                stats = results[(endpoint, concurrency, mode)]
+                row.append(f"{stats['rps']:.1f}")
+                row.append(f"{stats['p95']:.1f}")
+            rows.append(row)
+
+    headers = ['Endpoint', 'clients']
+    for mode in modes:
+        headers.extend([f'{mode} req/s', f'{mode} p95 ms'])
+
+    print()
+    print_table(headers, rows)
+    print()
+
+
+if __name__ == "__main__":
+    main()
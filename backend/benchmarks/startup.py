@@ -0,0 +1,132 @@
+"""
+Gunicorn Startup Benchmark
+Compares boot time and memory of the previous Dockerfile command (sync
+workers, no preload) with gunicorn.conf.py (gthread workers, preload_app)
+
+RSS counts shared pages once per process, so PSS (proportional set size) is
+reported too: it shows what copy-on-write sharing after preload really saves.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --workers 4 --runs 5
+"""
+
+import os
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+from common import percentile, print_table, print_header, start_gunicorn, stop_server
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    """Rss and Pss of a process from /proc/<pid>/smaps_rollup (Linux only)"""
+    values = {'Rss': 0, 'Pss': 0}
+    rollup = Path(f'/proc/{pid}/smaps_rollup')
+    if not rollup.exists():
+        return values
+    for line in rollup.read_text().splitlines():
+        key, _, rest = line.partition(':')
+        if key in values:
+            values[key] = int(rest.split()[0])
+    return values
+
+
+def _children(pid: int) -> List[int]:
+    children: List[int] = []
+    for task in Path(f'/proc/{pid}/task').glob('*'):
+        content = (task / 'children').read_text().split()
+        children.extend(int(child) for child in content)
+    return children
+
+
+def measure(args: List[str], env: Dict[str, str], port: int, workers: int, warmup_requests: int) -> Dict[str, float]:
+    """Boot the server once, then load every worker and sample memory"""
+    started = time.perf_counter()
+    server = start_gunicorn(args, port, env=env)
+    boot_seconds = time.perf_counter() - started
+
+    try:
+        # Wait for all workers and make each of them serve requests
+        deadline = time.time() + 30
+        while len(_children(server.pid)) < workers and time.time() < deadline:
+            time.sleep(0.05)
+        for _ in range(warmup_requests):
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health/', timeout=10) as response:
+                response.read()
+        all_ready_seconds = time.perf_counter() - started
+
+        master = _memory_kb(server.pid)
+        worker_memory = [_memory_kb(child) for child in _children(server.pid)]
+    finally:
+        stop_server(server)
+
+    return {
+        'boot_s': boot_seconds,
+        'ready_s': all_ready_seconds,
+        'master_rss_mb': master['Rss'] / 1024,
+        'workers_rss_mb': sum(memory['Rss'] for memory in worker_memory) / 1024,
+        'total_pss_mb': (master['Pss'] + sum(memory['Pss'] for memory in worker_memory)) / 1024,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Gunicorn Startup Benchmark')
+    parser.add_argument('--workers', type=int, default=2, help='Workers for every configuration (default: 2)')
+    parser.add_argument('--runs', type=int, default=3, help='Boots per configuration (default: 3)')
+    parser.add_argument('--port', type=int, default=8766, help='Port for the temporary servers (default: 8766)')
+    parser.add_argument(
+        '--warmup-requests',
+        type=int,
+        default=20,
+        help='Requests sent before sampling memory so every worker has loaded the app (default: 20)'
+    )
+
+    args = parser.parse_args()
+
+    # An empty config file disables gunicorn.conf.py for the baseline
+    empty_config = tempfile.NamedTemporaryFile('w', suffix='.py', delete=False)
+    empty_config.close()
+
+    workers = ['--workers', str(args.workers)]
+    configurations = [
+        ('sync, no preload (old Dockerfile)',
+         ['--config', empty_config.name, 'budget_project.wsgi:application', *workers], {}),
+        ('gunicorn.conf.py without preload', workers, {'GUNICORN_PRELOAD': 'False'}),
+        ('gunicorn.conf.py (gthread + preload)', workers, {}),
+    ]
+
+    print_header('GUNICORN STARTUP BENCHMARK')
+    print(f'Workers: {args.workers}  Runs: {args.runs}\n')
+
+    rows = []
+    try:
+        for name, gunicorn_args, env in configurations:
+            runs = [
+                measure(gunicorn_args, env, args.port, args.workers, args.warmup_requests)
+                for _ in range(args.runs)
+            ]
+            rows.append([
+                name,
+                f"{percentile([run['boot_s'] for run in runs], 50):.2f}",
+                f"{percentile([run['ready_s'] for run in runs], 50):.2f}",
+                f"{percentile([run['master_rss_mb'] for run in runs], 50):.1f}",
+                f"{percentile([run['workers_rss_mb'] for run in runs], 50):.1f}",
+                f"{percentile([run['total_pss_mb'] for run in runs], 50):.1f}",
+            ])
+    finally:
+        os.unlink(empty_config.name)
+
+    print_table(
+        ['Configuration', 'boot s', 'all workers s', 'master RSS MB', 'workers RSS MB', 'total PSS MB'],
+        rows,
+    )
+    print()
+
+
+if __name__ == "__main__":
+    main()
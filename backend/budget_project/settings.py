@@ -44,6 +44,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -52,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'budget_project.urls'
@@ -112,6 +116,75 @@ else:
         }
     }
 
+# Read replica: analytics reads (TrendsService, DashboardService, projections, backups) go
+# here, see api/db_router.py. Locally two SQLite files work too, e.g. copy db.sqlite3 and set
+# DATABASE_REPLICA_URL=sqlite:////path/to/replica.sqlite3
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.config(
+        default=DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    # Tests run against a single database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['api.db_router.PrimaryReplicaRouter']
+
+# Seconds a user's reads stay on the primary after a write (covers replication lag)
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS', '5'))
+
+# Postgres connection handling (DATABASE_POOL):
+#   persistent: one connection per thread, reused for CONN_MAX_AGE seconds (default)
+#   psycopg:    psycopg3 native pool per worker process; threads (gthread, async ORM pool)
+#               share at most DATABASE_POOL_MAX_SIZE connections, so TLS handshakes to remote
+#               hosts (Supabase) are paid once per pooled connection instead of per thread
+#   pgbouncer:  behind PgBouncer in transaction mode; server-side cursors are disabled because
+#               they don't survive across transactions (QuerySet.iterator() then fetches in
+#               chunks client-side). Django already disables psycopg prepared statements.
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'persistent')
+
+if DATABASE_POOL not in ('persistent', 'psycopg', 'pgbouncer'):
+    raise ValueError(f"DATABASE_POOL must be 'persistent', 'psycopg' or 'pgbouncer', got {DATABASE_POOL!r}")
+
+for database in DATABASES.values():
+    if database['ENGINE'] != 'django.db.backends.postgresql':
+        continue
+    if DATABASE_POOL == 'psycopg':
+        # Pooled connections go back to the pool when Django closes them
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = True  # pool checks connections on checkout
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+            # Seconds a request waits for a free connection before failing
+            'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', '300')),
+            'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', '1800')),
+        }
+    elif DATABASE_POOL == 'pgbouncer':
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Cache
+# Redis when REDIS_URL is set (shared between workers), otherwise per-process memory
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'zenit-default',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -159,19 +232,27 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'api.User'
 
+# Stateless JWT auth (opt-in): request.user is built from the token claims instead of
+# loading the User row on every request (see api/authentication.py)
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'False') == 'True'
+# Seconds a worker trusts that a token's user is still active before re-checking it
+JWT_ACTIVE_USER_CACHE_SECONDS = int(os.getenv('JWT_ACTIVE_USER_CACHE_SECONDS', '60'))
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication' if JWT_STATELESS_AUTH
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    # orjson encoding/decoding, same JSON as DRF's JSONRenderer/JSONParser (see api/renderers.py)
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'api.renderers.ORJSONParser',
     ],
 }
 
@@ -181,13 +262,16 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': False,
-    'UPDATE_LAST_LOGIN': True,
+    # Writes users.last_login on every token login
+    'UPDATE_LAST_LOGIN': os.getenv('JWT_UPDATE_LAST_LOGIN', 'True') == 'True',
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    # request.user under JWT_STATELESS_AUTH
+    'TOKEN_USER_CLASS': 'api.authentication.TokenUser',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
@@ -201,3 +285,65 @@ CORS_ALLOWED_ORIGINS = [origin.strip() for origin in CORS_ALLOWED_ORIGINS_ENV.sp
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Request profiling (opt-in): Server-Timing header + structured log line per request
+REQUEST_PROFILING = os.getenv('REQUEST_PROFILING', 'False') == 'True'
+# Fraction of requests (0.0 - 1.0) that also dump a full profile to REQUEST_PROFILING_DIR
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv('REQUEST_PROFILING_SAMPLE_RATE', '0'))
+REQUEST_PROFILING_DIR = os.getenv('REQUEST_PROFILING_DIR', str(BASE_DIR / 'profiles'))
+# 'cprofile' (.prof files, open with snakeviz) or 'pyinstrument' (.html, requires pyinstrument)
+REQUEST_PROFILER = os.getenv('REQUEST_PROFILER', 'cprofile')
+
+# Prometheus-style metrics at /api/metrics/ (per worker process)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+# If set, scrapers must send "Authorization: Bearer <token>" (or ?token=<token>);
+# required when DEBUG=False, otherwise the endpoint answers 403
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Response compression: gzip, or brotli when installed (uv sync --extra brotli) and accepted
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True') == 'True'
+# Smaller bodies are sent as they are: compressing them costs more CPU than it saves
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY', '4'))
+
+# Seconds /api/lookups/ stays cached per user. Changes invalidate it in the shared Redis
+# cache; with the per-process memory cache other workers see them after this long at most
+LOOKUPS_CACHE_SECONDS = int(os.getenv('LOOKUPS_CACHE_SECONDS', '3600' if REDIS_URL else '60'))
+
+# Seconds the income/expense totals of a closed period stay cached for /api/trends/comparison/.
+# Transaction writes invalidate them in the shared Redis cache; with the per-process memory
+# cache other workers see backdated changes after this long at most
+TRENDS_PERIOD_CACHE_SECONDS = int(os.getenv('TRENDS_PERIOD_CACHE_SECONDS', '86400' if REDIS_URL else '60'))
+
+# Most GET sub-requests a single /api/batch/ call may run
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))
+
+# Threads per worker process for concurrent ORM work in async views (dashboard, trends)
+# Each thread keeps its own DB connection, so this bounds connections per worker
+ASYNC_ORM_THREADS = int(os.getenv('ASYNC_ORM_THREADS', '4'))
+
+# Deep health check (/api/health/?deep=1)
+# Seconds a probe result is reused before touching the database again
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv('HEALTH_CHECK_CACHE_SECONDS', '5'))
+# DB round-trip above this is reported as degraded
+HEALTH_DB_LATENCY_WARNING_MS = float(os.getenv('HEALTH_DB_LATENCY_WARNING_MS', '200'))
+# Daily generation jobs without a successful run in this window are reported as degraded
+HEALTH_JOB_MAX_AGE_HOURS = float(os.getenv('HEALTH_JOB_MAX_AGE_HOURS', '26'))
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console'],
+            'level': os.getenv('API_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
@@ -14,29 +14,17 @@ cd "$SCRIPT_DIR"
 echo "📍 Working directory: $SCRIPT_DIR"
 echo ""
 
-# Generate recurring transactions (income and expenses)
-echo "💸 Generating recurring transactions..."
-uv run python manage.py generate_recurring_transactions
-RECURRING_EXIT_CODE=$?
-
-echo ""
-echo "----------------------------------------------"
-echo ""
-
-# Generate insurance policy returns
-echo "💰 Generating insurance policy returns..."
-uv run python manage.py generate_insurance_returns
-INSURANCE_EXIT_CODE=$?
+# Generate recurring transactions and insurance policy returns in one process
+# (Django and the app are loaded once instead of once per job)
+uv run python manage.py run_daily_jobs
+EXIT_CODE=$?
 
 echo ""
 echo "=============================================="
-if [ $RECURRING_EXIT_CODE -eq 0 ] && [ $INSURANCE_EXIT_CODE -eq 0 ]; then
+if [ $EXIT_CODE -eq 0 ]; then
     echo "✅ All processes completed successfully!"
     exit 0
 else
-    echo "❌ One or more processes failed!"
-    echo "   Recurring transactions exit code: $RECURRING_EXIT_CODE"
-    echo "   Insurance returns exit code: $INSURANCE_EXIT_CODE"
+    echo "❌ One or more processes failed! (exit code: $EXIT_CODE)"
     exit 1
 fi
-
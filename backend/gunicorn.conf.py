@@ -0,0 +1,150 @@
+"""
+Gunicorn configuration
+Derives workers and threads from the CPU and memory available to the container
+
+Environment overrides:
+    SERVER_MODE                  wsgi (gthread workers, default) or asgi (uvicorn workers)
+    PORT                         Port to bind (default: 8000)
+    GUNICORN_WORKERS             Fixed number of workers (WEB_CONCURRENCY is also honoured)
+    GUNICORN_THREADS             Threads per gthread worker (default: 4)
+    GUNICORN_WORKER_MEMORY_MB    Expected RSS per worker used to cap workers (default: 160)
+    GUNICORN_MEMORY_RESERVE_MB   Memory left for the master and the OS (default: 256)
+    GUNICORN_MAX_WORKERS         Upper bound for the derived worker count (default: 8)
+    GUNICORN_PRELOAD             Import the app once in the master before forking (default: True)
+    GUNICORN_MAX_REQUESTS        Restart a worker after N requests to cap leak growth (default: 1000)
+    GUNICORN_MAX_REQUESTS_JITTER Random extra requests so workers do not restart together (default: 100)
+    GUNICORN_TIMEOUT             Worker timeout in seconds (default: 60)
+"""
+import math
+import os
+import time
+from pathlib import Path
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def available_cpus():
+    """CPUs usable by this process, honouring affinity and cgroup CPU quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2: "max 100000" or "<quota> <period>"
+    cpu_max = Path('/sys/fs/cgroup/cpu.max')
+    if cpu_max.exists():
+        quota, _, period = cpu_max.read_text().strip().partition(' ')
+        if quota != 'max' and period:
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+
+    return max(1, cpus)
+
+
+def available_memory_mb():
+    """Container memory limit if set, otherwise total system memory (None if unknown)"""
+    limit = None
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        file = Path(path)
+        if file.exists():
+            value = file.read_text().strip()
+            # cgroup v1 reports "no limit" as a huge number
+            if value != 'max' and int(value) < 1 << 60:
+                limit = int(value) // (1024 * 1024)
+            break
+
+    total = None
+    meminfo = Path('/proc/meminfo')
+    if meminfo.exists():
+        for line in meminfo.read_text().splitlines():
+            if line.startswith('MemTotal:'):
+                total = int(line.split()[1]) // 1024
+                break
+
+    if limit is not None and total is not None:
+        return min(limit, total)
+    return limit or total
+
+
+def derive_workers(mode, cpus, memory_mb):
+    """
+    Sync-style workers scale with CPU (2 * cores + 1); gthread and uvicorn
+    workers already overlap DB waits, so cores + 1 is enough. Memory caps
+    the result so the container is never pushed into swap or the OOM killer.
+    """
+    explicit = _env_int('GUNICORN_WORKERS', _env_int('WEB_CONCURRENCY', 0))
+    if explicit:
+        return explicit
+
+    workers = cpus + 1 if mode in ('gthread', 'asgi') else cpus * 2 + 1
+
+    if memory_mb:
+        per_worker = _env_int('GUNICORN_WORKER_MEMORY_MB', 160)
+        reserve = _env_int('GUNICORN_MEMORY_RESERVE_MB', 256)
+        workers = min(workers, max(1, (memory_mb - reserve) // per_worker))
+
+    return max(1, min(workers, _env_int('GUNICORN_MAX_WORKERS', 8)))
+
+
+server_mode = os.getenv('SERVER_MODE', 'wsgi').lower()
+cpu_count = available_cpus()
+memory_mb = available_memory_mb()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+if server_mode == 'asgi':
+    wsgi_app = 'budget_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    workers = derive_workers('asgi', cpu_count, memory_mb)
+else:
+    wsgi_app = 'budget_project.wsgi:application'
+    # Threads overlap the time requests spend waiting on Postgres
+    worker_class = 'gthread'
+    threads = _env_int('GUNICORN_THREADS', 4)
+    workers = derive_workers('gthread', cpu_count, memory_mb)
+
+# Import Django, DRF and the app once in the master: workers share those pages copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = 30
+keepalive = 5
+
+# Heartbeat files on tmpfs: Docker's overlay filesystem can stall workers
+if Path('/dev/shm').is_dir():
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    cfg = server.cfg
+    server.log.info(
+        'Gunicorn ready: worker_class=%s workers=%s threads=%s preload=%s (cpus=%s, memory=%sMB)',
+        cfg.worker_class_str, cfg.workers, cfg.threads, cfg.preload_app, cpu_count, memory_mb,
+    )
+
+
+def pre_fork(server, worker):
+    """Never hand a DB connection or pool opened while preloading over to the forked workers"""
+    if server.cfg.preload_app:
+        from django.db import connections
+        for connection in connections.all(initialized_only=True):
+            connection.close()
+            # psycopg pools run background threads, which do not survive fork()
+            if hasattr(connection, 'close_pool'):
+                connection.close_pool()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        # The metrics module was imported in the master; report the worker's own start time
+        from api import metrics
+        metrics.PROCESS_START_TIME = time.time()
@@ -1,13 +1,19 @@
 """
 Database Backup and Restore Utility
 Helps to backup data from old database and restore to new one
+
+Backups are directories (backup/backup_<timestamp>/) with one gzip-compressed
+CSV file per table and a manifest.json with row counts and SHA-256 checksums.
+Incremental backups (--incremental) only hold rows changed since their parent
+backup plus the deletes recorded since; restoring one replays the whole chain.
+See api/services/backup_service.py. Legacy JSON fixtures (backup_*.json) can
+still be restored with loaddata.
 """
 
 import os
 import sys
 from pathlib import Path
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -18,108 +24,131 @@ import django
 django.setup()
 
 from django.core.management import call_command
-from django.db import connection
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from api.db_router import REPLICA_ALIAS, replica_configured
+from api.services import BackupError, BackupService
+
+
+def latest_backup(backup_dir: str = "backup"):
+    """
+    Most recent complete backup (full or incremental) in backup_dir
+    """
+    for candidate in sorted(Path(backup_dir).glob("backup_*"), reverse=True):
+        if candidate.is_dir():
+            try:
+                BackupService.read_manifest(str(candidate))
+            except BackupError:
+                continue
+            return str(candidate)
+    return None
 
 
-def backup_data(output_dir: str = "backup"):
+def backup_data(output_dir: str = "backup", database: str = None, jobs: int = 4,
+                incremental: bool = False, base: str = None):
     """
-    Backup all data using Django's dumpdata command
-    Creates JSON files for each app
+    Stream every table into a new backup directory
+    Reads from the replica when DATABASE_REPLICA_URL is set, so the dump
+    doesn't compete with API writes on the primary
     """
-    backup_path = Path(output_dir)
-    backup_path.mkdir(exist_ok=True)
-    
+    if database is None:
+        database = REPLICA_ALIAS if replica_configured() else DEFAULT_DB_ALIAS
+
+    parent = None
+    if incremental:
+        parent = base or latest_backup(output_dir)
+        if parent is None:
+            print(f"✗ No previous backup in {output_dir}: take a full backup first")
+            return None
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = backup_path / f"backup_{timestamp}.json"
-    
+    backup_dir = Path(output_dir) / f"backup_{timestamp}"
+
     print(f"\n{'='*60}")
     print("  DATABASE BACKUP")
     print(f"{'='*60}\n")
-    
-    print(f"Creating backup at: {backup_file}")
-    
+
+    print(f"Creating backup at: {backup_dir}")
+    print(f"Source database: {database}  Jobs: {jobs}")
+    if parent:
+        print(f"Incremental, based on: {parent}")
+    print()
+
     try:
-        # Backup all data
-        with open(backup_file, 'w') as f:
-            call_command(
-                'dumpdata',
-                '--natural-foreign',
-                '--natural-primary',
-                '--indent', '2',
-                stdout=f,
-                exclude=[
-                    'contenttypes',
-                    'auth.permission',
-                    'sessions.session',
-                ]
-            )
-        
-        print(f"✓ Backup created successfully!")
-        print(f"  Size: {backup_file.stat().st_size / 1024:.2f} KB")
-        
-        # Also create individual app backups
-        apps = ['api']  # Add more apps if needed
-        
-        for app in apps:
-            app_backup_file = backup_path / f"backup_{app}_{timestamp}.json"
-            print(f"\nBacking up {app} app...")
-            
-            with open(app_backup_file, 'w') as f:
-                call_command(
-                    'dumpdata',
-                    app,
-                    '--natural-foreign',
-                    '--natural-primary',
-                    '--indent', '2',
-                    stdout=f,
-                )
-            
-            print(f"✓ {app} backup created: {app_backup_file}")
-        
-        print(f"\n{'='*60}")
-        print("  BACKUP COMPLETE")
-        print(f"{'='*60}\n")
-        
-        return str(backup_file)
-        
+        manifest = BackupService.backup(str(backup_dir), database=database, jobs=jobs, parent_dir=parent)
     except Exception as e:
         print(f"\n✗ Backup failed: {e}")
         return None
 
+    tables = list(manifest['tables'])
+    if manifest['type'] == 'incremental':
+        tables.append(manifest['tombstones'])
+
+    print(f"{'Table':<32} {'Rows':>10} {'Size (KB)':>12} {'Seconds':>9}  Since")
+    print("-" * 90)
+    for table in tables:
+        since = table['since'] or 'all rows'
+        print(f"{table['table']:<32} {table['rows']:>10} {table['bytes'] / 1024:>12.2f} {table['seconds']:>9.2f}  {since}")
+
+    total_rows = sum(table['rows'] for table in tables)
+    total_kb = sum(table['bytes'] for table in tables) / 1024
+    print(f"\n✓ Backup created successfully!")
+    print(f"  Rows: {total_rows}  Size: {total_kb:.2f} KB  Time: {manifest['seconds']:.2f}s")
 
-def restore_data(backup_file: str):
+    print(f"\n{'='*60}")
+    print("  BACKUP COMPLETE")
+    print(f"{'='*60}\n")
+
+    return str(backup_dir)
+
+
+def restore_data(backup: str, database: str = DEFAULT_DB_ALIAS, jobs: int = 4,
+                 truncate: bool = False, assume_yes: bool = False):
     """
-    Restore data from a backup JSON file
+    Restore data from a backup directory (or a legacy JSON fixture)
     """
-    backup_path = Path(backup_file)
-    
+    backup_path = Path(backup)
+
     if not backup_path.exists():
-        print(f"✗ Backup file not found: {backup_file}")
+        print(f"✗ Backup not found: {backup}")
         return False
-    
+
     print(f"\n{'='*60}")
     print("  DATABASE RESTORE")
     print(f"{'='*60}\n")
-    
-    print(f"Restoring from: {backup_file}")
-    print(f"File size: {backup_path.stat().st_size / 1024:.2f} KB\n")
-    
+
+    print(f"Restoring from: {backup}")
+    print(f"Target database: {database}")
+    if truncate:
+        print("⚠️  Existing rows in the backed up tables will be deleted first")
+    print()
+
     # Ask for confirmation
-    confirm = input("⚠️  This will restore data. Continue? (yes/no): ")
-    if confirm.lower() != 'yes':
-        print("Restore cancelled.")
-        return False
-    
+    if not assume_yes:
+        confirm = input("⚠️  This will restore data. Continue? (yes/no): ")
+        if confirm.lower() != 'yes':
+            print("Restore cancelled.")
+            return False
+
     try:
-        # Load data
-        call_command('loaddata', backup_file, verbosity=2)
-        
+        if backup_path.is_file():
+            # Legacy dumpdata fixture
+            call_command('loaddata', str(backup_path), database=database, verbosity=2)
+        else:
+            results = BackupService.restore(str(backup_path), database=database, jobs=jobs, truncate=truncate)
+            for result in results:
+                print(f"{result['backup']} ({result['type']})")
+                for table in result['tables']:
+                    action = 'deleted' if table['table'] == 'deleted_records' else 'rows'
+                    print(f"  ✓ {table['table']:<32} {table['rows']:>10} {action:<8} {table['seconds']:>7.2f}s")
+
         print(f"\n{'='*60}")
         print("  RESTORE COMPLETE")
         print(f"{'='*60}\n")
-        
+
         return True
-        
+
     except Exception as e:
         print(f"\n✗ Restore failed: {e}")
         return False
@@ -127,49 +156,63 @@ def restore_data(backup_file: str):
 
 def list_backups(backup_dir: str = "backup"):
     """
-    List available backup files
+    List available backups (directories with a manifest and legacy JSON files)
     """
     backup_path = Path(backup_dir)
-    
+
     if not backup_path.exists():
         print(f"No backup directory found at: {backup_dir}")
         return []
-    
-    backups = sorted(backup_path.glob("backup_*.json"), reverse=True)
-    
+
+    backups = sorted(backup_path.glob("backup_*"), reverse=True)
+
     print(f"\n{'='*60}")
     print("  AVAILABLE BACKUPS")
     print(f"{'='*60}\n")
-    
+
     if not backups:
         print("No backups found.")
         return []
-    
-    print(f"{'#':<4} {'Filename':<40} {'Size (KB)':<12} {'Date':<20}")
-    print("-" * 80)
-    
+
+    print(f"{'#':<4} {'Name':<40} {'Type':<12} {'Size (KB)':<12} {'Rows':<10} {'Date':<20}")
+    print("-" * 102)
+
     for i, backup in enumerate(backups, 1):
-        size_kb = backup.stat().st_size / 1024
+        if backup.is_dir():
+            try:
+                manifest = BackupService.read_manifest(str(backup))
+            except BackupError:
+                backup_type = 'incomplete'
+                rows = '-'
+                size_kb = sum(f.stat().st_size for f in backup.iterdir()) / 1024
+            else:
+                backup_type = manifest['type']
+                rows = str(sum(table['rows'] for table in manifest['tables']))
+                size_kb = sum(table['bytes'] for table in manifest['tables']) / 1024
+        else:
+            backup_type = 'json'
+            rows = '-'
+            size_kb = backup.stat().st_size / 1024
         mod_time = datetime.fromtimestamp(backup.stat().st_mtime)
-        print(f"{i:<4} {backup.name:<40} {size_kb:>10.2f}  {mod_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    
+        print(f"{i:<4} {backup.name:<40} {backup_type:<12} {size_kb:>10.2f}  {rows:<10} {mod_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
     print()
     return backups
 
 
 def main():
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Database Backup and Restore Utility')
     parser.add_argument(
         'action',
-        choices=['backup', 'restore', 'list'],
+        choices=['backup', 'restore', 'verify', 'list', 'prune'],
         help='Action to perform'
     )
     parser.add_argument(
         '--file',
         '-f',
-        help='Backup file to restore (for restore action)'
+        help='Backup directory or legacy JSON file (for restore and verify actions)'
     )
     parser.add_argument(
         '--dir',
@@ -177,13 +220,52 @@ def main():
         default='backup',
         help='Backup directory (default: backup)'
     )
-    
+    parser.add_argument(
+        '--database',
+        help='Database alias (backup default: replica if configured, else default; restore default: default)'
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        type=int,
+        default=4,
+        help='Tables processed in parallel on PostgreSQL (default: 4)'
+    )
+    parser.add_argument(
+        '--incremental',
+        '-i',
+        action='store_true',
+        help='Only export rows changed since the latest backup in --dir (or --base)'
+    )
+    parser.add_argument(
+        '--base',
+        help='Parent backup directory for --incremental (default: latest backup in --dir)'
+    )
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=35,
+        help='prune: delete tombstones older than this many days (default: 35)'
+    )
+    parser.add_argument(
+        '--truncate',
+        action='store_true',
+        help='Delete existing rows before restoring (restore refuses non-empty tables otherwise)'
+    )
+    parser.add_argument(
+        '--yes',
+        '-y',
+        action='store_true',
+        help='Do not ask for confirmation'
+    )
+
     args = parser.parse_args()
-    
+
     if args.action == 'backup':
-        backup_data(args.dir)
-    
+        backup_data(args.dir, args.database, args.jobs, args.incremental, args.base)
+
     elif args.action == 'restore':
+        database = args.database or DEFAULT_DB_ALIAS
         if not args.file:
             # List backups and let user choose
             backups = list_backups(args.dir)
@@ -194,15 +276,32 @@ def main():
                     return
                 try:
                     backup_file = backups[int(choice) - 1]
-                    restore_data(str(backup_file))
                 except (ValueError, IndexError):
                     print("Invalid choice.")
+                    return
+                restore_data(str(backup_file), database, args.jobs, args.truncate, args.yes)
         else:
-            restore_data(args.file)
-    
+            restore_data(args.file, database, args.jobs, args.truncate, args.yes)
+
+    elif args.action == 'verify':
+        if not args.file:
+            print("✗ --file is required for verify")
+            return
+        try:
+            manifest = BackupService.verify(args.file)
+        except BackupError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ {len(manifest['tables'])} table files match their checksums")
+
     elif args.action == 'list':
         list_backups(args.dir)
 
+    elif args.action == 'prune':
+        # Tombstones are written on the primary; keep them longer than the oldest full backup in use
+        deleted = BackupService.prune_tombstones(timezone.now() - timedelta(days=args.days))
+        print(f"✓ Deleted {deleted} tombstones older than {args.days} days")
+
 
 if __name__ == "__main__":
     main()
@@ -3,7 +3,7 @@
  */
 
 import apiClient from '../client'
-import type { Budget, BudgetHistory } from '../../types/models'
+import type { Budget, BudgetHistory, BudgetPerformance } from '../../types/models'
 
 export interface BudgetFormData {
   category: number
@@ -73,3 +73,7 @@ export const toggleBudgetStatus = async (id: number, status: 'Active' | 'Paused'
   return response.data
 }
 
+export const getBudgetPerformance = async (months: number = 12): Promise<BudgetPerformance> => {
+  const response = await apiClient.get<BudgetPerformance>('/budgets/performance/', { params: { months } })
+  return response.data
+}
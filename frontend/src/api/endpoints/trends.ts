@@ -33,19 +33,28 @@ export const getGlobalTrends = async (months: number = 12): Promise<import('../.
 
 export const getCategoryDistribution = async (
   startDate?: string,
-  endDate?: string
+  endDate?: string,
+  categoryId?: number,
+  top?: number
 ): Promise<import('../../types/models').CategoryDistribution> => {
   const response = await apiClient.get<import('../../types/models').CategoryDistribution>('/trends/category-distribution/', {
-    params: { start_date: startDate, end_date: endDate }
+    params: { start_date: startDate, end_date: endDate, category: categoryId, top }
   })
   return response.data
 }
 
 export const getSpendingComparison = async (
-  period: 'month' | 'year' = 'month'
+  period: import('../../types/models').ComparisonPeriod = 'month',
+  options: { periods?: number; days?: number; startDate?: string; endDate?: string } = {}
 ): Promise<import('../../types/models').SpendingComparison> => {
   const response = await apiClient.get<import('../../types/models').SpendingComparison>('/trends/comparison/', {
-    params: { period }
+    params: {
+      period,
+      periods: options.periods,
+      days: options.days,
+      start_date: options.startDate,
+      end_date: options.endDate
+    }
   })
   return response.data
 }
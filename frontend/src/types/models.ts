@@ -135,6 +135,39 @@ export interface BudgetHistory {
   changed_by_username: string | null
 }
 
+export interface BudgetPeriod {
+  month: string  // YYYY-MM
+  budgeted: number
+  spent: number
+  remaining: number
+  percentage: number
+  within_budget: boolean
+  closed: boolean  // false for the open (current) month
+}
+
+export interface BudgetPerformanceItem {
+  budget_id: number
+  category_id: number
+  category_name: string
+  category_icon: string | null
+  periods: BudgetPeriod[]
+  months_within_budget: number
+  adherence_percentage: number
+}
+
+export interface BudgetPerformance {
+  months: number
+  period_start: string
+  period_end: string
+  budgets: BudgetPerformanceItem[]
+  monthly_totals: Array<{
+    month: string
+    budgeted: number
+    spent: number
+    percentage: number
+  }>
+}
+
 export interface GoalsSummary {
   in_progress: number
   completed: number
@@ -256,29 +289,48 @@ export interface CategoryDistributionItem {
   percentage: number
 }
 
+export interface DescriptionBreakdownItem {
+  description: string
+  amount: number
+  count: number
+  percentage: number
+}
+
+export interface CategoryDrillDown {
+  category_id: number
+  items: DescriptionBreakdownItem[]
+  other_amount: number
+}
+
 export interface CategoryDistribution {
   distribution: CategoryDistributionItem[]
   total_expenses: number
   period_start: string
   period_end: string
+  drill_down?: CategoryDrillDown
 }
 
 export interface PeriodData {
+  label: string
   income: number
   expenses: number
   net: number
   start_date: string
   end_date: string
+  closed: boolean
 }
 
+export type ComparisonPeriod = 'week' | 'month' | 'quarter' | 'year' | 'rolling' | 'custom'
+
 export interface SpendingComparison {
-  period_type: 'month' | 'year'
+  period_type: ComparisonPeriod
   current: PeriodData
   previous: PeriodData
   change: {
     income_percent: number
     expenses_percent: number
   }
+  series: PeriodData[]
 }
 
 // Enhanced projection with breakdown